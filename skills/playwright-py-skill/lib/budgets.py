@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Performance budgets and baseline regression detection for metrics records
+from lib.metrics, used by run.py --budgets
+"""
+
+import json
+import math
+from fnmatch import fnmatch
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from lib.metrics import numeric_metrics
+
+DEFAULT_BASELINE = {
+    "path": "perf-baseline.jsonl",
+    "metrics": ["lcp_ms", "fcp_ms", "transfer_bytes", "requests"],
+    "alpha": 0.01,
+    "min_change": 0.05,
+    "min_runs": 5,
+    "max_runs": 30,
+}
+
+
+def load_budgets(path: str) -> Dict[str, Any]:
+    """
+    Read a budgets file:
+
+        {
+          "budgets": {
+            "*/checkout*": {"lcp_ms": 2500, "transfer_bytes": 1500000},
+            "*": {"requests": 80, "js_heap_used_bytes": 50000000}
+          },
+          "baseline": {"path": "perf-baseline.jsonl", "min_runs": 5}
+        }
+
+    URL patterns are globs. "baseline" is optional, its path is relative to
+    the budgets file and missing keys default to DEFAULT_BASELINE.
+    """
+    config = json.loads(Path(path).read_text())
+    budgets = config.get("budgets", {})
+    for pattern, limits in budgets.items():
+        for metric, limit in limits.items():
+            if not isinstance(limit, (int, float)) or isinstance(limit, bool):
+                raise ValueError(
+                    f"Budget {pattern!r} {metric}: expected a number, got {limit!r}"
+                )
+    baseline = config.get("baseline")
+    if baseline is not None:
+        baseline = {**DEFAULT_BASELINE, **baseline}
+        baseline["path"] = str(Path(path).parent / baseline["path"])
+    return {"budgets": budgets, "baseline": baseline}
+
+
+def page_key(record: Dict[str, Any]) -> str:
+    """Records of the same page: URL without query and fragment."""
+    parts = urlsplit(record["url"])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _group(
+    records: Iterable[Dict[str, Any]],
+) -> Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]]:
+    """
+    Group records per page and throttling profile, so throttled runs are
+    never compared with unthrottled ones.
+    """
+    groups: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+    for record in records:
+        key = (page_key(record), record.get("throttling"))
+        groups.setdefault(key, []).append(record)
+    return groups
+
+
+def _label(url: str, throttling: Optional[str]) -> str:
+    return f"{url} [{throttling}]" if throttling else url
+
+
+def _values(records: Sequence[Dict[str, Any]], metric: str) -> List[float]:
+    return [
+        value
+        for value in (numeric_metrics(record).get(metric) for record in records)
+        if value is not None
+    ]
+
+
+def check_budgets(
+    records: Iterable[Dict[str, Any]], budgets: Dict[str, Dict[str, float]]
+) -> List[Dict[str, Any]]:
+    """
+    Compare the median of each page's runs with every budget whose URL
+    pattern matches it. Returns the violations.
+    """
+    violations = []
+    for (url, throttling), group in _group(records).items():
+        for pattern, limits in budgets.items():
+            if not fnmatch(url, pattern):
+                continue
+            for metric, limit in limits.items():
+                values = _values(group, metric)
+                if values and median(values) > limit:
+                    violations.append(
+                        {
+                            "url": url,
+                            "throttling": throttling,
+                            "pattern": pattern,
+                            "metric": metric,
+                            "value": median(values),
+                            "limit": limit,
+                            "runs": len(values),
+                        }
+                    )
+    return violations
+
+
+def mann_whitney_p(current: Sequence[float], baseline: Sequence[float]) -> float:
+    """
+    One-sided Mann-Whitney U test p-value for "current is larger than
+    baseline" (normal approximation with tie and continuity correction).
+    A single run can never reach significance, so outliers are not flagged.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    rank_sum = 0.0
+    ties = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for _, group in combined[i : j + 1] if group == 0)
+        count = j - i + 1
+        ties += count**3 - count
+        i = j + 1
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare_to_baseline(
+    records: Iterable[Dict[str, Any]],
+    baseline_records: Iterable[Dict[str, Any]],
+    metrics: Sequence[str] = DEFAULT_BASELINE["metrics"],
+    alpha: float = DEFAULT_BASELINE["alpha"],
+    min_change: float = DEFAULT_BASELINE["min_change"],
+    min_runs: int = DEFAULT_BASELINE["min_runs"],
+) -> List[Dict[str, Any]]:
+    """
+    Flag metrics of pages that got significantly (p < alpha) and noticeably
+    (median up by more than min_change) worse than the baseline. Pages with
+    fewer than min_runs baseline runs are skipped.
+    """
+    baseline = _group(baseline_records)
+    regressions = []
+    for key, group in _group(records).items():
+        previous = baseline.get(key, [])
+        if len(previous) < min_runs:
+            continue
+        for metric in metrics:
+            now, before = _values(group, metric), _values(previous, metric)
+            if not now or len(before) < min_runs:
+                continue
+            now_median, before_median = median(now), median(before)
+            change = (
+                (now_median - before_median) / before_median if before_median else 0
+            )
+            if change <= min_change:
+                continue
+            p_value = mann_whitney_p(now, before)
+            if p_value < alpha:
+                regressions.append(
+                    {
+                        "url": key[0],
+                        "throttling": key[1],
+                        "metric": metric,
+                        "baseline": before_median,
+                        "current": now_median,
+                        "change": change,
+                        "p_value": p_value,
+                        "runs": len(now),
+                        "baseline_runs": len(before),
+                    }
+                )
+    return regressions
+
+
+def read_baseline(path: str) -> List[Dict[str, Any]]:
+    if not Path(path).exists():
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def update_baseline(path: str, records: Iterable[Dict[str, Any]], max_runs: int = 30):
+    """Add records to the baseline, keeping the latest max_runs per page."""
+    groups = _group(read_baseline(path))
+    for key, group in _group(records).items():
+        groups.setdefault(key, []).extend(group)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for group in groups.values():
+            for record in group[-max_runs:]:
+                f.write(json.dumps(record) + "\n")
+
+
+def evaluate_run(records: List[Dict[str, Any]], config: Dict[str, Any]) -> bool:
+    """
+    Check a run's records against budgets and the baseline and print the
+    results. The baseline is only updated by passing runs. Returns True if
+    the run passed.
+    """
+    violations = check_budgets(records, config["budgets"])
+    if config["budgets"]:
+        print(f"📏 Performance budgets: {len(violations)} violation(s)")
+    for v in violations:
+        print(
+            f"  ❌ {_label(v['url'], v['throttling'])} {v['metric']} "
+            f"{v['value']:g} > {v['limit']:g} (budget {v['pattern']!r}, median of {v['runs']} run(s))"
+        )
+
+    regressions = []
+    baseline = config.get("baseline")
+    if baseline:
+        options = {
+            k: baseline[k] for k in ("metrics", "alpha", "min_change", "min_runs")
+        }
+        regressions = compare_to_baseline(
+            records, read_baseline(baseline["path"]), **options
+        )
+        print(f"📈 Baseline regressions: {len(regressions)}")
+        for r in regressions:
+            print(
+                f"  ❌ {_label(r['url'], r['throttling'])} {r['metric']} median "
+                f"{r['baseline']:g} → {r['current']:g} ({r['change']:+.1%}, p={r['p_value']:.3g}, "
+                f"{r['runs']} vs {r['baseline_runs']} runs)"
+            )
+
+    passed = not violations and not regressions
+    if baseline and passed:
+        update_baseline(baseline["path"], records, baseline["max_runs"])
+    return passed
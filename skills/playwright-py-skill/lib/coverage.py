@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Precise JS and CSS coverage over many pages (Chromium, via CDP), merged per
+script/stylesheet URL into used and unused bytes
+"""
+
+import heapq
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from playwright.sync_api import BrowserContext, Page
+
+Range = Tuple[int, int]
+
+
+def merge_ranges(a: List[Range], b: List[Range]) -> List[Range]:
+    """Union of two sorted lists of [start, end) ranges as disjoint ranges."""
+    merged: List[Range] = []
+    for start, end in heapq.merge(a, b):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def executed_ranges(functions: List[Dict[str, Any]]) -> List[Range]:
+    """
+    Byte ranges of a script that ran, from V8 block coverage. Ranges are
+    nested (function, then blocks); the innermost count decides.
+    """
+    ranges = sorted(
+        (
+            (r["startOffset"], r["endOffset"], r["count"])
+            for function in functions
+            for r in function["ranges"]
+        ),
+        key=lambda r: (r[0], -r[1]),
+    )
+    used: List[Range] = []
+
+    def emit(start: int, end: int, count: int):
+        if count > 0 and end > start:
+            if used and used[-1][1] == start:
+                used[-1] = (used[-1][0], end)
+            else:
+                used.append((start, end))
+
+    stack: List[Tuple[int, int]] = []  # (end, count) of enclosing ranges
+    position = 0
+    for start, end, count in ranges:
+        while stack and stack[-1][0] <= start:
+            close, enclosing = stack.pop()
+            emit(position, close, enclosing)
+            position = max(position, close)
+        if stack:
+            emit(position, start, stack[-1][1])
+        position = start
+        stack.append((end, count))
+    while stack:
+        close, enclosing = stack.pop()
+        emit(position, close, enclosing)
+        position = max(position, close)
+    return used
+
+
+class CoverageCollector:
+    """
+    Collect JS and CSS coverage of pages and merge it per URL. Only the
+    merged used ranges and the size of each file are kept, so memory does
+    not grow with the number of pages. Inline scripts and stylesheets
+    (without an http(s) URL) are skipped.
+
+        collector = CoverageCollector()
+        collector.attach(context)          # or collector.start(page)
+        for url in urls:
+            page.goto(url)
+            collector.collect(page)        # before leaving the page
+        print(collector.report(top=10))
+    """
+
+    def __init__(self, js: bool = True, css: bool = True):
+        self.js = js
+        self.css = css
+        # url -> {"type", "size", "used": [(start, end)], "pages"}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[Page, Dict[str, Any]] = {}
+
+    def start(self, page: Page):
+        """Start precise coverage for a page (call before navigating)."""
+        cdp = page.context.new_cdp_session(page)
+        state: Dict[str, Any] = {"cdp": cdp, "stylesheets": {}}
+        if self.js:
+            cdp.send("Profiler.enable")
+            cdp.send("Profiler.startPreciseCoverage", {"detailed": True})
+        if self.css:
+            stylesheets = state["stylesheets"]
+
+            def on_stylesheet(event):
+                header = event["header"]
+                url = header.get("sourceURL", "")
+                if url.startswith(("http://", "https://")) and not header.get(
+                    "isInline"
+                ):
+                    stylesheets[header["styleSheetId"]] = (url, header["length"])
+
+            cdp.on("CSS.styleSheetAdded", on_stylesheet)
+            cdp.on(
+                "CSS.styleSheetRemoved",
+                lambda event: stylesheets.pop(event["styleSheetId"], None),
+            )
+            # A new document (navigation) drops the previous stylesheets
+            cdp.on("DOM.documentUpdated", lambda event: stylesheets.clear())
+            cdp.send("DOM.enable")
+            cdp.send("CSS.enable")
+            cdp.send("CSS.startRuleUsageTracking")
+        self._sessions[page] = state
+        page.on("close", lambda _: self._sessions.pop(page, None))
+
+    def attach(self, context: BrowserContext):
+        """Start coverage for every page opened in the context from now on."""
+        context.on("page", self.start)
+
+    def _add(self, url: str, kind: str, size: int, used: List[Range], seen: set):
+        entry = self.files.setdefault(
+            url, {"type": kind, "size": 0, "used": [], "pages": 0}
+        )
+        entry["size"] = max(entry["size"], size)
+        entry["used"] = merge_ranges(entry["used"], used)
+        if url not in seen:
+            entry["pages"] += 1
+            seen.add(url)
+
+    def collect(self, page: Page):
+        """
+        Merge the coverage of the page's current document. Call before the
+        page navigates away or closes; tracking continues afterwards.
+        """
+        state = self._sessions[page]
+        cdp = state["cdp"]
+        seen: set = set()
+        if self.js:
+            for script in cdp.send("Profiler.takePreciseCoverage")["result"]:
+                url = script["url"]
+                if not url.startswith(("http://", "https://")):
+                    continue
+                size = max(
+                    (r["endOffset"] for f in script["functions"] for r in f["ranges"]),
+                    default=0,
+                )
+                self._add(url, "js", size, executed_ranges(script["functions"]), seen)
+        if self.css:
+            used_by_sheet: Dict[str, List[Range]] = {}
+            for rule in cdp.send("CSS.takeCoverageDelta")["coverage"]:
+                if rule["used"]:
+                    used_by_sheet.setdefault(rule["styleSheetId"], []).append(
+                        (int(rule["startOffset"]), int(rule["endOffset"]))
+                    )
+            for sheet_id, (url, size) in state["stylesheets"].items():
+                used = merge_ranges([], sorted(used_by_sheet.get(sheet_id, [])))
+                self._add(url, "css", int(size), used, seen)
+
+    def stop(self, page: Page):
+        """Collect a last time and stop coverage for the page."""
+        self.collect(page)
+        state = self._sessions.pop(page)
+        state["cdp"].detach()
+
+    @contextmanager
+    def track(self, page: Page):
+        """Cover a flow on one page: with collector.track(page): ..."""
+        self.start(page)
+        try:
+            yield self
+        finally:
+            if not page.is_closed():
+                self.stop(page)
+
+    def report(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Used and unused bytes per file (largest unused first) and totals per
+        type. A byte counts as used if it ran on any collected page.
+        """
+        files = []
+        totals = {kind: {"total_bytes": 0, "used_bytes": 0} for kind in ("js", "css")}
+        for url, entry in self.files.items():
+            used = sum(end - start for start, end in entry["used"])
+            used = min(used, entry["size"])
+            files.append(
+                {
+                    "url": url,
+                    "type": entry["type"],
+                    "total_bytes": entry["size"],
+                    "used_bytes": used,
+                    "unused_bytes": entry["size"] - used,
+                    "unused_pct": round(100 * (entry["size"] - used) / entry["size"], 1)
+                    if entry["size"]
+                    else 0.0,
+                    "pages": entry["pages"],
+                }
+            )
+            totals[entry["type"]]["total_bytes"] += entry["size"]
+            totals[entry["type"]]["used_bytes"] += used
+        for total in totals.values():
+            total["unused_bytes"] = total["total_bytes"] - total["used_bytes"]
+        files.sort(key=lambda f: -f["unused_bytes"])
+        return {**totals, "files": files[:top] if top else files}
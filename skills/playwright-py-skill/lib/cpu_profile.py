@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+CPU profiling of the app under test with the CDP Profiler (Chromium): saves a
+.cpuprofile for DevTools/speedscope and ranks functions by self time
+"""
+
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from playwright.sync_api import Page
+
+# Pseudo nodes that are not the app's code
+_SKIPPED_FUNCTIONS = {"(root)", "(idle)"}
+
+
+def self_times(profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Self time per function of a CDP profile, largest first. A function that
+    shows up under several call paths is counted once.
+    """
+    nodes = {node["id"]: node for node in profile["nodes"]}
+    samples = profile.get("samples", [])
+    deltas = profile.get("timeDeltas", [])
+
+    # Each sample lasts until the next one; the last one until endTime
+    timestamps = []
+    now = profile["startTime"]
+    for delta in deltas:
+        now += delta
+        timestamps.append(now)
+    timestamps.append(profile["endTime"])
+
+    by_function: Dict[tuple, Dict[str, Any]] = {}
+    total_us = 0.0
+    for i, node_id in enumerate(samples):
+        frame = nodes[node_id]["callFrame"]
+        if frame["functionName"] in _SKIPPED_FUNCTIONS:
+            continue
+        duration = max(0, timestamps[i + 1] - timestamps[i])
+        key = (
+            frame["functionName"],
+            frame["url"],
+            frame["lineNumber"],
+            frame["columnNumber"],
+        )
+        entry = by_function.setdefault(
+            key,
+            {
+                "function": frame["functionName"] or "(anonymous)",
+                "url": frame["url"],
+                # CDP positions are 0-based
+                "line": frame["lineNumber"] + 1,
+                "column": frame["columnNumber"] + 1,
+                "self_us": 0.0,
+            },
+        )
+        entry["self_us"] += duration
+        total_us += duration
+
+    functions = sorted(by_function.values(), key=lambda f: -f["self_us"])
+    for function in functions:
+        self_us = function.pop("self_us")
+        function["self_ms"] = round(self_us / 1000, 2)
+        function["self_pct"] = round(100 * self_us / total_us, 1) if total_us else 0.0
+    return functions
+
+
+@contextmanager
+def profile_cpu(
+    page: Page,
+    path: Optional[str] = None,
+    sampling_interval_us: int = 100,
+    top: int = 10,
+):
+    """
+    Profile the page's main thread while the block runs (Chromium only).
+    Saves a .cpuprofile (open in DevTools Performance or speedscope) and
+    prints the top self-time functions with their source locations.
+
+        with profile_cpu(page, "/tmp/checkout.cpuprofile") as result:
+            page.click("text=Checkout")
+        print(result["functions"][0])
+    """
+    if path is None:
+        path = str(
+            Path(tempfile.gettempdir())
+            / f"playwright-py-skill-{time.strftime('%Y%m%d-%H%M%S')}.cpuprofile"
+        )
+    result: Dict[str, Any] = {"path": path}
+    cdp = page.context.new_cdp_session(page)
+    cdp.send("Profiler.enable")
+    cdp.send("Profiler.setSamplingInterval", {"interval": sampling_interval_us})
+    cdp.send("Profiler.start")
+    try:
+        yield result
+    finally:
+        profile = cdp.send("Profiler.stop")["profile"]
+        cdp.detach()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(profile))
+        result["duration_ms"] = round(
+            (profile["endTime"] - profile["startTime"]) / 1000, 1
+        )
+        result["functions"] = self_times(profile)
+
+        print(f"🔬 CPU profile ({result['duration_ms']:.0f} ms) saved to {path}")
+        for function in result["functions"][:top]:
+            location = (
+                f"{function['url']}:{function['line']}:{function['column']}"
+                if function["url"]
+                else "native"
+            )
+            print(
+                f"  {function['self_ms']:>9.1f} ms {function['self_pct']:>5.1f}%  "
+                f"{function['function']}  {location}"
+            )
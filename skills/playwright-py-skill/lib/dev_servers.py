@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "aiohttp>=3.9.0",
+# ]
+# ///
+"""
+Dev server discovery from the kernel's listening sockets, with a short-lived
+on-disk cache. Imports only the standard library until a probe is needed, so
+`run.py --detect-servers` answers quickly from the cache.
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import random
+import socket
+import ssl
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+COMMON_DEV_PORTS = [3000, 3001, 3002, 5173, 8080, 8000, 4200, 5000, 9000, 1234]
+
+_PROC_NET_TCP = ("/proc/net/tcp", "/proc/net/tcp6")
+_TCP_LISTEN = "0A"
+
+
+def _decode_proc_address(hex_address: str) -> str:
+    """
+    /proc/net/tcp stores addresses as 32-bit words in host byte order.
+    """
+    raw = bytes.fromhex(hex_address)
+    words = b"".join(raw[i : i + 4][::-1] for i in range(0, len(raw), 4))
+    family = socket.AF_INET if len(raw) == 4 else socket.AF_INET6
+    return socket.inet_ntop(family, words)
+
+
+def list_listening_sockets(
+    paths: Tuple[str, ...] = _PROC_NET_TCP,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Local TCP listeners read from the kernel's socket tables, without any
+    network traffic. Returns [{"address", "port", "inode"}], or None where
+    /proc/net/tcp is not available (macOS, Windows).
+    """
+    sockets = []
+    readable = False
+    for path in paths:
+        try:
+            with open(path) as f:
+                lines = f.readlines()[1:]
+        except OSError:
+            continue
+        readable = True
+        for line in lines:
+            fields = line.split()
+            if len(fields) < 10 or fields[3] != _TCP_LISTEN:
+                continue
+            address, port = fields[1].split(":")
+            sockets.append(
+                {
+                    "address": _decode_proc_address(address),
+                    "port": int(port, 16),
+                    "inode": int(fields[9]),
+                }
+            )
+    return sockets if readable else None
+
+
+def _socket_owners(inodes: set) -> Dict[int, Dict[str, Any]]:
+    """
+    Map socket inodes to {"pid", "process"} by scanning /proc/*/fd. Only
+    processes whose file descriptors are readable (usually our own user's)
+    can be resolved.
+    """
+    owners: Dict[int, Dict[str, Any]] = {}
+    if not inodes:
+        return owners
+    targets = {f"socket:[{inode}]": inode for inode in inodes}
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return owners
+
+    for pid in pids:
+        fd_dir = f"/proc/{pid}/fd"
+        try:
+            fds = os.listdir(fd_dir)
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                inode = targets.get(os.readlink(f"{fd_dir}/{fd}"))
+            except OSError:
+                continue
+            if inode is not None and inode not in owners:
+                try:
+                    with open(f"/proc/{pid}/comm") as f:
+                        process = f.read().strip()
+                except OSError:
+                    process = None
+                owners[inode] = {"pid": int(pid), "process": process}
+        if len(owners) == len(inodes):
+            break
+    return owners
+
+
+def _probe_host(address: Optional[str]) -> str:
+    if address is None or address in ("0.0.0.0", "::") or address.startswith("127."):
+        return "127.0.0.1"
+    if address in ("::1", "::ffff:127.0.0.1"):
+        return "[::1]"
+    return f"[{address}]" if ":" in address else address
+
+
+def _server_host(address: Optional[str]) -> str:
+    """
+    Host for a server's URL: localhost for loopback and wildcard listeners,
+    otherwise the address it is bound to, which is the only one it answers.
+    """
+    host = _probe_host(address)
+    return "localhost" if host in ("127.0.0.1", "[::1]") else host
+
+
+def _cache_path() -> Path:
+    """
+    PW_DEV_SERVER_CACHE, or a per-user JSON file in the temp directory.
+    """
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return Path(
+        os.environ.get(
+            "PW_DEV_SERVER_CACHE",
+            Path(tempfile.gettempdir()) / f"playwright-py-skill-dev-servers-{uid}.json",
+        )
+    )
+
+
+def _cache_ttl() -> float:
+    """
+    Seconds a detection result stays valid, PW_DEV_SERVER_CACHE_TTL (default
+    30, 0 disables the cache).
+    """
+    try:
+        return float(os.environ.get("PW_DEV_SERVER_CACHE_TTL", "30"))
+    except ValueError:
+        return 30.0
+
+
+def _socket_fingerprint(sockets: Optional[List[Dict[str, Any]]]) -> Optional[list]:
+    """
+    Listening ports and socket inodes. A server starting, stopping or
+    restarting changes the fingerprint and invalidates cached results.
+    """
+    if sockets is None:
+        return None
+    return sorted({(sock["port"], sock["inode"]) for sock in sockets})
+
+
+def _read_cache(fingerprint, custom_ports: List[int]) -> Optional[List[Dict]]:
+    ttl = _cache_ttl()
+    if ttl <= 0:
+        return None
+    try:
+        cached = json.loads(_cache_path().read_text())
+    except (OSError, ValueError):
+        return None
+    if (
+        time.time() - cached.get("created", 0) > ttl
+        or cached.get("fingerprint") != json.loads(json.dumps(fingerprint))
+        or cached.get("custom_ports") != custom_ports
+    ):
+        return None
+    return cached["servers"]
+
+
+def _write_cache(fingerprint, custom_ports: List[int], servers: List[Dict]):
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(
+                {
+                    "created": time.time(),
+                    "fingerprint": fingerprint,
+                    "custom_ports": custom_ports,
+                    "servers": servers,
+                },
+                f,
+            )
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+async def _probe_ports(
+    candidates: Dict[int, Dict[str, Any]], timeout: float
+) -> Dict[int, Optional[int]]:
+    """
+    HEAD every candidate port concurrently through one session, returning
+    the HTTP status per port (None if nothing answered HTTP).
+    """
+    import aiohttp
+
+    async def probe(session: aiohttp.ClientSession, port: int) -> Optional[int]:
+        host = _probe_host(candidates[port]["address"])
+        try:
+            async with session.head(f"http://{host}:{port}") as response:
+                return response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return None
+
+    ports = sorted(candidates)
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0, force_close=True),
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as session:
+        statuses = await asyncio.gather(*(probe(session, port) for port in ports))
+    return dict(zip(ports, statuses))
+
+
+async def find_dev_servers(
+    custom_ports: Optional[List[int]] = None,
+    timeout: float = 0.5,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Find local HTTP servers. Listening ports are read from /proc/net/tcp and
+    tcp6 (falling back to COMMON_DEV_PORTS elsewhere) and probed concurrently
+    through one session. Returns [{"url", "port", "status", "pid",
+    "process"}] for ports answering HEAD with a non-5xx status. The URL uses
+    localhost, or the address of servers bound to a single other interface.
+
+    Results are cached for PW_DEV_SERVER_CACHE_TTL seconds, and dropped
+    earlier when the set of listening sockets changes. use_cache=False
+    forces a fresh probe.
+    """
+    custom_ports = sorted(set(custom_ports or []))
+    sockets = list_listening_sockets()
+    fingerprint = _socket_fingerprint(sockets)
+    if use_cache:
+        cached = _read_cache(fingerprint, custom_ports)
+        if cached is not None:
+            return cached
+
+    candidates: Dict[int, Dict[str, Any]] = {}
+    if sockets is None:
+        for port in COMMON_DEV_PORTS:
+            candidates[port] = {"address": None, "inodes": set()}
+    else:
+        for sock in sockets:
+            candidate = candidates.setdefault(
+                sock["port"], {"address": sock["address"], "inodes": set()}
+            )
+            candidate["inodes"].add(sock["inode"])
+            # Prefer a listener reachable through the loopback interface
+            if _probe_host(sock["address"]).startswith("127."):
+                candidate["address"] = sock["address"]
+    for port in custom_ports:
+        candidates.setdefault(port, {"address": None, "inodes": set()})
+
+    statuses = await _probe_ports(candidates, timeout)
+    servers = [
+        {
+            "url": f"http://{_server_host(candidates[port]['address'])}:{port}",
+            "port": port,
+            "status": status,
+        }
+        for port, status in sorted(statuses.items())
+        if status is not None and status < 500
+    ]
+    owners = _socket_owners(
+        {inode for server in servers for inode in candidates[server["port"]]["inodes"]}
+    )
+    for server in servers:
+        owner = next(
+            (owners[i] for i in candidates[server["port"]]["inodes"] if i in owners),
+            {"pid": None, "process": None},
+        )
+        server.update(owner)
+
+    _write_cache(fingerprint, custom_ports, servers)
+    return servers
+
+
+async def detect_dev_servers(custom_ports: Optional[List[int]] = None) -> List[str]:
+    """
+    Detect running dev servers on any local port (see find_dev_servers()).
+    """
+    print("🔍 Checking for running dev servers...")
+    servers = await find_dev_servers(custom_ports)
+
+    for server in servers:
+        process = f" ({server['process']})" if server["process"] else ""
+        print(f"  ✅ Found server on port {server['port']}{process}")
+
+    if not servers:
+        print("  ❌ No dev servers detected")
+
+    return [server["url"] for server in servers]
+
+
+def _http_status(url: str, timeout: float) -> Optional[int]:
+    parts = urlsplit(url)
+    if parts.scheme == "https":
+        # Dev servers commonly use self-signed certificates
+        connection = http.client.HTTPSConnection(
+            parts.netloc, timeout=timeout, context=ssl._create_unverified_context()
+        )
+    else:
+        connection = http.client.HTTPConnection(parts.netloc, timeout=timeout)
+    try:
+        connection.request("HEAD", parts.path or "/")
+        return connection.getresponse().status
+    except (OSError, http.client.HTTPException):
+        return None
+    finally:
+        connection.close()
+
+
+def wait_for_dev_server(
+    port_or_url: Union[int, str],
+    timeout: float = 60,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+) -> Dict[str, Any]:
+    """
+    Wait until a starting dev server answers HTTP with a non-5xx status.
+    Probes with a cheap TCP connect first and only then with HEAD, backing
+    off exponentially with jitter between attempts. Returns {"url", "ready",
+    "status", "elapsed_ms", "attempts"}.
+    """
+    if isinstance(port_or_url, int) or str(port_or_url).isdigit():
+        url = f"http://localhost:{port_or_url}"
+    else:
+        url = str(port_or_url)
+    parts = urlsplit(url)
+    host = parts.hostname or "localhost"
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+
+    started = time.monotonic()
+    deadline = started + timeout
+    delay = initial_delay
+    attempts = 0
+    status = None
+
+    while True:
+        attempts += 1
+        remaining = deadline - time.monotonic()
+        try:
+            with socket.create_connection((host, port), max(0.05, min(remaining, 1))):
+                pass
+            status = _http_status(url, timeout=max(0.1, min(remaining, 2)))
+        except OSError:
+            status = None
+
+        if status is not None and status < 500:
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            print(f"✅ {url} ready after {elapsed_ms}ms (HTTP {status})")
+            return {
+                "url": url,
+                "ready": True,
+                "status": status,
+                "elapsed_ms": elapsed_ms,
+                "attempts": attempts,
+            }
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(remaining, random.uniform(delay / 2, delay)))
+        delay = min(delay * 2, max_delay)
+
+    elapsed_ms = int((time.monotonic() - started) * 1000)
+    print(f"⚠️  {url} not ready after {elapsed_ms}ms", file=sys.stderr)
+    return {
+        "url": url,
+        "ready": False,
+        "status": status,
+        "elapsed_ms": elapsed_ms,
+        "attempts": attempts,
+    }
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Retain-on-failure tracing: trace every context, write artifacts only on failure
+"""
+
+import shutil
+import sys
+import tempfile
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import playwright.sync_api
+from playwright.sync_api import Browser, BrowserContext, BrowserType
+
+_state: Dict[str, Any] = {
+    "output_dir": None,
+    "run_id": None,
+    "contexts": [],
+    "captured": set(),
+    "saved": [],
+    "parked": [],
+    "parked_dir": None,
+}
+_originals: Dict[str, Callable] = {}
+
+
+def start_failure_tracing(context: BrowserContext) -> BrowserContext:
+    """
+    Start in-memory tracing (DOM snapshots, no screencast) for a context.
+    Stopping without a path discards the trace, so passing runs write nothing.
+    """
+    try:
+        context.tracing.start(snapshots=True, screenshots=False, sources=False)
+    except Exception as e:
+        print(f"⚠️  Could not start tracing: {e}", file=sys.stderr)
+        return context
+    _state["contexts"].append(context)
+    return context
+
+
+def capture_failure(error: BaseException) -> List[str]:
+    """
+    Save the traceback of error, and trace zip, DOM snapshot and screenshot of
+    every traced context which is still open. Traces parked by contexts closed
+    earlier in the run are moved next to them. Each context is captured at
+    most once.
+    """
+    output_dir = _state["output_dir"]
+    if output_dir is None:
+        return []
+
+    run_dir = Path(output_dir) / _state["run_id"]
+    saved = []
+    error_path = run_dir / "error.txt"
+    if not error_path.exists():
+        run_dir.mkdir(parents=True, exist_ok=True)
+        error_path.write_text("".join(traceback.format_exception(error)))
+        saved.append(str(error_path))
+
+    for parked in _state["parked"]:
+        shutil.move(parked, run_dir / Path(parked).name)
+        saved.append(str(run_dir / Path(parked).name))
+    _state["parked"] = []
+
+    for index, context in enumerate(_state["contexts"]):
+        if id(context) in _state["captured"]:
+            continue
+        _state["captured"].add(id(context))
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            pages = list(context.pages)
+        except Exception:
+            continue  # Context already closed, its trace is gone
+
+        for page_index, page in enumerate(pages):
+            prefix = run_dir / f"context-{index}-page-{page_index}"
+            try:
+                Path(f"{prefix}.html").write_text(page.content())
+                saved.append(f"{prefix}.html")
+                page.screenshot(path=f"{prefix}.png", full_page=True)
+                saved.append(f"{prefix}.png")
+            except Exception as e:
+                print(f"⚠️  Could not snapshot page: {e}", file=sys.stderr)
+
+        trace_path = run_dir / f"context-{index}-trace.zip"
+        try:
+            context.tracing.stop(path=str(trace_path))
+            saved.append(str(trace_path))
+        except Exception as e:
+            print(f"⚠️  Could not save trace: {e}", file=sys.stderr)
+
+    for path in saved:
+        print(f"🧾 Failure artifact saved: {path}")
+    _state["saved"].extend(saved)
+    return saved
+
+
+def _park_trace(context: BrowserContext):
+    # Closing a context destroys its trace, and whether the run fails is only
+    # known later, so the trace is kept in a temporary file until then
+    if _state["output_dir"] is None or id(context) in _state["captured"]:
+        return
+    _state["captured"].add(id(context))
+    index = next(
+        (i for i, traced in enumerate(_state["contexts"]) if traced is context),
+        None,
+    )
+    if index is None:
+        return
+    if _state["parked_dir"] is None:
+        _state["parked_dir"] = tempfile.mkdtemp(prefix="pw-failure-trace-")
+    path = Path(_state["parked_dir"]) / f"context-{index}-trace.zip"
+    try:
+        context.tracing.stop(path=str(path))
+        _state["parked"].append(str(path))
+    except Exception as e:
+        print(f"⚠️  Could not save trace: {e}", file=sys.stderr)
+
+
+class _CaptureOnExit:
+    # sync_playwright() stops the driver on exit, which loses the traces of
+    # contexts the script left open, so failures are captured just before
+    def __init__(self, manager):
+        self._manager = manager
+
+    def __getattr__(self, name):
+        return getattr(self._manager, name)
+
+    def __enter__(self):
+        return self._manager.__enter__()
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_value is not None:
+            capture_failure(exc_value)
+        return self._manager.__exit__(exc_type, exc_value, exc_traceback)
+
+
+def install(output_dir: str, run_id: str):
+    """
+    Trace every context created through the sync API, and capture artifacts
+    when a sync_playwright() block exits with an exception or capture_failure()
+    is called. Only sync_playwright() imported after install() is hooked.
+    Contexts closed before that park their trace in a temporary file.
+    """
+    _discard_parked()
+    _state.update(
+        output_dir=output_dir, run_id=run_id, contexts=[], captured=set(), saved=[]
+    )
+    if _originals:
+        return
+
+    _originals["new_context"] = Browser.new_context
+    _originals["new_page"] = Browser.new_page
+    _originals["launch_persistent_context"] = BrowserType.launch_persistent_context
+    _originals["context_close"] = BrowserContext.close
+    _originals["browser_close"] = Browser.close
+    _originals["sync_playwright"] = playwright.sync_api.sync_playwright
+
+    def new_context(self, *args, **kwargs):
+        return start_failure_tracing(_originals["new_context"](self, *args, **kwargs))
+
+    def new_page(self, *args, **kwargs):
+        page = _originals["new_page"](self, *args, **kwargs)
+        start_failure_tracing(page.context)
+        return page
+
+    def launch_persistent_context(self, *args, **kwargs):
+        return start_failure_tracing(
+            _originals["launch_persistent_context"](self, *args, **kwargs)
+        )
+
+    def context_close(self, *args, **kwargs):
+        _park_trace(self)
+        return _originals["context_close"](self, *args, **kwargs)
+
+    def browser_close(self, *args, **kwargs):
+        for context in self.contexts:
+            _park_trace(context)
+        return _originals["browser_close"](self, *args, **kwargs)
+
+    def sync_playwright():
+        return _CaptureOnExit(_originals["sync_playwright"]())
+
+    Browser.new_context = new_context
+    Browser.new_page = new_page
+    BrowserType.launch_persistent_context = launch_persistent_context
+    BrowserContext.close = context_close
+    Browser.close = browser_close
+    playwright.sync_api.sync_playwright = sync_playwright
+
+
+def _discard_parked():
+    if _state["parked_dir"] is not None:
+        shutil.rmtree(_state["parked_dir"], ignore_errors=True)
+    _state.update(parked=[], parked_dir=None)
+
+
+def uninstall():
+    """
+    Restore the original Playwright methods and delete parked traces which no
+    failure claimed.
+    """
+    _discard_parked()
+    if not _originals:
+        return
+    Browser.new_context = _originals.pop("new_context")
+    Browser.new_page = _originals.pop("new_page")
+    BrowserType.launch_persistent_context = _originals.pop("launch_persistent_context")
+    BrowserContext.close = _originals.pop("context_close")
+    Browser.close = _originals.pop("browser_close")
+    playwright.sync_api.sync_playwright = _originals.pop("sync_playwright")
+    _state["output_dir"] = None
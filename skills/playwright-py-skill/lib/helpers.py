@@ -11,13 +11,35 @@ Reusable utility functions for Playwright automation
 """
 
 import os
+import re
 import sys
+import time
+import hashlib
+import itertools
+import tempfile
+import weakref
 import asyncio
 import aiohttp
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Union, Iterable, Iterator, Tuple
+from urllib.parse import urlsplit, urlunsplit
 from playwright.sync_api import Browser, Page, BrowserContext
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+# Re-exported: dev server discovery used to live in this module
+from lib.dev_servers import (
+    COMMON_DEV_PORTS as COMMON_DEV_PORTS,
+    detect_dev_servers as detect_dev_servers,
+    find_dev_servers as find_dev_servers,
+    list_listening_sockets as list_listening_sockets,
+    wait_for_dev_server as wait_for_dev_server,
+)
 
 
 def get_extra_headers_from_env() -> Optional[Dict[str, str]]:
@@ -50,11 +72,210 @@ def get_extra_headers_from_env() -> Optional[Dict[str, str]]:
     return None
 
 
-def launch_browser(browser_type: str = "chromium", **options) -> Browser:
+HAR_MODES = ("record", "replay")
+HAR_NOT_FOUND = ("abort", "fallback")
+
+_har_context_counter = itertools.count()
+_har_browsers: "weakref.WeakSet[Browser]" = weakref.WeakSet()
+
+
+def get_har_options_from_env() -> Optional[Dict[str, str]]:
     """
-    Launch browser with standard configuration.
+    Parse HAR record/replay settings from environment variables.
+    - PW_HAR_MODE: "record" (save traffic) or "replay" (serve from the HAR)
+    - PW_HAR_PATH: HAR file, default playwright-py-skill.har in the temp dir
+    - PW_HAR_NOT_FOUND: replay behavior for requests missing from the HAR,
+      "abort" (default, fully offline) or "fallback" (use the network)
     """
-    from playwright.sync_api import sync_playwright
+    mode = os.environ.get("PW_HAR_MODE")
+    if not mode:
+        return None
+
+    if mode not in HAR_MODES:
+        print(
+            f"⚠️  PW_HAR_MODE must be one of {', '.join(HAR_MODES)}, ignoring...",
+            file=sys.stderr,
+        )
+        return None
+
+    not_found = os.environ.get("PW_HAR_NOT_FOUND", "abort")
+    if not_found not in HAR_NOT_FOUND:
+        print(
+            f"⚠️  PW_HAR_NOT_FOUND must be one of {', '.join(HAR_NOT_FOUND)}, "
+            "using abort...",
+            file=sys.stderr,
+        )
+        not_found = "abort"
+
+    return {
+        "mode": mode,
+        "path": os.environ.get(
+            "PW_HAR_PATH",
+            str(Path(tempfile.gettempdir()) / "playwright-py-skill.har"),
+        ),
+        "not_found": not_found,
+    }
+
+
+def _har_path_for_context(path: str, index: int) -> str:
+    """
+    First context uses the HAR path as-is, later ones get a numbered suffix,
+    so recording and replaying the same script map contexts identically.
+    """
+    if index == 0:
+        return path
+    har_path = Path(path)
+    return str(har_path.with_name(f"{har_path.stem}-{index}{har_path.suffix}"))
+
+
+def _close_contexts_on_browser_close(browser: Browser):
+    """
+    HAR recordings are only written by context.close(), not browser.close(),
+    so close this browser's contexts first.
+    """
+    if browser in _har_browsers:
+        return
+    _har_browsers.add(browser)
+    original_close = browser.close
+
+    def close(**kwargs):
+        for context in list(browser.contexts):
+            try:
+                context.close()
+            except Exception as e:
+                print(f"⚠️  Failed to close context: {e}", file=sys.stderr)
+        return original_close(**kwargs)
+
+    setattr(browser, "close", close)
+
+
+def _apply_har_mode(browser: Browser, context: BrowserContext, har: Dict[str, str]):
+    """
+    Record all traffic of a context into a HAR, or serve it from one.
+    """
+    path = _har_path_for_context(har["path"], next(_har_context_counter))
+
+    if har["mode"] == "record":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        context.route_from_har(path, update=True)
+        _close_contexts_on_browser_close(browser)
+        print(f"📼 Recording network traffic to {path}")
+        return
+
+    if not Path(path).exists():
+        if har["not_found"] == "fallback":
+            print(f"⚠️  HAR file {path} not found, using network", file=sys.stderr)
+            return
+        raise FileNotFoundError(
+            f"HAR file not found: {path} (record it first with PW_HAR_MODE=record)"
+        )
+
+    context.route_from_har(path, not_found=har["not_found"])
+    print(f"📼 Replaying network traffic from {path}")
+
+
+def _profile_root() -> Path:
+    """
+    Directory holding persistent profiles: PW_PROFILE_DIR, or
+    ~/.cache/playwright-py-skill/profiles by default.
+    """
+    return Path(
+        os.environ.get(
+            "PW_PROFILE_DIR",
+            Path.home() / ".cache" / "playwright-py-skill" / "profiles",
+        )
+    )
+
+
+def _profile_slug(browser_type: str, origin: str) -> str:
+    parts = urlsplit(origin if "://" in origin else f"http://{origin}")
+    host = parts.hostname or "local"
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return re.sub(
+        r"[^A-Za-z0-9.-]+", "_", f"{browser_type}-{parts.scheme}-{host}-{port}"
+    )
+
+
+def _try_lock(lock_path: Path):
+    """
+    Take an exclusive non-blocking lock, returning the open lock file or None.
+    """
+    lock_file = open(lock_path, "a+")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def acquire_profile_dir(browser_type: str, origin: str, max_slots: int = 8):
+    """
+    Lock a persistent profile directory for an app origin. Concurrent runs
+    get separate numbered slots, so a profile is never shared. Returns the
+    directory and the open lock file (closing it releases the profile).
+    """
+    slug = _profile_slug(browser_type, origin)
+    for slot in range(max_slots):
+        profile_dir = _profile_root() / (slug if slot == 0 else f"{slug}-{slot}")
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = _try_lock(profile_dir / ".lock")
+        if lock_file is not None:
+            (profile_dir / ".last-used").touch()
+            return profile_dir, lock_file
+
+    raise RuntimeError(
+        f"All {max_slots} persistent profiles for {origin} are in use by other runs"
+    )
+
+
+def prune_profiles(max_age_days: float = 7) -> List[str]:
+    """
+    Delete persistent profiles which are not locked and were last used more
+    than max_age_days ago.
+    """
+    import shutil
+
+    root = _profile_root()
+    if not root.exists():
+        return []
+
+    cutoff = time.time() - max_age_days * 86400
+    pruned = []
+    for profile_dir in sorted(root.iterdir()):
+        if not profile_dir.is_dir():
+            continue
+        marker = profile_dir / ".last-used"
+        if (marker if marker.exists() else profile_dir).stat().st_mtime > cutoff:
+            continue
+        lock_file = _try_lock(profile_dir / ".lock")
+        if lock_file is None:
+            continue  # In use by a running browser
+        try:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            pruned.append(str(profile_dir))
+        finally:
+            lock_file.close()
+
+    for path in pruned:
+        print(f"🧹 Pruned profile: {path}")
+    return pruned
+
+
+def launch_options(browser_type: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Launch options merged with launch_browser()'s defaults (HEADLESS and
+    SLOW_MO from the env), after checking the browser type.
+    """
+    if browser_type not in ("chromium", "firefox", "webkit"):
+        raise ValueError(f"Invalid browser type: {browser_type}")
 
     default_options = {
         "headless": os.environ.get("HEADLESS", "true").lower() != "false",
@@ -62,17 +283,56 @@ def launch_browser(browser_type: str = "chromium", **options) -> Browser:
         "args": ["--no-sandbox", "--disable-setuid-sandbox"],
     }
 
-    merged_options = {**default_options, **options}
-    browsers = {
-        "chromium": sync_playwright().start().chromium,
-        "firefox": sync_playwright().start().firefox,
-        "webkit": sync_playwright().start().webkit,
-    }
+    return {**default_options, **options}
 
-    if browser_type not in browsers:
-        raise ValueError(f"Invalid browser type: {browser_type}")
 
-    return browsers[browser_type].launch(**merged_options)
+def launch_browser(browser_type: str = "chromium", **options) -> Browser:
+    """
+    Launch browser with standard configuration.
+    """
+    from playwright.sync_api import sync_playwright
+
+    merged_options = launch_options(browser_type, options)
+    playwright = sync_playwright().start()
+    try:
+        return getattr(playwright, browser_type).launch(**merged_options)
+    except Exception:
+        playwright.stop()
+        raise
+
+
+def launch_persistent_context(
+    browser_type: str, origin: str, **options
+) -> BrowserContext:
+    """
+    Launch a persistent context in a locked per-origin profile (e.g.
+    origin="http://localhost:3000"), so HTTP cache, V8 code cache and
+    service workers stay warm between runs. Closing the context releases
+    the profile and stops its Playwright instance.
+    """
+    from playwright.sync_api import sync_playwright
+
+    merged_options = launch_options(browser_type, options)
+    profile_dir, lock_file = acquire_profile_dir(browser_type, origin)
+    playwright = sync_playwright().start()
+    try:
+        context = getattr(playwright, browser_type).launch_persistent_context(
+            str(profile_dir), **merged_options
+        )
+    except Exception:
+        playwright.stop()
+        lock_file.close()
+        raise
+    context.on("close", lambda _: lock_file.close())
+    close = context.close
+
+    def close_and_stop(**kwargs):
+        close(**kwargs)
+        playwright.stop()
+
+    setattr(context, "close", close_and_stop)
+    print(f"🔥 Using persistent profile: {profile_dir}")
+    return context
 
 
 def create_page(context: BrowserContext, **options) -> Page:
@@ -116,6 +376,238 @@ def wait_for_page_ready(page: Page, **options):
         )
 
 
+def start_navigation(page: Page, url: str, wait_until: str = "load") -> Dict[str, Any]:
+    """
+    Start navigating a page without waiting for it, so several pages can load
+    at the same time with the sync API. Pass the returned state to
+    finish_navigation(). wait_until is "load" or "domcontentloaded".
+    """
+    if wait_until not in ("load", "domcontentloaded"):
+        raise ValueError('wait_until must be "load" or "domcontentloaded"')
+
+    state: Dict[str, Any] = {
+        "url": url,
+        "wait_until": wait_until,
+        "response": None,
+        "error": None,
+        "done": False,
+    }
+
+    def on_response(response):
+        request = response.request
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            state["response"] = response
+
+    def on_request_failed(request):
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            state["error"] = request.failure or "navigation failed"
+
+    def on_done(_):
+        state["done"] = True
+
+    state["listeners"] = [
+        ("response", on_response),
+        ("requestfailed", on_request_failed),
+        (wait_until, on_done),
+    ]
+    for event, handler in state["listeners"]:
+        page.on(event, handler)
+    page.evaluate("(url) => { window.location.href = url; }", url)
+    return state
+
+
+def finish_navigation(page: Page, state: Dict[str, Any], timeout: float = 30000):
+    """
+    Wait for a navigation started with start_navigation() and return its main
+    document response. Events of other pages keep being handled while
+    waiting. Raises PlaywrightError if the navigation failed.
+    """
+    deadline = time.monotonic() + timeout / 1000
+    try:
+        while not state["done"] and state["error"] is None:
+            remaining = (deadline - time.monotonic()) * 1000
+            if remaining <= 0:
+                raise PlaywrightTimeoutError(
+                    f"Timeout {timeout}ms exceeded navigating to {state['url']}"
+                )
+            try:
+                # Short slices so a failed request is noticed without a load event
+                page.wait_for_event(state["wait_until"], timeout=min(remaining, 250))
+                state["done"] = True
+            except PlaywrightTimeoutError:
+                continue
+    finally:
+        for event, handler in state["listeners"]:
+            page.remove_listener(event, handler)
+
+    if state["error"] is not None:
+        raise PlaywrightError(f"{state['error']} at {state['url']}")
+    return state["response"]
+
+
+def pipelined_pages(
+    context: BrowserContext,
+    urls: Iterable[str],
+    in_flight: int = 3,
+    wait_until: str = "load",
+    timeout: float = 30000,
+    **page_options,
+) -> Iterator[Tuple[str, Page]]:
+    """
+    Yield (url, page) in order, with up to `in_flight` pages of the context
+    loading the next URLs while the caller processes the current one.
+    Pages are reused, so use a page only until the next iteration. URLs
+    which fail to load are reported on stderr and skipped.
+    """
+    urls = iter(urls)
+    pages = []
+    pending = deque()
+
+    def start_next(page: Page) -> bool:
+        for url in urls:
+            try:
+                pending.append((url, page, start_navigation(page, url, wait_until)))
+                return True
+            except Exception as e:
+                print(f"⚠️  Navigation to {url} failed: {e}", file=sys.stderr)
+        return False
+
+    try:
+        for _ in range(max(1, in_flight)):
+            page = create_page(context, timeout=timeout, **page_options)
+            pages.append(page)
+            if not start_next(page):
+                break
+
+        while pending:
+            url, page, state = pending.popleft()
+            try:
+                finish_navigation(page, state, timeout)
+            except Exception as e:
+                print(f"⚠️  Navigation to {url} failed: {e}", file=sys.stderr)
+            else:
+                yield url, page
+            start_next(page)
+    finally:
+        for page in pages:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+
+class TabPool:
+    """
+    Up to `size` reusable pages of one context (same cookies and session),
+    created with create_page(context, **page_options). Returned pages are
+    reset: listeners added with page.on()/page.once() and routes added
+    while in use are removed and the page is navigated to about:blank.
+
+        with TabPool(context, size=4) as pool:
+            with pool.page() as page:
+                page.goto(url)
+    """
+
+    def __init__(self, context: BrowserContext, size: int = 4, **page_options):
+        self.context = context
+        self.size = size
+        self.page_options = page_options
+        self.created = 0
+        self.reused = 0
+        self._idle: List[Page] = []
+        self._busy: List[Page] = []
+        # Listeners added through page.on()/page.once() while checked out
+        self._listeners: Dict[Page, List[Tuple[str, Any]]] = {}
+
+    def _track_listeners(self, page: Page):
+        """Record the listeners callers add, so release() can remove them."""
+        listeners = self._listeners[page] = []
+        page_type = type(page)
+
+        def on(event, handler):
+            listeners.append((event, handler))
+            page_type.on(page, event, handler)
+
+        def once(event, handler):
+            listeners.append((event, handler))
+            page_type.once(page, event, handler)
+
+        setattr(page, "on", on)
+        setattr(page, "once", once)
+
+    def acquire(self) -> Page:
+        """
+        Check out an idle page, or open a new one while below size.
+        """
+        if self._idle:
+            page = self._idle.pop()
+            self.reused += 1
+        elif len(self._busy) < self.size:
+            page = create_page(self.context, **self.page_options)
+            self._track_listeners(page)
+            self.created += 1
+        else:
+            raise RuntimeError(f"All {self.size} tabs of the pool are in use")
+        self._busy.append(page)
+        return page
+
+    def release(self, page: Page):
+        """
+        Reset a page and return it to the pool. Pages which were closed or
+        fail to reset are dropped.
+        """
+        self._busy.remove(page)
+        try:
+            if page.is_closed():
+                self._listeners.pop(page)
+                return
+            listeners = self._listeners[page]
+            while listeners:
+                event, handler = listeners.pop()
+                try:
+                    page.remove_listener(event, handler)
+                except KeyError:
+                    pass  # a once() listener which already ran
+            page.unroute_all(behavior="ignoreErrors")
+            page.goto("about:blank")
+            if "viewport" in self.page_options:
+                page.set_viewport_size(self.page_options["viewport"])
+            page.set_default_timeout(self.page_options.get("timeout", 30000))
+        except Exception as e:
+            print(f"⚠️  Dropping tab which failed to reset: {e}", file=sys.stderr)
+            self._listeners.pop(page, None)
+            try:
+                page.close()
+            except Exception:
+                pass
+            return
+        self._idle.append(page)
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        page = self.acquire()
+        try:
+            yield page
+        finally:
+            self.release(page)
+
+    def close(self):
+        for page in self._idle + self._busy:
+            try:
+                page.close()
+            except Exception:
+                pass
+        self._idle.clear()
+        self._busy.clear()
+        self._listeners.clear()
+
+    def __enter__(self) -> "TabPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def safe_click(page: Page, selector: str, **options) -> bool:
     """
     Safe click with retry logic.
@@ -171,14 +663,159 @@ def extract_texts(page: Page, selector: str) -> List[str]:
     return page.locator(selector).all_text_contents()
 
 
+_ASSETS_READY_JS = """
+async (timeoutMs) => {
+    const settle = async () => {
+        if (document.fonts && document.fonts.ready) {
+            await document.fonts.ready;
+        }
+        const pending = Array.from(document.images)
+            .filter(img => img.complete || img.loading !== 'lazy')
+            .map(img => {
+                const loaded = img.complete
+                    ? Promise.resolve()
+                    : new Promise(resolve => {
+                        img.addEventListener('load', resolve, { once: true });
+                        img.addEventListener('error', resolve, { once: true });
+                    });
+                return loaded.then(() => img.decode ? img.decode().catch(() => {}) : null);
+            });
+        await Promise.all(pending);
+        return true;
+    };
+    const expired = new Promise(resolve => setTimeout(() => resolve(false), timeoutMs));
+    return Promise.race([settle(), expired]);
+}
+"""
+
+
+def _capture_probe_frame(page: Page, cdp) -> bytes:
+    """
+    Capture a cheap low-resolution frame for render stability checks.
+    """
+    if cdp is not None:
+        viewport = page.viewport_size or page.evaluate(
+            "() => ({ width: window.innerWidth, height: window.innerHeight })"
+        )
+        result = cdp.send(
+            "Page.captureScreenshot",
+            {
+                "format": "jpeg",
+                "quality": 30,
+                "clip": {
+                    "x": 0,
+                    "y": 0,
+                    "width": viewport["width"],
+                    "height": viewport["height"],
+                    "scale": 0.25,
+                },
+            },
+        )
+        return result["data"].encode()
+
+    return page.screenshot(type="jpeg", quality=30, scale="css", animations="allow")
+
+
+def wait_for_render_stable(
+    page: Page, timeout: int = 5000, interval: int = 100, stable_frames: int = 3
+) -> Dict[str, Any]:
+    """
+    Wait until web fonts and images are ready and consecutive frames match.
+    Returns a report with the time spent and whether the page settled.
+    """
+    started = time.monotonic()
+
+    def elapsed_ms() -> int:
+        return int((time.monotonic() - started) * 1000)
+
+    try:
+        assets_ready = bool(page.evaluate(_ASSETS_READY_JS, timeout))
+    except Exception:
+        assets_ready = False
+
+    # Chromium can capture downscaled frames via CDP; other browsers fall back
+    # to a low-quality JPEG screenshot
+    try:
+        cdp = page.context.new_cdp_session(page)
+    except Exception:
+        cdp = None
+
+    previous = None
+    matches = 0
+    frames = 0
+    stable = False
+    try:
+        while True:
+            digest = hashlib.sha1(_capture_probe_frame(page, cdp)).digest()
+            frames += 1
+            matches = matches + 1 if digest == previous else 0
+            previous = digest
+            if matches >= stable_frames - 1:
+                stable = True
+                break
+            if elapsed_ms() + interval > timeout:
+                break
+            page.wait_for_timeout(interval)
+    finally:
+        if cdp is not None:
+            try:
+                cdp.detach()
+            except Exception:
+                pass
+
+    return {
+        "stable": stable,
+        "assets_ready": assets_ready,
+        "frames": frames,
+        "elapsed_ms": elapsed_ms(),
+    }
+
+
+_render_reports: "weakref.WeakKeyDictionary[Page, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_render_report(page: Page) -> Optional[Dict[str, Any]]:
+    """
+    wait_for_render_stable() report of the page's last
+    take_screenshot(wait_for_stable=True), with the file under "screenshot";
+    None if no screenshot of the page waited for a stable render.
+    """
+    return _render_reports.get(page)
+
+
 def take_screenshot(page: Page, name: str, **options) -> str:
     """
     Take screenshot with timestamp.
+    Pass wait_for_stable=True to wait for fonts, images and a visually stable
+    frame (at most stable_timeout ms) instead of a fixed wait_for_timeout().
+    The wait's report is available from get_render_report(page).
     """
+    wait_for_stable = options.pop("wait_for_stable", False)
+    stable_timeout = options.pop("stable_timeout", 5000)
+    full_page = options.pop("full_page", True)
+
+    if wait_for_stable:
+        report = wait_for_render_stable(page, timeout=stable_timeout)
+        if report["stable"]:
+            print(
+                f"⏱️  Render stable after {report['elapsed_ms']}ms "
+                f"({report['frames']} frames)"
+            )
+        else:
+            print(
+                f"⚠️  Render not stable after {report['elapsed_ms']}ms, "
+                "capturing anyway",
+                file=sys.stderr,
+            )
+
     timestamp = datetime.now().isoformat().replace(":", "-").replace(".", "-")
     filename = f"{name}-{timestamp}.png"
 
-    page.screenshot(path=filename, full_page=options.get("full_page", True), **options)
+    page.screenshot(path=filename, full_page=full_page, **options)
+    if wait_for_stable:
+        _render_reports[page] = {**report, "screenshot": filename}
 
     print(f"📸 Screenshot saved: {filename}")
     return filename
@@ -312,9 +949,229 @@ async def retry_with_backoff(fn, max_retries: int = 3, initial_delay: int = 1000
     raise last_error
 
 
-def create_context(browser: Browser, **options) -> BrowserContext:
+# URL patterns for create_context(block_resources=[...]). Patterns use the
+# CDP Network.setBlockedURLs syntax where "*" matches any characters.
+BLOCKING_PROFILES: Dict[str, List[str]] = {
+    "images": [
+        f"*.{ext}{suffix}"
+        for ext in ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico")
+        for suffix in ("", "?*")
+    ],
+    "media": [
+        f"*.{ext}{suffix}"
+        for ext in ("mp4", "webm", "ogg", "mp3", "wav", "m4a", "m3u8", "mov")
+        for suffix in ("", "?*")
+    ],
+    "fonts": [
+        f"*.{ext}{suffix}"
+        for ext in ("woff", "woff2", "ttf", "otf", "eot")
+        for suffix in ("", "?*")
+    ],
+    "trackers": [
+        f"*://*{domain}/*"
+        for domain in (
+            "google-analytics.com",
+            "googletagmanager.com",
+            "doubleclick.net",
+            "googlesyndication.com",
+            "facebook.net",
+            "connect.facebook.com",
+            "hotjar.com",
+            "segment.io",
+            "segment.com",
+            "mixpanel.com",
+            "amplitude.com",
+            "clarity.ms",
+            "newrelic.com",
+            "nr-data.net",
+            "fullstory.com",
+        )
+    ],
+}
+
+_blocking_stats: "weakref.WeakKeyDictionary[BrowserContext, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _blocking_patterns(block_resources: List[str]) -> Dict[str, str]:
     """
-    Create browser context with common settings.
+    Expand profile names and custom globs into {pattern: profile} pairs.
+    """
+    patterns = {}
+    for entry in block_resources:
+        for pattern in BLOCKING_PROFILES.get(entry, [entry]):
+            patterns[pattern] = entry if entry in BLOCKING_PROFILES else "custom"
+    return patterns
+
+
+def _pattern_to_regex(pattern: str) -> str:
+    return ".*".join(re.escape(part) for part in pattern.split("*"))
+
+
+def _apply_resource_blocking(
+    context: BrowserContext, browser_name: str, block_resources: List[str]
+) -> Dict[str, Any]:
+    """
+    Block matching requests inside the browser via CDP on Chromium, falling
+    back to a single context.route() for other browsers.
+    """
+    patterns = _blocking_patterns(block_resources)
+    matchers = [
+        (re.compile(f"^{_pattern_to_regex(pattern)}$"), profile)
+        for pattern, profile in patterns.items()
+    ]
+    stats: Dict[str, Any] = {
+        "mode": "cdp" if browser_name == "chromium" else "route",
+        "blocked_requests": 0,
+        "by_profile": {},
+        "transferred_bytes": 0,
+    }
+    _blocking_stats[context] = stats
+
+    def count_blocked(url: str):
+        profile = next((p for regex, p in matchers if regex.match(url)), "custom")
+        stats["blocked_requests"] += 1
+        stats["by_profile"][profile] = stats["by_profile"].get(profile, 0) + 1
+
+    if browser_name != "chromium":
+
+        def abort(route):
+            count_blocked(route.request.url)
+            route.abort("blockedbyclient")
+
+        combined = "|".join(f"(?:{_pattern_to_regex(p)})" for p in patterns)
+        context.route(re.compile(f"^(?:{combined})$"), abort)
+        return stats
+
+    def attach(page: Page):
+        cdp = context.new_cdp_session(page)
+        urls: Dict[str, str] = {}
+
+        def on_request(event):
+            urls[event["requestId"]] = event["request"]["url"]
+
+        def on_finished(event):
+            urls.pop(event["requestId"], None)
+            stats["transferred_bytes"] += int(event.get("encodedDataLength", 0))
+
+        def on_failed(event):
+            url = urls.pop(event["requestId"], "")
+            if event.get("blockedReason") == "inspector":
+                count_blocked(url)
+
+        cdp.on("Network.requestWillBeSent", on_request)
+        cdp.on("Network.loadingFinished", on_finished)
+        cdp.on("Network.loadingFailed", on_failed)
+        cdp.send("Network.enable")
+        cdp.send("Network.setBlockedURLs", {"urls": list(patterns)})
+
+    for page in context.pages:
+        attach(page)
+    context.on("page", attach)
+    return stats
+
+
+def get_blocking_stats(context: BrowserContext) -> Optional[Dict[str, Any]]:
+    """
+    Requests blocked by create_context(block_resources=...), per profile.
+    Blocked responses are never downloaded, so their size is unknown;
+    compare transferred_bytes with an unblocked run to measure savings.
+    """
+    return _blocking_stats.get(context)
+
+
+# Named profiles for create_context(throttling=...), following the Chrome
+# DevTools presets. "Nx-cpu" works for any factor.
+THROTTLING_PROFILES: Dict[str, Dict[str, Any]] = {
+    "offline": {"offline": True},
+    "slow-3g": {"latency_ms": 2000, "download_kbps": 400, "upload_kbps": 400},
+    "slow-4g": {"latency_ms": 562.5, "download_kbps": 1440, "upload_kbps": 675},
+    "fast-4g": {"latency_ms": 165, "download_kbps": 8100, "upload_kbps": 1350},
+    "2x-cpu": {"cpu_rate": 2},
+    "4x-cpu": {"cpu_rate": 4},
+    "6x-cpu": {"cpu_rate": 6},
+    # Lighthouse's default mobile emulation
+    "mobile": {
+        "latency_ms": 562.5,
+        "download_kbps": 1440,
+        "upload_kbps": 675,
+        "cpu_rate": 4,
+    },
+}
+
+_throttling: "weakref.WeakKeyDictionary[BrowserContext, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _throttling_settings(throttling: Union[str, List[str]]) -> Dict[str, Any]:
+    """
+    Merge profile names ("slow-4g", "4x-cpu" or "slow-4g,4x-cpu") into one
+    settings dict; later profiles override earlier ones.
+    """
+    names = throttling.split(",") if isinstance(throttling, str) else throttling
+    settings: Dict[str, Any] = {}
+    for name in (n.strip() for n in names):
+        cpu = re.fullmatch(r"(\d+(?:\.\d+)?)x-cpu", name)
+        if name in THROTTLING_PROFILES:
+            settings.update(THROTTLING_PROFILES[name])
+        elif cpu:
+            settings["cpu_rate"] = float(cpu.group(1))
+        else:
+            raise ValueError(
+                f"Unknown throttling profile {name!r}. "
+                f"Use one of: {', '.join(THROTTLING_PROFILES)} or Nx-cpu"
+            )
+    settings["name"] = ",".join(n.strip() for n in names)
+    return settings
+
+
+def _apply_throttling(context: BrowserContext, settings: Dict[str, Any]):
+    """
+    Throttle network and CPU of every page of the context through CDP
+    Network.emulateNetworkConditions and Emulation.setCPUThrottlingRate.
+    """
+    _throttling[context] = settings
+    network = any(key in settings for key in ("offline", "latency_ms"))
+
+    def kbps_to_bytes(key: str) -> float:
+        return settings[key] * 1000 / 8 if key in settings else -1
+
+    def attach(page: Page):
+        cdp = context.new_cdp_session(page)
+        if network:
+            cdp.send("Network.enable")
+            cdp.send(
+                "Network.emulateNetworkConditions",
+                {
+                    "offline": settings.get("offline", False),
+                    "latency": settings.get("latency_ms", 0),
+                    "downloadThroughput": kbps_to_bytes("download_kbps"),
+                    "uploadThroughput": kbps_to_bytes("upload_kbps"),
+                },
+            )
+        if "cpu_rate" in settings:
+            cdp.send("Emulation.setCPUThrottlingRate", {"rate": settings["cpu_rate"]})
+
+    for page in context.pages:
+        attach(page)
+    context.on("page", attach)
+
+
+def get_throttling(context: BrowserContext) -> Optional[Dict[str, Any]]:
+    """
+    Throttling settings applied by create_context(throttling=...), with the
+    profile names under "name"; None for unthrottled contexts.
+    """
+    return _throttling.get(context)
+
+
+def context_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    New context options merged with create_context()'s defaults and the extra
+    headers from the env, without its block_resources, response_cache and
+    throttling extras.
     """
     env_headers = get_extra_headers_from_env() or {}
 
@@ -331,46 +1188,154 @@ def create_context(browser: Browser, **options) -> BrowserContext:
     if merged_headers:
         default_options["extra_http_headers"] = merged_headers
 
-    return browser.new_context(**{**default_options, **options})
+    return {**default_options, **options}
 
 
-async def detect_dev_servers(custom_ports: Optional[List[int]] = None) -> List[str]:
+def create_context(browser: Browser, **options) -> BrowserContext:
     """
-    Detect running dev servers on common ports.
+    Create browser context with common settings.
+    Pass block_resources=["images", "media", "fonts", "trackers", "*.pdf"] to
+    block named profiles (see BLOCKING_PROFILES) and custom globs in-browser.
+    Records or replays network traffic when PW_HAR_MODE is set.
+    Pass response_cache=True (or set PW_RESPONSE_CACHE=1) to serve cacheable
+    static assets from a disk cache shared across contexts, processes and runs.
+    Pass throttling="slow-4g", "4x-cpu" or both (or set PW_THROTTLING) to
+    emulate slow networks and CPUs on Chromium (see THROTTLING_PROFILES).
     """
-    if custom_ports is None:
-        custom_ports = []
+    block_resources = options.pop("block_resources", None)
+    response_cache = options.pop(
+        "response_cache", os.environ.get("PW_RESPONSE_CACHE") == "1"
+    )
+    throttling = options.pop("throttling", os.environ.get("PW_THROTTLING"))
+    throttling_settings = _throttling_settings(throttling) if throttling else None
+    if throttling_settings and browser.browser_type.name != "chromium":
+        raise ValueError(
+            f"Throttling needs Chromium (CDP), not {browser.browser_type.name}"
+        )
 
-    common_ports = [3000, 3001, 3002, 5173, 8080, 8000, 4200, 5000, 9000, 1234]
-    all_ports = sorted(set(common_ports + custom_ports))
-    detected_servers = []
+    context = browser.new_context(**context_options(options))
 
-    print("🔍 Checking for running dev servers...")
+    if block_resources:
+        _apply_resource_blocking(
+            context, browser.browser_type.name, list(block_resources)
+        )
+
+    if throttling_settings:
+        _apply_throttling(context, throttling_settings)
+
+    if response_cache:
+        from lib.response_cache import get_response_cache
+
+        cache = response_cache if response_cache is not True else get_response_cache()
+        cache.attach(context)
+
+    har = get_har_options_from_env()
+    if har:
+        _apply_har_mode(browser, context, har)
+
+    return context
 
-    async def check_port(port: int) -> Optional[str]:
-        try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=0.5)
-            ) as session:
-                async with session.head(f"http://localhost:{port}") as response:
-                    if response.status < 500:
-                        return f"http://localhost:{port}"
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            pass
-        return None
 
-    tasks = [check_port(port) for port in all_ports]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+def normalize_link(url: str) -> Optional[str]:
+    """
+    Normalize an absolute http(s) URL for deduplication: lowercase scheme and
+    host, drop default ports and fragments. Returns None for other schemes.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return None
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return None
 
-    for result in results:
-        if isinstance(result, str):
-            detected_servers.append(result)
-            print(f"  ✅ Found server on port {result.split(':')[2]}")
+    scheme = parts.scheme.lower()
+    netloc = parts.hostname.lower()
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
 
-    if not detected_servers:
-        print("  ❌ No dev servers detected")
 
-    return detected_servers
+async def check_urls(
+    urls: List[str],
+    concurrency: int = 50,
+    per_host: int = 6,
+    timeout: float = 10,
+) -> List[Dict[str, Any]]:
+    """
+    Check URLs concurrently through one pooled aiohttp session. Uses HEAD and
+    falls back to GET when the server answers 405 or 501. At most
+    `concurrency` checks run at once (`per_host` per host); `timeout`
+    applies to connecting and to each read, so time spent queued for a
+    connection never makes a healthy link time out.
+    """
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=timeout, sock_read=timeout
+    )
+    slots = asyncio.Semaphore(concurrency)
+
+    async def check(session: aiohttp.ClientSession, url: str) -> Dict[str, Any]:
+        async with slots:
+            started = time.monotonic()
+            result: Dict[str, Any] = {"url": url, "ok": False, "status": None}
+            try:
+                method = "HEAD"
+                async with session.head(url, allow_redirects=True) as response:
+                    status, final_url = response.status, str(response.url)
+                if status in (405, 501):
+                    method = "GET"
+                    async with session.get(url, allow_redirects=True) as response:
+                        status, final_url = response.status, str(response.url)
+                result.update(status=status, ok=status < 400, method=method)
+                if final_url != url:
+                    result["redirected_to"] = final_url
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                result["error"] = str(e) or type(e).__name__
+            result["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+            return result
+
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=client_timeout,
+        headers=get_extra_headers_from_env() or {},
+    ) as session:
+        return await asyncio.gather(*(check(session, url) for url in urls))
+
+
+def check_links(
+    page: Page, selector: str = "a[href]", same_origin: bool = False, **options
+) -> Dict[str, Any]:
+    """
+    Collect all links on the page in one evaluate(), deduplicate them and
+    check them concurrently (see check_urls() for options).
+    """
+    hrefs = page.evaluate(
+        "(selector) => Array.from(document.querySelectorAll(selector), a => a.href)",
+        selector,
+    )
+    page_origin = normalize_link(page.url)
+    urls = list(dict.fromkeys(filter(None, map(normalize_link, hrefs))))
+    if same_origin and page_origin:
+        origin = urlsplit(page_origin).netloc
+        urls = [url for url in urls if urlsplit(url).netloc == origin]
+
+    print(f"🔗 Checking {len(urls)} unique links ({len(hrefs)} found)...")
+    # The sync API keeps its own event loop registered as running on this
+    # thread, so the checks get a fresh loop on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = executor.submit(asyncio.run, check_urls(urls, **options)).result()
+
+    broken = [result for result in results if not result["ok"]]
+    print(f"  ✅ Working links: {len(results) - len(broken)}")
+    if broken:
+        print(f"  ❌ Broken links: {len(broken)}")
+    return {
+        "checked": len(results),
+        "working": len(results) - len(broken),
+        "broken": broken,
+        "results": results,
+    }
 
 
 def get_context_options_with_headers(
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Memory leak detection for the app under test (Chromium, via CDP): repeat a
+flow, force GC after each iteration and fit a growth trend to the JS heap,
+DOM node and event listener counts
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from playwright.sync_api import Page
+
+# Performance.getMetrics name -> sample key
+LEAK_METRICS = {
+    "JSHeapUsedSize": "heap_bytes",
+    "Nodes": "nodes",
+    "JSEventListeners": "listeners",
+}
+
+# Growth per iteration above which a metric counts as leaking
+DEFAULT_THRESHOLDS = {
+    "heap_bytes": 50_000,
+    "nodes": 1,
+    "listeners": 1,
+}
+
+# Below this fit quality the growth is noise, not a trend
+MIN_R2 = 0.5
+
+
+def linear_trend(values: List[float]) -> Tuple[float, float]:
+    """Least-squares slope per step and r² of a series."""
+    n = len(values)
+    if n < 2:
+        return 0.0, 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    sxx = sum((x - mean_x) ** 2 for x in range(n))
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    syy = sum((y - mean_y) ** 2 for y in values)
+    slope = sxy / sxx
+    r2 = sxy * sxy / (sxx * syy) if syy else 0.0
+    return slope, r2
+
+
+def _take_heap_snapshot(cdp, path: str):
+    """Stream a heap snapshot to a file (open it in DevTools Memory panel)."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+
+        def handler(event):
+            f.write(event["chunk"])
+
+        cdp.on("HeapProfiler.addHeapSnapshotChunk", handler)
+        try:
+            cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", handler)
+
+
+def detect_leak(
+    page: Page,
+    flow: Callable[[Page], Any],
+    iterations: int = 10,
+    warmup: int = 1,
+    thresholds: Optional[Dict[str, float]] = None,
+    snapshot_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run flow(page) `iterations` times and report whether memory keeps
+    growing. After each iteration GC is forced and the JS heap, DOM nodes
+    and event listeners are sampled; the first `warmup` iterations (caches,
+    lazy-loaded code) are left out of the trend. A metric leaks when its
+    slope per iteration exceeds its threshold and the fit is consistent.
+
+    With snapshot_dir, heap snapshots are saved after the first measured
+    and the last iteration only, for diffing in DevTools.
+
+        def flow(page):
+            page.click("text=Inbox")
+            page.click("text=Back")
+
+        result = detect_leak(page, flow, iterations=20)
+        assert not result["leaking"], result["trends"]
+    """
+    if iterations - warmup < 3:
+        raise ValueError("Need at least 3 measured iterations to fit a trend")
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    cdp = page.context.new_cdp_session(page)
+    samples: List[Dict[str, Any]] = []
+    snapshots: List[str] = []
+    try:
+        cdp.send("Performance.enable")
+        cdp.send("HeapProfiler.enable")
+        for iteration in range(1, iterations + 1):
+            flow(page)
+            cdp.send("HeapProfiler.collectGarbage")
+            metrics = {
+                metric["name"]: metric["value"]
+                for metric in cdp.send("Performance.getMetrics")["metrics"]
+            }
+            sample: Dict[str, Any] = {"iteration": iteration}
+            for name, key in LEAK_METRICS.items():
+                sample[key] = metrics.get(name, 0)
+            samples.append(sample)
+            if snapshot_dir and iteration in (warmup + 1, iterations):
+                path = str(Path(snapshot_dir) / f"iteration-{iteration}.heapsnapshot")
+                _take_heap_snapshot(cdp, path)
+                snapshots.append(path)
+    finally:
+        cdp.detach()
+
+    measured = samples[warmup:]
+    trends = {}
+    for key in LEAK_METRICS.values():
+        values = [sample[key] for sample in measured]
+        slope, r2 = linear_trend(values)
+        trends[key] = {
+            "first": values[0],
+            "last": values[-1],
+            "slope": round(slope, 2),
+            "r2": round(r2, 3),
+            "threshold": thresholds[key],
+            "leaking": slope > thresholds[key] and r2 >= MIN_R2,
+        }
+    leaking = any(trend["leaking"] for trend in trends.values())
+
+    print(
+        f"{'⚠️  Memory leak suspected' if leaking else '✅ No memory leak'}"
+        f" over {len(measured)} iterations:"
+    )
+    for key, trend in trends.items():
+        print(
+            f"  {key:<11} {trend['first']:>12,.0f} → {trend['last']:>12,.0f}"
+            f"  {trend['slope']:+,.1f}/iteration (r²={trend['r2']:.2f})"
+            f"{'  LEAKING' if trend['leaking'] else ''}"
+        )
+    for path in snapshots:
+        print(f"📸 Heap snapshot: {path}")
+
+    return {
+        "iterations": iterations,
+        "warmup": warmup,
+        "samples": samples,
+        "trends": trends,
+        "leaking": leaking,
+        "snapshots": snapshots,
+    }
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+In-page web performance metrics (Navigation Timing, paint, LCP, CLS, INP,
+long tasks) plus Chromium's CDP Performance.getMetrics, with percentile
+aggregation over repeated runs and JSONL output
+"""
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+from playwright.sync_api import BrowserContext, Page
+from playwright.sync_api import Error as PlaywrightError
+from lib.helpers import get_throttling
+
+# Buffered PerformanceObservers collecting into window.__pwMetrics. Used as
+# init script so nothing is missed, and again by collect_metrics() for pages
+# where it was not installed (buffered entries still cover the page load).
+OBSERVER_SCRIPT = """
+(() => {
+  if (window.__pwMetrics) return;
+  const store = { lcp: null, shifts: [], longTasks: [], events: [], observers: [] };
+  window.__pwMetrics = store;
+  const handlers = {
+    'largest-contentful-paint': (e) => {
+      store.lcp = { time: e.startTime, size: e.size, url: e.url,
+                    element: e.element ? e.element.tagName.toLowerCase() : null };
+    },
+    'layout-shift': (e) => {
+      if (!e.hadRecentInput) store.shifts.push({ value: e.value, time: e.startTime });
+    },
+    'longtask': (e) => store.longTasks.push({ time: e.startTime, duration: e.duration }),
+    'event': (e) => {
+      if (e.interactionId) store.events.push({ id: e.interactionId, duration: e.duration });
+    },
+  };
+  const supported = PerformanceObserver.supportedEntryTypes || [];
+  for (const [type, handle] of Object.entries(handlers)) {
+    if (!supported.includes(type)) continue;
+    const observer = new PerformanceObserver((list) => list.getEntries().forEach(handle));
+    observer.observe(type === 'event'
+      ? { type, buffered: true, durationThreshold: 16 }
+      : { type, buffered: true });
+    store.observers.push([observer, handle]);
+  }
+})();
+"""
+
+_COLLECT_SCRIPT = (
+    "async () => {"
+    + OBSERVER_SCRIPT
+    + """
+  // Let pending entries be delivered: two frames, or 100 ms for hidden pages
+  await Promise.race([
+    new Promise((r) => requestAnimationFrame(() => requestAnimationFrame(r))),
+    new Promise((r) => setTimeout(r, 100)),
+  ]);
+  const store = window.__pwMetrics;
+  for (const [observer, handle] of store.observers) observer.takeRecords().forEach(handle);
+
+  // CLS: largest session window (gaps < 1 s, windows < 5 s)
+  let cls = 0, session = 0, first = 0, last = 0;
+  for (const shift of store.shifts) {
+    if (session && shift.time - last < 1000 && shift.time - first < 5000) {
+      session += shift.value;
+    } else {
+      session = shift.value;
+      first = shift.time;
+    }
+    last = shift.time;
+    cls = Math.max(cls, session);
+  }
+
+  // INP: worst interaction, ignoring one outlier per 50 interactions
+  const interactions = new Map();
+  for (const e of store.events) {
+    interactions.set(e.id, Math.max(interactions.get(e.id) || 0, e.duration));
+  }
+  const durations = [...interactions.values()].sort((a, b) => b - a);
+  const inp = durations.length
+    ? durations[Math.min(durations.length - 1, Math.floor(durations.length / 50))]
+    : null;
+
+  const nav = performance.getEntriesByType('navigation')[0];
+  const paint = Object.fromEntries(
+    performance.getEntriesByType('paint').map((p) => [p.name, p.startTime]));
+  const resources = performance.getEntriesByType('resource');
+  const longTaskMs = store.longTasks.reduce((sum, t) => sum + t.duration, 0);
+  return {
+    navigation_type: nav ? nav.type : null,
+    ttfb_ms: nav ? nav.responseStart : null,
+    dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+    load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+    fp_ms: paint['first-paint'] ?? null,
+    fcp_ms: paint['first-contentful-paint'] ?? null,
+    lcp_ms: store.lcp ? store.lcp.time : null,
+    lcp_element: store.lcp ? (store.lcp.url || store.lcp.element) : null,
+    cls,
+    inp_ms: inp,
+    interactions: durations.length,
+    long_tasks: store.longTasks.length,
+    long_task_ms: longTaskMs,
+    total_blocking_time_ms: store.longTasks.reduce(
+      (sum, t) => sum + Math.max(0, t.duration - 50), 0),
+    requests: resources.length + (nav ? 1 : 0),
+    transfer_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0),
+                                     nav ? nav.transferSize || 0 : 0),
+    js_heap_used_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+  };
+}
+"""
+)
+
+DEFAULT_PERCENTILES = (50, 90, 99)
+
+# Records collected during this run, kept only while a consumer such as
+# run.py --budgets asked for them with start_recording()
+_recorded: Optional[List[Dict[str, Any]]] = None
+
+
+def start_recording():
+    """Keep every record returned by collect_metrics() until stop_recording()."""
+    global _recorded
+    _recorded = []
+
+
+def stop_recording() -> List[Dict[str, Any]]:
+    """Stop keeping records and return those collected since start_recording()."""
+    global _recorded
+    records, _recorded = _recorded or [], None
+    return records
+
+
+def observe_metrics(target: Union[Page, BrowserContext]):
+    """
+    Start the performance observers at document start for every future
+    navigation of a page or context. Needed for INP and long tasks during
+    interactions; collect_metrics() works without it for page loads.
+    """
+    target.add_init_script(OBSERVER_SCRIPT)
+
+
+def cdp_metrics(page: Page) -> Optional[Dict[str, float]]:
+    """
+    Chromium's Performance.getMetrics (JSHeapUsedSize, Nodes, LayoutCount,
+    ScriptDuration, ...) for a page; None on other browsers.
+    """
+    try:
+        session = page.context.new_cdp_session(page)
+    except PlaywrightError:
+        return None
+    try:
+        session.send("Performance.enable")
+        result = session.send("Performance.getMetrics")
+    finally:
+        session.detach()
+    return {metric["name"]: metric["value"] for metric in result["metrics"]}
+
+
+def collect_metrics(page: Page, cdp: bool = True) -> Dict[str, Any]:
+    """
+    Collect performance metrics of the current document as a flat dict
+    (times in ms since navigation start). Adds CDP metrics under "cdp" on
+    Chromium unless cdp=False. "throttling" names the profiles the context
+    was created with. "transfer_bytes" is a lower bound, see measure_url()
+    for exact byte counts.
+    """
+    throttling = get_throttling(page.context)
+    record: Dict[str, Any] = {
+        "url": page.url,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "throttling": throttling["name"] if throttling else None,
+        **page.evaluate(_COLLECT_SCRIPT),
+        # transferSize is 0 for cross-origin responses without
+        # Timing-Allow-Origin, so this is a lower bound
+        "transfer_bytes_source": "resource-timing",
+    }
+    if cdp:
+        metrics = cdp_metrics(page)
+        if metrics is not None:
+            record["cdp"] = metrics
+            record["js_heap_used_bytes"] = metrics.get(
+                "JSHeapUsedSize", record["js_heap_used_bytes"]
+            )
+    if _recorded is not None:
+        _recorded.append(record)
+    return record
+
+
+def percentile(values: Sequence[float], p: float) -> Optional[float]:
+    """Percentile with linear interpolation between the closest ranks."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = (len(ordered) - 1) * p / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def numeric_metrics(record: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric fields of a record, nested ones keyed like "cdp.Nodes"."""
+    fields = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            fields.update(numeric_metrics(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            fields[prefix + key] = value
+    return fields
+
+
+def aggregate_metrics(
+    records: Iterable[Dict[str, Any]],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Aggregate repeated runs per numeric metric into n, min, mean, max and
+    percentiles ("p50", "p90", "p99"). CDP metrics are keyed "cdp.<Name>".
+    """
+    values: Dict[str, List[float]] = {}
+    for record in records:
+        for key, value in numeric_metrics(record).items():
+            values.setdefault(key, []).append(value)
+
+    summary = {}
+    for key, samples in values.items():
+        stats = {
+            "n": len(samples),
+            "min": min(samples),
+            "mean": sum(samples) / len(samples),
+            "max": max(samples),
+        }
+        for p in percentiles:
+            stats[f"p{p:g}"] = percentile(samples, p)
+        summary[key] = stats
+    return summary
+
+
+def write_metrics_jsonl(path: str, records: Iterable[Dict[str, Any]]) -> str:
+    """Append records to a JSONL file, one JSON object per line."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+def _track_transfer_bytes(page: Page) -> Optional[List[int]]:
+    # The network layer sees the encoded size of every response, including
+    # cross-origin ones which Resource Timing reports as 0 bytes
+    try:
+        session = page.context.new_cdp_session(page)
+    except PlaywrightError:
+        return None
+    sizes: List[int] = []
+    session.on(
+        "Network.loadingFinished",
+        lambda params: sizes.append(int(params["encodedDataLength"])),
+    )
+    session.send("Network.enable")
+    return sizes
+
+
+def measure_url(
+    context: BrowserContext,
+    url: str,
+    runs: int = 5,
+    warmup: int = 1,
+    wait_until: str = "load",
+    timeout: float = 30000,
+    jsonl_path: Optional[str] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, Any]:
+    """
+    Load url runs times, each in a fresh page of the context, and return
+    {"url", "runs": [records], "summary": aggregate_metrics(...)}. Each run
+    is appended to jsonl_path if given.
+
+    Pages of a context share its HTTP and code caches, so only the first load
+    is cold. The first `warmup` loads are not recorded, which makes every
+    measured run warm; use a new context with warmup=0 for a cold load. On
+    Chromium, transfer_bytes is counted from CDP Network.loadingFinished.
+    """
+    records = []
+    for run in range(warmup + runs):
+        page = context.new_page()
+        try:
+            observe_metrics(page)
+            sizes = _track_transfer_bytes(page)
+            page.goto(url, wait_until=wait_until, timeout=timeout)
+            if run < warmup:
+                continue
+            record = collect_metrics(page)
+            if sizes is not None:
+                record.update(transfer_bytes=sum(sizes), transfer_bytes_source="cdp")
+        finally:
+            page.close()
+        records.append(record)
+        if jsonl_path:
+            write_metrics_jsonl(jsonl_path, [record])
+    return {
+        "url": url,
+        "runs": records,
+        "summary": aggregate_metrics(records, percentiles),
+    }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Low-overhead sampling profiler for run.py --profile, written as collapsed
+stacks (flamegraph.pl, speedscope) split into Python time and time blocked
+on the Playwright driver
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import greenlet
+import playwright
+
+PYTHON = "python"
+DRIVER_WAIT = "driver-wait"
+
+_PLAYWRIGHT_DIR = os.path.dirname(playwright.__file__)
+_state: Dict[str, Any] = {"thread": None}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    name = os.path.basename(code.co_filename)
+    if name.startswith(".temp-execution-"):
+        name = "script"
+    elif code.co_filename.startswith(os.getcwd()):
+        name = os.path.relpath(code.co_filename)
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({name}:{frame.f_lineno})"
+
+
+def _user_stack(frame) -> List[str]:
+    """
+    Root-first frame names. Playwright internals are folded into the public
+    API method the user code called (e.g. "Page.goto (playwright)").
+    """
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    stack = []
+    for frame in reversed(frames):
+        code = frame.f_code
+        if code.co_filename.startswith(_PLAYWRIGHT_DIR):
+            stack.append(f"{getattr(code, 'co_qualname', code.co_name)} (playwright)")
+            break
+        stack.append(_frame_name(frame))
+    return stack
+
+
+def _sample(thread_id: int, main_greenlet) -> Optional[List[str]]:
+    """
+    One stack sample of the main thread, with its category as root frame.
+
+    While the script waits for a sync API call, its greenlet is suspended
+    and the thread runs Playwright's event loop: idle in select() means
+    the driver (browser) is doing the work.
+    """
+    frame = sys._current_frames().get(thread_id)
+    if frame is None:
+        return None
+    suspended = main_greenlet.gr_frame
+    if suspended is None:
+        return [PYTHON] + _user_stack(frame)
+    if os.path.basename(frame.f_code.co_filename) == "selectors.py":
+        return [DRIVER_WAIT] + _user_stack(suspended)
+    return [PYTHON] + _user_stack(suspended) + ["[playwright dispatch]"]
+
+
+def _run(thread_id: int, main_greenlet, interval: float, stop: threading.Event):
+    stacks = _state["stacks"]
+    while not stop.wait(interval):
+        stack = _sample(thread_id, main_greenlet)
+        if stack:
+            stacks[";".join(stack)] += 1
+
+
+def enabled() -> bool:
+    return _state["thread"] is not None
+
+
+def start(path: str, interval_ms: float = 5):
+    """
+    Sample the calling (main) thread every interval_ms in a background
+    thread until stop() writes the collapsed stacks to path.
+    """
+    stop_event = threading.Event()
+    thread = threading.Thread(
+        target=_run,
+        args=(
+            threading.get_ident(),
+            greenlet.getcurrent(),
+            interval_ms / 1000,
+            stop_event,
+        ),
+        name="playwright-py-skill-profiler",
+        daemon=True,
+    )
+    _state.update(
+        thread=thread,
+        stop=stop_event,
+        path=path,
+        stacks=Counter(),
+        started=time.perf_counter(),
+    )
+    thread.start()
+
+
+def stop() -> Optional[Dict[str, Any]]:
+    """
+    Stop sampling, write the collapsed stacks and return a summary with
+    the estimated Python and driver-wait time and the hottest Python lines.
+    """
+    thread = _state["thread"]
+    if thread is None:
+        return None
+    _state["stop"].set()
+    thread.join()
+    _state["thread"] = None
+    elapsed_ms = (time.perf_counter() - _state["started"]) * 1000
+    stacks: Counter = _state["stacks"]
+
+    path = Path(_state["path"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.items()))
+
+    samples = sum(stacks.values())
+    per_sample_ms = elapsed_ms / samples if samples else 0
+    categories: Counter = Counter()
+    hot_lines: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        categories[frames[0]] += count
+        if frames[0] == PYTHON:
+            hot_lines[frames[-1]] += count
+    return {
+        "path": str(path),
+        "samples": samples,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "python_ms": round(categories[PYTHON] * per_sample_ms, 1),
+        "driver_wait_ms": round(categories[DRIVER_WAIT] * per_sample_ms, 1),
+        "hot_python": [
+            {"frame": frame, "ms": round(count * per_sample_ms, 1)}
+            for frame, count in hot_lines.most_common(5)
+        ],
+    }
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Content-addressed response cache for static assets, shared across contexts,
+processes and runs
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from playwright.sync_api import BrowserContext, Route
+
+_shared_cache: Optional["ResponseCache"] = None
+_shared_cache_lock = threading.Lock()
+
+# Only these requests are routed through Python; everything else stays in-browser
+STATIC_ASSET_PATTERN = re.compile(
+    r"^https?://[^?#]+\.(?:js|mjs|css|woff2?|ttf|otf|png|jpe?g|gif|webp|avif|svg|ico|wasm|map)(?:[?#].*)?$",
+    re.IGNORECASE,
+)
+
+# Hop-by-hop and encoding headers don't apply to the decoded cached body
+_DROPPED_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+    "keep-alive",
+    "set-cookie",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS variants (
+    url TEXT PRIMARY KEY,
+    vary TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS entries_body_hash ON entries (body_hash);
+"""
+
+
+def default_cache_dir() -> str:
+    """
+    PW_RESPONSE_CACHE_DIR, or playwright-py-skill-cache in the temp directory.
+    """
+    return os.environ.get(
+        "PW_RESPONSE_CACHE_DIR",
+        str(Path(tempfile.gettempdir()) / "playwright-py-skill-cache"),
+    )
+
+
+def freshness_lifetime(headers: Dict[str, str], now: float) -> Optional[float]:
+    """
+    Seconds a response may be served from cache, or None if it must not be
+    stored (no-store, private, Vary: * or no explicit freshness). no-cache
+    responses are stored with lifetime 0, so every use revalidates them.
+    Stale entries are never served, which also honours must-revalidate.
+    """
+    cache_control = {}
+    for directive in headers.get("cache-control", "").lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            cache_control[name] = value.strip('"')
+
+    if "no-store" in cache_control or "private" in cache_control:
+        return None
+    if headers.get("vary", "").strip() == "*":
+        return None
+
+    if "no-cache" in cache_control:
+        return 0.0
+
+    try:
+        age = max(0.0, float(headers.get("age", "0") or 0))
+    except ValueError:
+        age = 0.0
+    for directive in ("s-maxage", "max-age"):
+        if directive in cache_control:
+            try:
+                return max(0.0, float(cache_control[directive]) - age)
+            except ValueError:
+                return None
+
+    if "expires" in headers:
+        try:
+            return max(0.0, parsedate_to_datetime(headers["expires"]).timestamp() - now)
+        except (TypeError, ValueError):
+            return 0.0
+
+    return None
+
+
+def _replayable_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    return {
+        name.lower(): value
+        for name, value in headers.items()
+        if name.lower() not in _DROPPED_HEADERS
+    }
+
+
+class ResponseCache:
+    """
+    Disk cache keyed by URL plus the request headers named in Vary, with
+    bodies stored once per SHA-256 and least-recently-used eviction above
+    max_bytes. Safe to share between processes and threads.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 512 * 1024**2):
+        self.directory = Path(directory or default_cache_dir())
+        self.blob_dir = self.directory / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+            "uncacheable": 0,
+            "evicted": 0,
+            "bytes_from_cache": 0,
+            "bytes_from_network": 0,
+        }
+        # One connection shared by all threads (e.g. browsers driven from
+        # their own threads), only used while holding the lock
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(
+            str(self.directory / "index.sqlite"),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _count(self, stat: str, amount: int = 1):
+        with self._lock:
+            self.stats[stat] += amount
+
+    def _blob_path(self, body_hash: str) -> Path:
+        return self.blob_dir / body_hash[:2] / body_hash
+
+    def _key(self, url: str, vary: List[str], request_headers: Dict[str, str]) -> str:
+        parts = [url] + [f"{name}={request_headers.get(name, '')}" for name in vary]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def lookup(
+        self, url: str, request_headers: Dict[str, str], now: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached entry for a request, including stale ones
+        (check entry["fresh"]), or None.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._db.execute(
+                "SELECT vary FROM variants WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            key = self._key(url, json.loads(row[0]), request_headers)
+            row = self._db.execute(
+                "SELECT status, headers, body_hash, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            status, headers, body_hash, expires_at = row
+            try:
+                body = self._blob_path(body_hash).read_bytes()
+            except OSError:
+                # Blob evicted by another process between index read and file read
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+            )
+            return {
+                "key": key,
+                "status": status,
+                "headers": json.loads(headers),
+                "body": body,
+                "fresh": expires_at > now,
+            }
+
+    def store(
+        self,
+        url: str,
+        request_headers: Dict[str, str],
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+        now: Optional[float] = None,
+    ) -> bool:
+        """
+        Store a response if its headers allow caching. Returns True if stored.
+        """
+        now = time.time() if now is None else now
+        headers = {name.lower(): value for name, value in headers.items()}
+        lifetime = freshness_lifetime(headers, now)
+        if status != 200 or lifetime is None:
+            self._count("uncacheable")
+            return False
+
+        vary = sorted(
+            {
+                name.strip().lower()
+                for name in headers.get("vary", "").split(",")
+                if name.strip()
+            }
+        )
+        body_hash = hashlib.sha256(body).hexdigest()
+        blob = self._blob_path(body_hash)
+        if not blob.exists():
+            blob.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=blob.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, blob)
+
+        with self._lock:
+            stored_headers = _replayable_headers(headers)
+            self._db.execute(
+                "INSERT OR REPLACE INTO variants (url, vary) VALUES (?, ?)",
+                (url, json.dumps(vary)),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(url, vary, request_headers),
+                    url,
+                    status,
+                    json.dumps(stored_headers),
+                    body_hash,
+                    len(body),
+                    now + lifetime,
+                    now,
+                ),
+            )
+            self.stats["stored"] += 1
+            self.evict()
+        return True
+
+    def refresh(self, key: str, headers: Dict[str, str], now: Optional[float] = None):
+        """
+        Extend an entry's freshness after a 304 Not Modified revalidation.
+        """
+        now = time.time() if now is None else now
+        lifetime = freshness_lifetime(
+            {name.lower(): value for name, value in headers.items()}, now
+        )
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET expires_at = ? WHERE key = ?",
+                (now + (lifetime or 0), key),
+            )
+
+    def size(self) -> int:
+        """
+        Total bytes of distinct cached bodies.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM "
+                "(SELECT body_hash, MAX(size) AS size FROM entries GROUP BY body_hash)"
+            ).fetchone()
+        return row[0]
+
+    def evict(self):
+        """
+        Drop least recently used entries until the cache fits in max_bytes,
+        then delete bodies no entry refers to anymore.
+        """
+        with self._lock:
+            total = self.size()
+            if total <= self.max_bytes:
+                return
+
+            rows = self._db.execute(
+                "SELECT key, body_hash, size FROM entries ORDER BY last_access"
+            ).fetchall()
+            dropped_hashes = set()
+            for key, body_hash, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.stats["evicted"] += 1
+                still_used = self._db.execute(
+                    "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+                ).fetchone()
+                if not still_used:
+                    total -= size
+                    dropped_hashes.add(body_hash)
+
+        for body_hash in dropped_hashes:
+            try:
+                self._blob_path(body_hash).unlink()
+            except OSError:
+                pass
+
+    def handle_route(self, route: Route):
+        """
+        Route handler: serve fresh entries from disk, revalidate stale ones
+        with their ETag/Last-Modified, and store cacheable network responses.
+        """
+        request = route.request
+        if request.method != "GET":
+            route.fallback()
+            return
+
+        request_headers = {
+            name.lower(): value for name, value in request.headers.items()
+        }
+        entry = self.lookup(request.url, request_headers)
+        if entry and entry["fresh"]:
+            self._count("hits")
+            self._count("bytes_from_cache", len(entry["body"]))
+            route.fulfill(
+                status=entry["status"], headers=entry["headers"], body=entry["body"]
+            )
+            return
+
+        fetch_headers = dict(request.headers)
+        if entry:
+            if "etag" in entry["headers"]:
+                fetch_headers["if-none-match"] = entry["headers"]["etag"]
+            if "last-modified" in entry["headers"]:
+                fetch_headers["if-modified-since"] = entry["headers"]["last-modified"]
+
+        try:
+            response = route.fetch(headers=fetch_headers)
+        except Exception as e:
+            print(f"⚠️  Cache fetch failed for {request.url}: {e}", file=sys.stderr)
+            route.fallback()
+            return
+
+        if entry and response.status == 304:
+            self._count("revalidated")
+            self._count("bytes_from_cache", len(entry["body"]))
+            self.refresh(entry["key"], response.headers)
+            route.fulfill(
+                status=entry["status"], headers=entry["headers"], body=entry["body"]
+            )
+            return
+
+        self._count("misses")
+        body = response.body()
+        self._count("bytes_from_network", len(body))
+        self.store(
+            request.url, request_headers, response.status, response.headers, body
+        )
+        # The fetched body is already decoded, so drop Content-Encoding
+        route.fulfill(
+            status=response.status,
+            headers=_replayable_headers(response.headers),
+            body=body,
+        )
+
+    def attach(self, context: BrowserContext) -> "ResponseCache":
+        """
+        Route static asset requests of a context through the cache.
+        """
+        context.route(STATIC_ASSET_PATTERN, self.handle_route)
+        return self
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Statistics of this process plus the current on-disk footprint.
+        """
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            **self.stats,
+            "hit_rate": (
+                (self.stats["hits"] + self.stats["revalidated"]) / lookups
+                if lookups
+                else 0.0
+            ),
+            "entries": entries,
+            "disk_bytes": self.size(),
+        }
+
+
+def get_response_cache() -> "ResponseCache":
+    """
+    Process-wide cache used by create_context(response_cache=True) and
+    PW_RESPONSE_CACHE=1, stored in default_cache_dir(). PW_RESPONSE_CACHE_MB
+    sets the size limit (default: 512).
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_mb = int(os.environ.get("PW_RESPONSE_CACHE_MB", "512"))
+            _shared_cache = ResponseCache(max_bytes=max_mb * 1024**2)
+    return _shared_cache
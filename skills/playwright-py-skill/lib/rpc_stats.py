@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Counts Playwright protocol round-trips by method and calling source line,
+and totals the time spent in explicit sleeps, for run.py --rpc-stats
+
+Protocol calls are counted by wrapping the private
+Connection._send_message_to_server and reading Connection._api_zone, as in
+Playwright 1.56. If a Playwright upgrade drops them, only sleeps are timed.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional
+import playwright
+from playwright.sync_api import Frame, Page
+
+try:
+    from playwright._impl._connection import Connection
+except ImportError:
+    Connection = None
+
+_stats: Dict[str, Any] = {}
+_originals: Dict[str, Any] = {}
+
+# Sent by wait_for_timeout(); its duration is accounted as a sleep instead
+_SLEEP_METHODS = {"waitForTimeout"}
+_PLAYWRIGHT_DIR = os.path.dirname(playwright.__file__)
+
+
+def _reset():
+    _stats.update(
+        started=time.perf_counter(),
+        calls=Counter(),
+        call_ms=defaultdict(float),
+        sites=Counter(),
+        sleeps=Counter(),
+        sleep_ms=defaultdict(float),
+    )
+
+
+def _location(filename: str, line: int, function: Optional[str] = None) -> str:
+    """
+    Shorten a source location: the run.py temp file becomes "script" and
+    files below the working directory (the skill dir) are made relative.
+    """
+    name = os.path.basename(filename)
+    if name.startswith(".temp-execution-"):
+        path = "script"
+    else:
+        path = os.path.relpath(filename) if filename.startswith(os.getcwd()) else name
+    location = f"{path}:{line}"
+    return f"{location} ({function})" if function else location
+
+
+def record_call(method: str, site: str, duration_ms: Optional[float] = None):
+    _stats["calls"][method] += 1
+    _stats["sites"][site] += 1
+    if duration_ms is not None:
+        _stats["call_ms"][method] += duration_ms
+
+
+def record_sleep(site: str, duration_ms: float):
+    _stats["sleeps"][site] += 1
+    _stats["sleep_ms"][site] += duration_ms
+
+
+def _protocol_calls_supported() -> bool:
+    return Connection is not None and callable(
+        getattr(Connection, "_send_message_to_server", None)
+    )
+
+
+def _send_message_to_server(self, object, method, params, no_reply=False):
+    api_zone = getattr(self, "_api_zone", None)
+    zone = (api_zone.get() if api_zone is not None else None) or {}
+    frames = zone.get("frames") or []
+    site = (
+        _location(frames[0]["file"], frames[0]["line"], zone.get("apiName"))
+        if frames
+        else "<internal>"
+    )
+    key = f"{getattr(object, '_type', type(object).__name__)}.{method}"
+    callback = _originals["send"](self, object, method, params, no_reply)
+    future = getattr(callback, "future", None)
+    if no_reply or method in _SLEEP_METHODS or future is None:
+        record_call(key, site)
+    else:
+        started = time.perf_counter()
+        future.add_done_callback(
+            lambda _: record_call(key, site, (time.perf_counter() - started) * 1000)
+        )
+    return callback
+
+
+def _caller_site() -> Optional[str]:
+    """
+    Source location of the sleep wrapper's caller, None for Playwright's own
+    timeout timers which are not explicit sleeps.
+    """
+    frame = sys._getframe(2)
+    if frame.f_code.co_filename.startswith(_PLAYWRIGHT_DIR):
+        return None
+    return _location(frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+
+
+def _timed_sleep(original):
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        site = _caller_site()
+        if site is None:
+            return original(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            record_sleep(site, (time.perf_counter() - started) * 1000)
+
+    return wrapper
+
+
+def _timed_async_sleep(original):
+    @functools.wraps(original)
+    async def wrapper(delay, *args, **kwargs):
+        site = _caller_site()
+        # asyncio.sleep(0) only yields to the event loop
+        if site is None or delay <= 0:
+            return await original(delay, *args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await original(delay, *args, **kwargs)
+        finally:
+            record_sleep(site, (time.perf_counter() - started) * 1000)
+
+    return wrapper
+
+
+def installed() -> bool:
+    return bool(_originals)
+
+
+def install():
+    """
+    Start counting protocol calls and timing explicit sleeps
+    (wait_for_timeout(), time.sleep() and asyncio.sleep()). Protocol calls
+    are skipped with a warning if this Playwright version lacks the private
+    hooks they need.
+    """
+    _reset()
+    if _originals:
+        return
+    if _protocol_calls_supported():
+        _originals["send"] = Connection._send_message_to_server
+        Connection._send_message_to_server = _send_message_to_server
+    else:
+        print(
+            "⚠️  Protocol calls cannot be counted with this Playwright version, "
+            "timing sleeps only",
+            file=sys.stderr,
+        )
+    _originals.update(
+        page_wait=Page.wait_for_timeout,
+        frame_wait=Frame.wait_for_timeout,
+        time_sleep=time.sleep,
+        asyncio_sleep=asyncio.sleep,
+    )
+    Page.wait_for_timeout = _timed_sleep(_originals["page_wait"])
+    Frame.wait_for_timeout = _timed_sleep(_originals["frame_wait"])
+    time.sleep = _timed_sleep(_originals["time_sleep"])
+    asyncio.sleep = _timed_async_sleep(_originals["asyncio_sleep"])
+
+
+def uninstall():
+    """Restore the patched functions; collected stats are kept for report()."""
+    if not _originals:
+        return
+    if "send" in _originals:
+        Connection._send_message_to_server = _originals.pop("send")
+    Page.wait_for_timeout = _originals.pop("page_wait")
+    Frame.wait_for_timeout = _originals.pop("frame_wait")
+    time.sleep = _originals.pop("time_sleep")
+    asyncio.sleep = _originals.pop("asyncio_sleep")
+
+
+def summary() -> Dict[str, Any]:
+    """Collected stats as plain data."""
+    return {
+        "elapsed_ms": round((time.perf_counter() - _stats["started"]) * 1000, 1),
+        "calls": sum(_stats["calls"].values()),
+        "call_ms": round(sum(_stats["call_ms"].values()), 1),
+        "by_method": {
+            method: {"calls": count, "ms": round(_stats["call_ms"][method], 1)}
+            for method, count in _stats["calls"].most_common()
+        },
+        "by_site": dict(_stats["sites"].most_common()),
+        "sleeps": sum(_stats["sleeps"].values()),
+        "sleep_ms": round(sum(_stats["sleep_ms"].values()), 1),
+        "sleeps_by_site": {
+            site: {"calls": _stats["sleeps"][site], "ms": round(ms, 1)}
+            for site, ms in sorted(
+                _stats["sleep_ms"].items(), key=lambda item: -item[1]
+            )
+        },
+    }
+
+
+def report(top: int = 10) -> str:
+    """Top-N report of protocol calls by method and call site, and of sleeps."""
+    stats = summary()
+    lines = [
+        f"📊 {stats['calls']} Playwright protocol calls, {stats['call_ms']:.0f} ms "
+        f"waiting on the driver, {stats['sleep_ms']:.0f} ms in "
+        f"{stats['sleeps']} explicit sleeps (run: {stats['elapsed_ms']:.0f} ms)",
+    ]
+    if stats["calls"]:
+        lines += ["", "   calls   driver ms  method"]
+        for method, entry in list(stats["by_method"].items())[:top]:
+            lines.append(f"  {entry['calls']:>6}  {entry['ms']:>10.1f}  {method}")
+        lines += ["", "   calls  call site"]
+        for site, count in list(stats["by_site"].items())[:top]:
+            lines.append(f"  {count:>6}  {site}")
+    if stats["sleeps"]:
+        lines += ["", "   calls    sleep ms  sleep site"]
+        for site, entry in list(stats["sleeps_by_site"].items())[:top]:
+            lines.append(f"  {entry['calls']:>6}  {entry['ms']:>10.1f}  {site}")
+    return "\n".join(lines)
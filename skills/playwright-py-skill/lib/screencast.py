@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Low-cost screencast recording with a bounded in-memory ring buffer (Chromium only)
+"""
+
+import base64
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from playwright.sync_api import CDPSession, Page
+
+# Recorders which are started and not yet stopped; run.py flushes these when
+# the executed script raises
+_active_recorders: List["ScreencastRecorder"] = []
+
+
+class ScreencastRecorder:
+    """
+    Keep the most recent `seconds` of CDP screencast frames in memory.
+    Frames stay base64-encoded JPEGs until save() is called, so an idle
+    recorder costs one frame ack per captured frame and nothing else.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        seconds: float = 10,
+        max_fps: int = 10,
+        quality: int = 60,
+        max_width: int = 1280,
+        max_height: int = 720,
+        name: str = "screencast",
+    ):
+        self.page = page
+        self.seconds = seconds
+        self.max_fps = max_fps
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self.name = name
+        self.frames: Deque[Tuple[float, str]] = deque(
+            maxlen=max(1, int(seconds * max_fps))
+        )
+        self._min_interval = 1.0 / max_fps
+        self._cdp: Optional[CDPSession] = None
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __enter__(self) -> "ScreencastRecorder":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        if exc_type is not None:
+            save_screencast(self)
+        return False
+
+    def start(self) -> "ScreencastRecorder":
+        """
+        Subscribe to Page.screencastFrame and start the screencast.
+        """
+        cdp = self.page.context.new_cdp_session(self.page)
+        self._cdp = cdp
+        cdp.on("Page.screencastFrame", self._on_frame)
+        cdp.send(
+            "Page.startScreencast",
+            {
+                "format": "jpeg",
+                "quality": self.quality,
+                "maxWidth": self.max_width,
+                "maxHeight": self.max_height,
+            },
+        )
+        _active_recorders.append(self)
+        return self
+
+    def stop(self):
+        """
+        Stop the screencast. Buffered frames are kept for save().
+        """
+        if self in _active_recorders:
+            _active_recorders.remove(self)
+        cdp, self._cdp = self._cdp, None
+        if cdp is None:
+            return
+        try:
+            cdp.send("Page.stopScreencast")
+            cdp.detach()
+        except Exception:
+            pass  # Page or browser may already be closed
+
+    def _on_frame(self, params: Dict[str, Any]):
+        cdp = self._cdp
+        if cdp is None:
+            return  # A frame arrived after stop()
+        try:
+            cdp.send("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        except Exception:
+            pass
+
+        timestamp = params.get("metadata", {}).get("timestamp")
+        if timestamp is None:
+            timestamp = time.time()
+        if self.frames and timestamp - self.frames[-1][0] < self._min_interval:
+            return
+
+        self.frames.append((timestamp, params["data"]))
+        while self.frames and timestamp - self.frames[0][0] > self.seconds:
+            self.frames.popleft()
+
+    def save(self, path: str) -> Optional[str]:
+        """
+        Encode buffered frames to a video with ffmpeg, or write them as
+        numbered JPEG files into a directory when ffmpeg is not available.
+        Returns the written path, or None if no frames were captured.
+        """
+        frames = list(self.frames)
+        if not frames:
+            return None
+
+        duration = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / duration if duration > 0 else 1
+
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg:
+            video_path = str(Path(path).with_suffix(".mp4"))
+            process = subprocess.Popen(
+                [
+                    ffmpeg,
+                    "-y",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "image2pipe",
+                    "-framerate",
+                    f"{fps:.3f}",
+                    "-c:v",
+                    "mjpeg",
+                    "-i",
+                    "-",
+                    "-vf",
+                    "scale=trunc(iw/2)*2:trunc(ih/2)*2",
+                    "-pix_fmt",
+                    "yuv420p",
+                    video_path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+            assert process.stdin is not None
+            for _, data in frames:
+                process.stdin.write(base64.b64decode(data))
+            process.stdin.close()
+            if process.wait() == 0:
+                return video_path
+            print("⚠️  ffmpeg failed, saving raw frames instead", file=sys.stderr)
+
+        frame_dir = Path(path).with_suffix("")
+        frame_dir.mkdir(parents=True, exist_ok=True)
+        for i, (_, data) in enumerate(frames):
+            (frame_dir / f"frame-{i:05d}.jpg").write_bytes(base64.b64decode(data))
+        return str(frame_dir)
+
+
+def save_screencast(
+    recorder: ScreencastRecorder, directory: Optional[str] = None
+) -> Optional[str]:
+    """
+    Save a recorder's buffer to a timestamped file in `directory`
+    (PW_SCREENCAST_DIR, or the system temp directory by default).
+    """
+    directory = directory or os.environ.get("PW_SCREENCAST_DIR", tempfile.gettempdir())
+    timestamp = datetime.now().isoformat().replace(":", "-").replace(".", "-")
+    saved = recorder.save(str(Path(directory) / f"{recorder.name}-{timestamp}"))
+    if saved:
+        print(f"🎞️  Screencast saved: {saved} ({len(recorder)} frames)")
+    return saved
+
+
+def save_active_screencasts(directory: Optional[str] = None) -> List[str]:
+    """
+    Stop and save every recorder that is still running.
+    Called by run.py when the executed script raises.
+    """
+    saved = []
+    for recorder in list(_active_recorders):
+        recorder.stop()
+        path = save_screencast(recorder, directory)
+        if path:
+            saved.append(path)
+    return saved
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Opt-in timing spans for helpers and run.py phases, written as Chrome
+trace-event JSON (open in https://ui.perfetto.dev or chrome://tracing)
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, Optional
+from playwright.sync_api import BrowserType
+
+_state: Dict[str, Any] = {"events": None, "path": None, "origin_ns": 0}
+_originals: Dict[str, Any] = {}
+_wrapped: Dict[ModuleType, Dict[str, Callable]] = {}
+
+_NULL_SPAN = nullcontext()
+
+
+def enabled() -> bool:
+    return _state["events"] is not None
+
+
+def _attribute(value: Any) -> Any:
+    """
+    Span attributes keep plain values only; pages, contexts and other
+    objects are summarized by their type name.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value if len(value) <= 200 else value[:200] + "..."
+    if isinstance(value, (list, tuple, dict, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() - _state["origin_ns"]) / 1000
+
+
+def _record(name: str, category: str, start_us: float, args: Dict[str, Any]):
+    events = _state["events"]
+    if events is None:
+        return
+    events.append(
+        {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": _now_us() - start_us,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "args": args,
+        }
+    )
+
+
+@contextmanager
+def _span(name: str, category: str, args: Dict[str, Any]):
+    start_us = _now_us()
+    try:
+        yield args
+    except GeneratorExit:
+        raise  # A traced generator closed early did not fail
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        _record(name, category, start_us, args)
+
+
+def span(name: str, category: str = "run", **attributes):
+    """
+    Time a block as a span. A no-op unless tracing was started.
+
+        with span("extract", rows=len(rows)) as attrs:
+            attrs["found"] = ...
+    """
+    if _state["events"] is None:
+        return _NULL_SPAN
+    return _span(name, category, {k: _attribute(v) for k, v in attributes.items()})
+
+
+def _call_attributes(fn: Callable, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    try:
+        bound = inspect.signature(fn).bind_partial(*args, **kwargs)
+        items = bound.arguments.items()
+    except (TypeError, ValueError):
+        items = kwargs.items()
+    attributes = {}
+    for name, value in items:
+        if isinstance(value, dict) and name in ("options", "kwargs"):
+            attributes.update((k, _attribute(v)) for k, v in value.items())
+        else:
+            attributes[name] = _attribute(value)
+    return attributes
+
+
+def traced(fn: Callable, category: str = "helper") -> Callable:
+    """
+    Wrap a function (sync, async or generator) so each call becomes a span
+    with its plain arguments and result as attributes. A generator's span
+    lasts from its first item until it is exhausted or closed.
+    """
+    name = fn.__name__
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with span(name, category, **_call_attributes(fn, args, kwargs)) as attrs:
+                result = await fn(*args, **kwargs)
+                if attrs is not None:
+                    attrs["result"] = _attribute(result)
+                return result
+
+        return async_wrapper
+
+    if inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            # yield from forwards send(), throw() and close(), so breaking out
+            # of a loop runs fn's cleanup and ends the span right away
+            with span(name, category, **_call_attributes(fn, args, kwargs)) as attrs:
+                result = yield from fn(*args, **kwargs)
+                if attrs is not None:
+                    attrs["result"] = _attribute(result)
+                return result
+
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span(name, category, **_call_attributes(fn, args, kwargs)) as attrs:
+            result = fn(*args, **kwargs)
+            if attrs is not None:
+                attrs["result"] = _attribute(result)
+            return result
+
+    return wrapper
+
+
+def instrument(module: ModuleType):
+    """
+    Replace the public functions of a lib module with traced versions.
+    Only done while tracing is on, so disabled tracing costs nothing.
+    """
+    if module in _wrapped:
+        return
+    originals = {}
+    for attr, value in list(vars(module).items()):
+        if (
+            attr.startswith("_")
+            or not inspect.isfunction(value)
+            or not value.__module__.startswith("lib.")
+        ):
+            continue
+        originals[attr] = value
+        setattr(module, attr, traced(value))
+    _wrapped[module] = originals
+
+
+def _patch_playwright():
+    _originals["launch"] = BrowserType.launch
+    _originals["launch_persistent_context"] = BrowserType.launch_persistent_context
+
+    def launch(self, *args, **kwargs):
+        with span("browser launch", "playwright", browser=self.name):
+            return _originals["launch"](self, *args, **kwargs)
+
+    def launch_persistent_context(self, *args, **kwargs):
+        with span("browser launch", "playwright", browser=self.name, persistent=True):
+            return _originals["launch_persistent_context"](self, *args, **kwargs)
+
+    BrowserType.launch = launch
+    BrowserType.launch_persistent_context = launch_persistent_context
+
+
+def start(path: str):
+    """
+    Start recording spans for lib.helpers functions and browser launches;
+    stop() writes them to path.
+    """
+    _state.update(events=[], path=path, origin_ns=time.perf_counter_ns())
+    from lib import helpers
+
+    instrument(helpers)
+    if not _originals:
+        _patch_playwright()
+
+
+def stop() -> Optional[str]:
+    """
+    Write recorded spans as trace-event JSON, undo all wrapping and return
+    the file path (None if tracing was not started).
+    """
+    events, path = _state["events"], _state["path"]
+    _state.update(events=None, path=None)
+
+    for module, originals in _wrapped.items():
+        for attr, value in originals.items():
+            setattr(module, attr, value)
+    _wrapped.clear()
+    if _originals:
+        BrowserType.launch = _originals.pop("launch")
+        BrowserType.launch_persistent_context = _originals.pop(
+            "launch_persistent_context"
+        )
+
+    if events is None:
+        return None
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
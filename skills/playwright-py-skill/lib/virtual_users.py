@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "playwright==1.56.0",
+# ]
+# ///
+"""
+Browser-level load generator: runs a flow function as virtual users, each in
+its own context, spread over a few browsers, with per-step latency histograms
+"""
+
+import asyncio
+import bisect
+import inspect
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+
+from lib import helpers
+from lib.metrics import percentile
+
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+# create_context() extras which need the sync API
+_SYNC_ONLY_OPTIONS = ("block_resources", "response_cache", "throttling")
+
+# Virtual user of the running asyncio task, for step() and think() in flows
+_current_user: ContextVar[Optional["_VirtualUser"]] = ContextVar(
+    "virtual_user", default=None
+)
+
+
+def _describe(error: BaseException) -> str:
+    message = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {message[0] if message else ''}"[:200]
+
+
+class _VirtualUser:
+    """One virtual user: its own context and page, repeating the flow."""
+
+    def __init__(self, number: int, start_at: float, plan: Dict[str, Any]):
+        self.number = number
+        self.start_at = start_at
+        self.plan = plan
+        self.iteration = 0
+
+    def record(self, name: str, elapsed_ms: float, ok: bool):
+        entry = self.plan["samples"].setdefault(name, {"ms": [], "errors": 0})
+        if ok:
+            entry["ms"].append(elapsed_ms)
+        else:
+            entry["errors"] += 1
+
+    async def think(self, seconds: Optional[float] = None):
+        if seconds is None:
+            think_time = self.plan["think_time"]
+            if isinstance(think_time, (tuple, list)):
+                seconds = random.uniform(*think_time)
+            else:
+                seconds = think_time
+        if self.plan["deadline"] is not None:
+            seconds = min(seconds, self.plan["deadline"] - time.monotonic())
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def finished(self) -> bool:
+        plan = self.plan
+        if plan["iterations"] is not None and self.iteration >= plan["iterations"]:
+            return True
+        return plan["deadline"] is not None and time.monotonic() >= plan["deadline"]
+
+    async def run(self, browser: Browser):
+        await asyncio.sleep(max(0.0, self.start_at - time.monotonic()))
+        _current_user.set(self)
+        context: Optional[BrowserContext] = None
+        try:
+            context = await browser.new_context(**self.plan["context_options"])
+            page: Page = await context.new_page()
+            while not self.finished():
+                if self.iteration:
+                    await self.think()
+                    if self.finished():
+                        break
+                self.iteration += 1
+                start = time.perf_counter()
+                try:
+                    await self.plan["flow"](page)
+                except Exception as error:
+                    self.record("iteration", 0, ok=False)
+                    self.plan["errors"][_describe(error)] += 1
+                    # A fresh page, so one failure does not fail every later one
+                    await page.close()
+                    page = await context.new_page()
+                else:
+                    elapsed_ms = (time.perf_counter() - start) * 1000
+                    self.record("iteration", elapsed_ms, ok=True)
+        except Exception as error:
+            self.plan["errors"][_describe(error)] += 1
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+
+
+def _user() -> _VirtualUser:
+    user = _current_user.get()
+    if user is None:
+        raise RuntimeError("step() and think() only work in a flow run by run_load()")
+    return user
+
+
+@contextmanager
+def step(name: str):
+    """
+    Time a named step of a flow run by run_load(). Failed steps count as
+    errors and are left out of the latencies.
+
+        with step("login"):
+            await page.click("text=Sign in")
+    """
+    user = _user()
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        user.record(name, (time.perf_counter() - start) * 1000, ok)
+
+
+async def think(seconds: Optional[float] = None):
+    """
+    Pause like a user reading the page: `seconds`, or random think time of
+    the load run. Use `await think()` instead of time.sleep(), which would
+    stall every user of the same browser.
+    """
+    await _user().think(seconds)
+
+
+async def _run_browser(
+    browser_type: str,
+    launch_options: Dict[str, Any],
+    ready: threading.Barrier,
+    users: List[_VirtualUser],
+):
+    """
+    Launch one browser and run its users as asyncio tasks, each starting at
+    its ramp-up time, once every browser of the load run is up.
+    """
+    async with async_playwright() as playwright:
+        browser = await getattr(playwright, browser_type).launch(**launch_options)
+        try:
+            await asyncio.to_thread(ready.wait)
+            await asyncio.gather(*(user.run(browser) for user in users))
+        finally:
+            await browser.close()
+
+
+def latency_summary(latencies_ms: Sequence[float], errors: int = 0) -> Dict[str, Any]:
+    """Count, percentiles and histogram (see HISTOGRAM_BUCKETS_MS) of latencies."""
+    ordered = sorted(latencies_ms)
+    summary: Dict[str, Any] = {"count": len(ordered), "errors": errors}
+    if ordered:
+        summary["min_ms"] = round(ordered[0], 1)
+        summary["mean_ms"] = round(sum(ordered) / len(ordered), 1)
+        for p in (50, 90, 95, 99):
+            summary[f"p{p}_ms"] = round(percentile(ordered, p), 1)
+        summary["max_ms"] = round(ordered[-1], 1)
+    histogram = []
+    below = 0
+    for bound in HISTOGRAM_BUCKETS_MS:
+        upto = bisect.bisect_right(ordered, bound)
+        histogram.append({"le_ms": bound, "count": upto - below})
+        below = upto
+    summary["histogram"] = histogram
+    return summary
+
+
+def print_report(report: Dict[str, Any]):
+    """Print a load report as a latency table and per-step histograms."""
+    print(
+        f"🏋️  Load test: {report['users']} users on {report['browsers']} "
+        f"browsers, {report['iterations']} iterations in {report['elapsed_s']} s "
+        f"({report['throughput_per_s']}/s), {report['failed']} failed"
+    )
+    print(
+        f"  {'step':<20} {'count':>7} {'errors':>6} {'p50':>8} {'p90':>8} "
+        f"{'p95':>8} {'p99':>8} {'max':>8} (ms)"
+    )
+    for name, summary in report["steps"].items():
+        columns = "".join(
+            f" {summary[key]:>8.0f}" if key in summary else f" {'-':>8}"
+            for key in ("p50_ms", "p90_ms", "p95_ms", "p99_ms", "max_ms")
+        )
+        print(f"  {name:<20} {summary['count']:>7} {summary['errors']:>6}{columns}")
+    for name, summary in report["steps"].items():
+        if not summary["count"]:
+            continue
+        print(f"📊 {name}")
+        widest = max(bucket["count"] for bucket in summary["histogram"])
+        for bucket in summary["histogram"]:
+            if not bucket["count"]:
+                continue
+            label = (
+                f"≤{bucket['le_ms']:.0f} ms"
+                if bucket["le_ms"] != float("inf")
+                else f">{HISTOGRAM_BUCKETS_MS[-2]} ms"
+            )
+            bar = "█" * max(1, round(30 * bucket["count"] / widest))
+            print(f"  {label:>10} {bar} {bucket['count']}")
+    for error, count in list(report["errors"].items())[:5]:
+        print(f"❌ {count}× {error}")
+
+
+def run_load(
+    flow: Callable[[Page], Awaitable[Any]],
+    users: int = 10,
+    browsers: int = 2,
+    duration: Optional[float] = 60,
+    ramp_up: float = 0,
+    think_time: Union[float, Tuple[float, float]] = (1, 3),
+    iterations: Optional[int] = None,
+    browser_type: str = "chromium",
+    context_options: Optional[Dict[str, Any]] = None,
+    **launch_options,
+) -> Dict[str, Any]:
+    """
+    Run the async flow(page) as `users` virtual users, each an asyncio task
+    with its own context (create_context()'s defaults plus context_options),
+    spread over `browsers` browsers with an event loop thread each. Users
+    start evenly over `ramp_up` seconds and repeat the flow with think time
+    in between until `duration` seconds after the start, or for `iterations`
+    each. Mark steps in the flow with step() to get their latencies; the
+    whole flow is reported as "iteration".
+
+        async def flow(page):
+            with step("home"):
+                await page.goto("https://staging.example.com")
+            await think()
+            with step("search"):
+                await page.fill("#q", "shoes")
+                await page.press("#q", "Enter")
+                await page.wait_for_selector(".results")
+
+        report = run_load(flow, users=50, browsers=4, ramp_up=30, duration=300)
+        assert report["steps"]["search"]["p95_ms"] < 2000
+    """
+    if users < 1:
+        raise ValueError(f"Need at least one user, got {users}")
+    if duration is None and iterations is None:
+        raise ValueError("Pass a duration, iterations per user or both")
+    if not inspect.iscoroutinefunction(flow):
+        raise TypeError("flow must be an async function taking an async_api Page")
+    sync_only = [name for name in _SYNC_ONLY_OPTIONS if name in (context_options or {})]
+    if sync_only:
+        raise ValueError(f"Not supported in load runs: {', '.join(sync_only)}")
+    launch_options = helpers.launch_options(browser_type, launch_options)
+    browsers = max(1, min(browsers, users))
+    plans: List[Dict[str, Any]] = [
+        {
+            "flow": flow,
+            "think_time": think_time,
+            "iterations": iterations,
+            "deadline": None,
+            "context_options": helpers.context_options(dict(context_options or {})),
+            "samples": {},
+            "errors": Counter(),
+        }
+        for _ in range(browsers)
+    ]
+    user_lists: List[List[_VirtualUser]] = [[] for _ in range(browsers)]
+    failures: List[BaseException] = []
+    started = [0.0]
+
+    def start_clock():
+        # Once every browser is up, so launching does not eat into ramp-up
+        started[0] = time.monotonic()
+        for plan in plans:
+            if duration is not None:
+                plan["deadline"] = started[0] + duration
+        for number in range(users):
+            worker = number % browsers
+            start_at = started[0] + ramp_up * number / users
+            user_lists[worker].append(_VirtualUser(number, start_at, plans[worker]))
+
+    ready = threading.Barrier(browsers, action=start_clock)
+
+    def worker(index: int):
+        try:
+            asyncio.run(
+                _run_browser(browser_type, launch_options, ready, user_lists[index])
+            )
+        except threading.BrokenBarrierError:
+            pass
+        except Exception as error:
+            ready.abort()
+            failures.append(error)
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), name=f"virtual-users-{index}")
+        for index in range(browsers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if failures:
+        raise failures[0]
+    elapsed = time.monotonic() - started[0]
+
+    samples: Dict[str, Dict[str, Any]] = {}
+    errors: Counter = Counter()
+    for plan in plans:
+        for name, entry in plan["samples"].items():
+            merged = samples.setdefault(name, {"ms": [], "errors": 0})
+            merged["ms"].extend(entry["ms"])
+            merged["errors"] += entry["errors"]
+        errors.update(plan["errors"])
+    # The whole flow last, after its steps
+    if "iteration" in samples:
+        samples["iteration"] = samples.pop("iteration")
+    steps = {
+        name: latency_summary(entry["ms"], entry["errors"])
+        for name, entry in samples.items()
+    }
+    iteration = steps.get("iteration", {"count": 0, "errors": 0})
+    report = {
+        "users": users,
+        "browsers": browsers,
+        "elapsed_s": round(elapsed, 1),
+        "iterations": iteration["count"] + iteration["errors"],
+        "failed": iteration["errors"],
+        "throughput_per_s": round(iteration["count"] / elapsed, 2) if elapsed else 0.0,
+        "steps": steps,
+        "errors": dict(errors.most_common()),
+    }
+    print_report(report)
+    return report
@@ -22,9 +22,8 @@ import sys
 import tempfile
 import json
 import time
+from contextlib import nullcontext
 from pathlib import Path
-import asyncio
-import aiohttp
 
 # Change to script directory for proper module resolution
 script_dir = Path(__file__).parent.resolve()
@@ -41,9 +40,76 @@ def check_playwright_installed():
         return False
 
 
-def get_code_to_execute():
+RUN_FLAGS = {
+    "--trace-on-failure": (
+        "Trace every browser context; keep trace, DOM snapshot and screenshot "
+        "only if the script fails (or set PW_TRACE_ON_FAILURE=1)"
+    ),
+    "--har-record=PATH": (
+        "Record network traffic of create_context() contexts into a HAR "
+        "(or set PW_HAR_MODE=record PW_HAR_PATH=...)"
+    ),
+    "--har-replay=PATH": (
+        "Serve network traffic from a recorded HAR; PW_HAR_NOT_FOUND=fallback "
+        "lets missing requests through (default: abort)"
+    ),
+    "--detect-servers=PORTS": (
+        "Print running local dev servers as JSON and exit; PORTS optionally "
+        "adds comma-separated ports (cached, see PW_DEV_SERVER_CACHE_TTL)"
+    ),
+    "--wait-for-server=PORT": (
+        "Wait up to PW_WAIT_FOR_SERVER_TIMEOUT seconds (default: 60) for a "
+        "starting dev server (port or URL), print the result as JSON and exit"
+    ),
+    "--trace-spans=PATH": (
+        "Write timing spans of helpers, browser launch and run phases as Chrome "
+        "trace-event JSON for ui.perfetto.dev (or set PW_TRACE_SPANS=PATH)"
+    ),
+    "--rpc-stats=N": (
+        "Count Playwright protocol calls by method and call site, total the "
+        "explicit sleeps and print the top N (default: 10) at exit "
+        "(or set PW_RPC_STATS=N)"
+    ),
+    "--profile=PATH": (
+        "Sample the script every PW_PROFILE_INTERVAL_MS (default: 5) and write "
+        "collapsed stacks split into Python and driver-wait time "
+        "(or set PW_PROFILE=PATH)"
+    ),
+    "--budgets=PATH": (
+        "Fail the run when metrics from collect_metrics()/measure_url() exceed "
+        "the budgets file or regress from its baseline (or set PW_BUDGETS=PATH)"
+    ),
+    "--prune-profiles=DAYS": (
+        "Delete unlocked persistent browser profiles unused for DAYS "
+        "(default: 7) and exit"
+    ),
+}
+
+
+def print_usage(file=sys.stdout):
+    """Print command line usage."""
+    print("Usage:", file=file)
+    print("  uv run run.py script.py          # Execute file", file=file)
+    print("  uv run run.py 'code here'        # Execute inline", file=file)
+    print("  cat script.py | uv run run.py    # Execute from stdin", file=file)
+    print("\nOptions (before the script):", file=file)
+    for flag, description in RUN_FLAGS.items():
+        print(f"  {flag:<22} {description}", file=file)
+
+
+def parse_run_flags(args):
+    """Split leading run.py flags (--flag or --flag=value) from the script arguments."""
+    names = {flag.split("=")[0] for flag in RUN_FLAGS}
+    flags = {}
+    while args and args[0].split("=")[0] in names:
+        name, _, value = args[0].partition("=")
+        flags[name] = value or None
+        args = args[1:]
+    return flags, args
+
+
+def get_code_to_execute(args):
     """Get code to execute from various sources."""
-    args = sys.argv[1:]
 
     # Case 1: File path provided
     if args and Path(args[0]).exists():
@@ -73,10 +139,7 @@ def get_code_to_execute():
 
     # No input
     print("❌ No code to execute", file=sys.stderr)
-    print("Usage:", file=sys.stderr)
-    print("  uv run run.py script.py          # Execute file", file=sys.stderr)
-    print("  uv run run.py 'code here'        # Execute inline", file=sys.stderr)
-    print("  cat script.py | uv run run.py    # Execute from stdin", file=sys.stderr)
+    print_usage(file=sys.stderr)
     sys.exit(1)
 
 
@@ -148,53 +211,114 @@ if __name__ == "__main__":
 """
 
 
-async def detect_dev_servers(custom_ports=None):
-    """Detect running dev servers on common ports."""
-    if custom_ports is None:
-        custom_ports = []
+def phase(name, **attributes):
+    """Timing span for a run phase, a no-op unless --trace-spans is on."""
+    tracing = sys.modules.get("lib.tracing")
+    if tracing is None:
+        return nullcontext()
+    return tracing.span(name, "run", **attributes)
 
-    common_ports = [3000, 3001, 3002, 5173, 8080, 8000, 4200, 5000, 9000, 1234]
-    all_ports = sorted(set(common_ports + custom_ports))
-    detected_servers = []
 
-    print("🔍 Checking for running dev servers...")
+def print_dev_servers(ports=None):
+    """Print detected dev servers as JSON (no banner, for machine use)."""
+    import asyncio
+    from lib.dev_servers import find_dev_servers
 
-    async def check_port(port):
-        try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=0.5)
-            ) as session:
-                async with session.head(f"http://localhost:{port}") as response:
-                    if response.status < 500:
-                        return f"http://localhost:{port}"
-        except (aiohttp.ClientError, asyncio.TimeoutError):
-            pass
-        return None
+    custom_ports = [int(port) for port in ports.split(",")] if ports else None
+    print(json.dumps(asyncio.run(find_dev_servers(custom_ports)), indent=2))
 
-    tasks = [check_port(port) for port in all_ports]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    for result in results:
-        if result and isinstance(result, str):
-            detected_servers.append(result)
-            print(f"  ✅ Found server on port {result.split(':')[2]}")
+def main():
+    """Main execution function."""
+    flags, args = parse_run_flags(sys.argv[1:])
+
+    if "--detect-servers" in flags:
+        print_dev_servers(flags["--detect-servers"])
+        return
+
+    if "--wait-for-server" in flags:
+        from contextlib import redirect_stdout
+        from lib.dev_servers import wait_for_dev_server
+
+        if not flags["--wait-for-server"]:
+            print("❌ --wait-for-server needs a port or URL", file=sys.stderr)
+            sys.exit(1)
+        timeout = float(os.environ.get("PW_WAIT_FOR_SERVER_TIMEOUT", "60"))
+        # Keep stdout machine-readable
+        with redirect_stdout(sys.stderr):
+            result = wait_for_dev_server(flags["--wait-for-server"], timeout)
+        print(json.dumps(result, indent=2))
+        sys.exit(0 if result["ready"] else 1)
 
-    if not detected_servers:
-        print("  ❌ No dev servers detected")
+    print("🎭 Playwright Skill - Universal Executor\n")
 
-    return detected_servers
+    if sys.argv[1:2] in (["--help"], ["-h"]):
+        print_usage()
+        return
 
+    if "--prune-profiles" in flags:
+        from lib.helpers import prune_profiles
 
-def main():
-    """Main execution function."""
-    print("🎭 Playwright Skill - Universal Executor\n")
+        pruned = prune_profiles(float(flags["--prune-profiles"] or 7))
+        print(f"🧹 Pruned {len(pruned)} persistent profile(s)")
+        return
+
+    spans_path = flags.get("--trace-spans") or os.environ.get("PW_TRACE_SPANS")
+    if "--trace-spans" in flags or spans_path:
+        from lib import tracing
+
+        default_path = Path(tempfile.gettempdir()) / "playwright-py-skill-spans.json"
+        tracing.start(str(Path(spans_path or default_path).resolve()))
 
     # Clean up old temp files from previous runs
     cleanup_old_temp_files()
 
     # Get code to execute
-    raw_code = get_code_to_execute()
-    code = wrap_code_if_needed(raw_code)
+    with phase("load code"):
+        raw_code = get_code_to_execute(args)
+    with phase("wrap code", chars=len(raw_code)):
+        code = wrap_code_if_needed(raw_code)
+
+    # HAR mode is applied by create_context() through environment variables
+    for flag, mode in (("--har-record", "record"), ("--har-replay", "replay")):
+        if flag in flags:
+            os.environ["PW_HAR_MODE"] = mode
+            if flags[flag]:
+                os.environ["PW_HAR_PATH"] = str(Path(flags[flag]).resolve())
+
+    run_id = f"run-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    if "--trace-on-failure" in flags or os.environ.get("PW_TRACE_ON_FAILURE") == "1":
+        from lib import failure_trace
+
+        failure_trace.install(
+            os.environ.get("PW_TRACE_DIR", tempfile.gettempdir()), run_id
+        )
+        print(f"🧾 Failure tracing enabled (run ID: {run_id})")
+
+    rpc_top = flags.get("--rpc-stats") or os.environ.get("PW_RPC_STATS")
+    if "--rpc-stats" in flags or rpc_top:
+        from lib import rpc_stats
+
+        rpc_stats.install()
+
+    profile_path = flags.get("--profile") or os.environ.get("PW_PROFILE")
+    if "--profile" in flags or profile_path:
+        from lib import profiler
+
+        default_path = Path(tempfile.gettempdir()) / "playwright-py-skill.folded"
+        profiler.start(
+            str(Path(profile_path or default_path).resolve()),
+            float(os.environ.get("PW_PROFILE_INTERVAL_MS", "5")),
+        )
+
+    budgets_path = flags.get("--budgets") or os.environ.get("PW_BUDGETS")
+    budgets_config = None
+    if budgets_path:
+        from lib import metrics
+        from lib.budgets import load_budgets
+
+        budgets_config = load_budgets(str(Path(budgets_path).resolve()))
+        metrics.start_recording()
 
     # Create temporary file for execution
     temp_file = script_dir / f".temp-execution-{time.time()}.py"
@@ -216,11 +340,27 @@ def main():
             raise RuntimeError(f"Failed to load module loader from {temp_file}")
         module = importlib.util.module_from_spec(spec)
         sys.modules["temp_module"] = module
-        spec.loader.exec_module(module)
+        with phase("exec module"):
+            spec.loader.exec_module(module)
 
         # Call main() function if it exists (bypasses __name__ == "__main__" guard)
         if hasattr(module, "main"):
-            module.main()
+            with phase("main"):
+                module.main()
+
+        if budgets_config is not None:
+            from lib import metrics
+            from lib.budgets import evaluate_run
+
+            records = metrics.stop_recording()
+            if not records:
+                print(
+                    "⚠️  --budgets: no metrics collected "
+                    "(use collect_metrics() or measure_url())",
+                    file=sys.stderr,
+                )
+            elif not evaluate_run(records, budgets_config):
+                sys.exit(1)
 
         # Note: Temp file will be cleaned up on next run
         # This allows long-running async operations to complete safely
@@ -231,8 +371,49 @@ def main():
 
         print("\n📋 Stack trace:", file=sys.stderr)
         traceback.print_exc(file=sys.stderr)
+
+        # Save traces of contexts the script left open
+        failure_trace = sys.modules.get("lib.failure_trace")
+        if failure_trace is not None:
+            failure_trace.capture_failure(error)
+            print(f"🧾 Run ID: {run_id}", file=sys.stderr)
+
+        # Flush screencast ring buffers only if the script used them
+        screencast = sys.modules.get("lib.screencast")
+        if screencast is not None:
+            screencast.save_active_screencasts()
+
         sys.exit(1)
 
+    finally:
+        # Traces parked by closed contexts are only kept for failures
+        failure_trace = sys.modules.get("lib.failure_trace")
+        if failure_trace is not None:
+            failure_trace.uninstall()
+
+        profiler = sys.modules.get("lib.profiler")
+        if profiler is not None and profiler.enabled():
+            profile = profiler.stop()
+            print(
+                f"\n🔥 Profile: {profile['python_ms']:.0f} ms Python, "
+                f"{profile['driver_wait_ms']:.0f} ms waiting on the driver "
+                f"({profile['samples']} samples) written to {profile['path']}"
+            )
+            for hot in profile["hot_python"]:
+                print(f"  {hot['ms']:>8.0f} ms  {hot['frame']}")
+
+        rpc_stats = sys.modules.get("lib.rpc_stats")
+        if rpc_stats is not None and rpc_stats.installed():
+            rpc_stats.uninstall()
+            print("\n" + rpc_stats.report(int(rpc_top or 10)))
+
+        tracing = sys.modules.get("lib.tracing")
+        if tracing is not None and tracing.enabled():
+            path = tracing.stop()
+            print(
+                f"🧵 Timing spans written to {path} (open in https://ui.perfetto.dev)"
+            )
+
 
 if __name__ == "__main__":
     main()
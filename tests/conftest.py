@@ -4,12 +4,15 @@
 import re
 import socket
 import threading
+import time
 from pathlib import Path
 
 import textwrap
 
 import pytest
+from pyee import EventEmitter
 from flask import Flask, request, jsonify, redirect, url_for, session, render_template
+from playwright.sync_api import Error as PlaywrightError
 from playwright.sync_api import sync_playwright
 
 
@@ -110,6 +113,359 @@ def extract_json_from_page(page):
         return json.loads(page_content)
 
 
+class FakeCDPSession:
+    """CDP session stand-in for unit tests.
+
+    Records sent commands as (method, params) and answers them from
+    `responses`, which maps a method to a result dict or to a callable taking
+    (session, params). emit() dispatches an event to the handlers.
+    """
+
+    def __init__(self, responses=None):
+        self.responses = dict(responses or {})
+        self.handlers = {}
+        self.sent = []
+        self.detached = False
+
+    @property
+    def methods(self):
+        return [method for method, _ in self.sent]
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    def emit(self, event, params):
+        for handler in list(self.handlers.get(event, [])):
+            handler(params)
+
+    def send(self, method, params=None):
+        self.sent.append((method, params))
+        response = self.responses.get(method, {})
+        return response(self, params) if callable(response) else response
+
+    def detach(self):
+        self.detached = True
+
+
+class FakeTracing:
+    """Tracing stand-in; stop(path) writes a placeholder zip."""
+
+    def __init__(self):
+        self.started = None
+
+    def start(self, **options):
+        self.started = options
+
+    def stop(self, path=None):
+        if path:
+            Path(path).write_bytes(b"zip")
+
+
+class FakeRequest:
+    def __init__(self, url, frame=None, failure=None, method="GET", headers=None):
+        self.url = url
+        self.frame = frame
+        self.failure = failure
+        self.method = method
+        self.headers = headers or {}
+
+    def is_navigation_request(self):
+        return self.frame is not None
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None, body=b"", request=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+        self.request = request
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    """Route stand-in for route() handlers.
+
+    fetch() returns `response`, or the context's answer (see
+    FakeContext.respond) when there is none. fulfill(), abort() and
+    fallback() record what the handler did.
+    """
+
+    def __init__(self, request, response=None, context=None):
+        self.request = (
+            request if isinstance(request, FakeRequest) else FakeRequest(request)
+        )
+        self.response = response
+        self.context = context
+        self.fetched_headers = None
+        self.fulfilled = None
+        self.aborted = None
+        self.fell_back = False
+
+    def fetch(self, headers=None):
+        self.fetched_headers = headers
+        if self.response is not None:
+            return self.response
+        self.context.fetches.append(headers)
+        return self.context.respond(self.request, headers)
+
+    def fulfill(self, **options):
+        self.fulfilled = options
+
+    def abort(self, error_code=None):
+        self.aborted = error_code
+
+    def fallback(self):
+        self.fell_back = True
+
+
+class FakePage:
+    """Page stand-in for unit tests.
+
+    evaluate() returns `evaluate_result`, or calls it with (expression, arg)
+    if it is callable. Screenshots without a path replay `frames`. Listeners
+    are kept in a real event emitter, and wait_for_event() fires the event.
+    navigate() loads a URL from the context's fake server through the page's
+    routes (regular expressions), firing the response and load events.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.events = EventEmitter()
+        # Like Playwright, the page listens to its own close event internally
+        self.events.on("close", lambda _: None)
+        self.main_frame = object()
+        self.url = "about:blank"
+        self.routes = []
+        self.init_scripts = []
+        self.timeout = None
+        self.viewport_size = {"width": 1280, "height": 720}
+        self.evaluate_result = None
+        self.html = "<html><body></body></html>"
+        self.frames = [b"frame"]
+        self.probe_count = 0
+        self.screenshots = []
+        self.waits = []
+        self.closed = False
+
+    def evaluate(self, expression, arg=None):
+        if callable(self.evaluate_result):
+            return self.evaluate_result(expression, arg)
+        return self.evaluate_result
+
+    def content(self):
+        return self.html
+
+    def screenshot(self, **options):
+        if "path" in options:
+            self.screenshots.append(options)
+            Path(options["path"]).write_bytes(b"png")
+            return b"png"
+        frame = self.frames[min(self.probe_count, len(self.frames) - 1)]
+        self.probe_count += 1
+        return frame
+
+    def wait_for_timeout(self, timeout):
+        self.waits.append(timeout)
+
+    def on(self, event, handler):
+        self.events.on(event, handler)
+
+    def once(self, event, handler):
+        self.events.once(event, handler)
+
+    def remove_listener(self, event, handler):
+        self.events.remove_listener(event, handler)
+
+    def wait_for_event(self, event, timeout=None):
+        self.events.emit(event, self)
+        return self
+
+    def set_default_timeout(self, timeout):
+        self.timeout = timeout
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def set_viewport_size(self, viewport_size):
+        self.viewport_size = viewport_size
+
+    def goto(self, url, **options):
+        self.url = url
+
+    def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    def unroute(self, url, handler):
+        self.routes.remove((url, handler))
+
+    def unroute_all(self, behavior=None):
+        self.routes.clear()
+
+    def navigate(self, url):
+        self.url = url
+        request = FakeRequest(url, self.main_frame, headers={"accept": "text/html"})
+        response = self.context.respond(request)
+        for pattern, handler in list(self.routes):
+            if pattern.match(url):
+                route = FakeRoute(request, context=self.context)
+                handler(route)
+                if route.fulfilled:
+                    fulfilled = route.fulfilled
+                    response.status = (
+                        fulfilled.get("status") or fulfilled["response"].status
+                    )
+        self.events.emit("response", response)
+        self.events.emit("load", self)
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.events.emit("close", self)
+
+
+class FakeContext:
+    """Context stand-in for unit tests; chromium=False makes CDP unavailable.
+
+    respond() plays the web server behind the context: `statuses`, `etags`
+    and `bodies` map URLs to what it answers (200, no ETag and an empty body
+    by default). Headers of route.fetch() calls are kept in `fetches`.
+    """
+
+    def __init__(self, chromium=True, browser=None):
+        self.chromium = chromium
+        self.browser = browser
+        self.statuses = {}
+        self.etags = {}
+        self.bodies = {}
+        self.fetches = []
+        self.cdp_responses = {}
+        self.cdp_sessions = []
+        self.pages = []
+        self.page_handlers = []
+        self.routes = []
+        self.har_routes = []
+        self.tracing = FakeTracing()
+        self.closed = False
+
+    @property
+    def cdp(self):
+        """The CDP session opened last."""
+        return self.cdp_sessions[-1]
+
+    def new_cdp_session(self, page):
+        if not self.chromium:
+            raise PlaywrightError("CDP session is only available in Chromium")
+        session = FakeCDPSession(self.cdp_responses)
+        self.cdp_sessions.append(session)
+        return session
+
+    def on(self, event, handler):
+        assert event == "page"
+        self.page_handlers.append(handler)
+
+    def route(self, url, handler):
+        self.routes.append((url, handler))
+
+    def route_from_har(self, har, **options):
+        self.har_routes.append((har, options))
+
+    def respond(self, request, headers=None):
+        etag = self.etags.get(request.url)
+        if etag and (headers or {}).get("if-none-match") == etag:
+            return FakeResponse(304, {"etag": etag}, request=request)
+        return FakeResponse(
+            self.statuses.get(request.url, 200),
+            {"etag": etag} if etag else {},
+            self.bodies.get(request.url, b""),
+            request,
+        )
+
+    def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        for handler in self.page_handlers:
+            handler(page)
+        return page
+
+    def close(self):
+        self.closed = True
+        if self.browser is not None:
+            self.browser.events.append("context.close")
+
+
+class FakeBrowserType:
+    def __init__(self, name):
+        self.name = name
+
+
+class FakeBrowser:
+    """Browser stand-in; new_context() records its options, events close calls."""
+
+    def __init__(self, name="chromium"):
+        self.browser_type = FakeBrowserType(name)
+        self.context_options = None
+        self.contexts = []
+        self.events = []
+
+    def new_context(self, **options):
+        self.context_options = options
+        context = FakeContext(self.browser_type.name == "chromium", self)
+        self.contexts.append(context)
+        return context
+
+    def close(self, **options):
+        self.events.append("browser.close")
+
+
+@pytest.fixture
+def fake_browser():
+    """Fake Chromium browser for tests which need no real browser."""
+    return FakeBrowser()
+
+
+@pytest.fixture
+def make_browser():
+    """Factory for fake browsers of a type, e.g. make_browser("webkit")."""
+    return FakeBrowser
+
+
+@pytest.fixture
+def make_response():
+    """Factory for fake responses: make_response(status, headers, body)."""
+    return FakeResponse
+
+
+@pytest.fixture
+def make_route():
+    """Factory for fake routes of a URL or request, to call route handlers with."""
+    return FakeRoute
+
+
+@pytest.fixture
+def make_request():
+    """Factory for fake requests; navigation requests have a frame."""
+    return FakeRequest
+
+
+@pytest.fixture
+def fake_context():
+    """Fake Chromium browser context for tests which need no real browser."""
+    return FakeContext()
+
+
+@pytest.fixture
+def fake_page(fake_context):
+    """Fake page in fake_context for tests which need no real browser."""
+    return fake_context.new_page()
+
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
 app.secret_key = "test-secret-key"
 
@@ -185,6 +541,36 @@ def api_users():
     )
 
 
+@app.route("/no-head", methods=["GET", "HEAD"])
+def no_head():
+    """Endpoint rejecting HEAD requests, like some CDNs and app servers do."""
+    if request.method == "HEAD":
+        return "", 405
+    return "GET only"
+
+
+@app.route("/slow")
+def slow():
+    """Healthy page answering after 0.5 s, for checks queued behind each other."""
+    time.sleep(0.5)
+    return "Slow but fine"
+
+
+@app.route("/asset.js")
+def asset():
+    """10 kB script sent without Timing-Allow-Origin."""
+    return "// " + "x" * 10_000, 200, {"Content-Type": "text/javascript"}
+
+
+@app.route("/cross-origin")
+def cross_origin():
+    """Page loading /asset.js from localhost, another origin than 127.0.0.1."""
+    port = request.host.rsplit(":", 1)[1]
+    return (
+        f'<h1>Cross-origin</h1><script src="http://localhost:{port}/asset.js"></script>'
+    )
+
+
 @app.route("/headers")
 def headers():
     """Returns JSON of request headers."""
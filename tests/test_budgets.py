@@ -0,0 +1,149 @@
+"""Tests for performance budgets and baseline regression detection."""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.budgets import (
+    check_budgets,
+    compare_to_baseline,
+    evaluate_run,
+    load_budgets,
+    mann_whitney_p,
+    read_baseline,
+    update_baseline,
+)
+
+CHECKOUT = "http://app.test/checkout"
+
+
+def runs(url, lcp_values, **fields):
+    return [{"url": url, "lcp_ms": lcp, **fields} for lcp in lcp_values]
+
+
+def noisy(mean, count, seed, spread=0.05):
+    rng = random.Random(seed)
+    return [rng.gauss(mean, mean * spread) for _ in range(count)]
+
+
+class TestBudgets:
+    """Tests for budget files and checks."""
+
+    def test_median_over_budget_per_pattern(self):
+        """The median of a page's runs is checked against matching patterns."""
+        records = runs(CHECKOUT + "?step=2", [2400, 2600, 2700]) + runs(
+            "http://app.test/", [900, 3000, 950]
+        )
+        budgets = {"*/checkout*": {"lcp_ms": 2500}, "*": {"lcp_ms": 2800}}
+
+        violations = check_budgets(records, budgets)
+
+        assert [(v["url"], v["pattern"], v["value"]) for v in violations] == [
+            (CHECKOUT, "*/checkout*", 2600)
+        ]
+
+    def test_nested_metrics(self):
+        """CDP metrics can be budgeted with dotted names."""
+        records = [{"url": CHECKOUT, "cdp": {"Nodes": 5000}}]
+
+        assert check_budgets(records, {"*": {"cdp.Nodes": 1500}})[0]["value"] == 5000
+
+    def test_load_budgets(self, tmp_path):
+        """Baseline options get defaults and a path next to the budgets file."""
+        path = tmp_path / "budgets.json"
+        path.write_text(
+            json.dumps({"budgets": {"*": {"requests": 50}}, "baseline": {}})
+        )
+
+        config = load_budgets(str(path))
+
+        assert config["baseline"]["path"] == str(tmp_path / "perf-baseline.jsonl")
+        assert config["baseline"]["min_runs"] == 5
+
+    def test_invalid_limit(self, tmp_path):
+        """Non-numeric limits are rejected when the file is loaded."""
+        path = tmp_path / "budgets.json"
+        path.write_text(json.dumps({"budgets": {"*": {"lcp_ms": "2.5s"}}}))
+
+        with pytest.raises(ValueError, match="expected a number"):
+            load_budgets(str(path))
+
+
+class TestBaselineRegressions:
+    """Tests for the noise-aware comparison against previous runs."""
+
+    baseline = runs(CHECKOUT, noisy(1000, 20, seed=1))
+
+    def test_real_regression_flagged(self):
+        """A consistent 30% slowdown over several runs is a regression."""
+        current = runs(CHECKOUT, noisy(1300, 5, seed=2))
+
+        [regression] = compare_to_baseline(current, self.baseline, ["lcp_ms"])
+
+        assert regression["change"] > 0.2
+        assert regression["p_value"] < 0.01
+
+    def test_single_outlier_run_not_flagged(self):
+        """One very slow run is not significant on its own."""
+        assert compare_to_baseline(runs(CHECKOUT, [3000]), self.baseline) == []
+
+    def test_noise_with_outlier_not_flagged(self):
+        """Runs from the same distribution plus one outlier pass."""
+        current = runs(CHECKOUT, noisy(1000, 4, seed=3) + [2500])
+
+        assert compare_to_baseline(current, self.baseline) == []
+
+    def test_throttling_profiles_compared_separately(self):
+        """Throttled runs are not compared with an unthrottled baseline."""
+        current = runs(CHECKOUT, noisy(4000, 5, seed=4), throttling="slow-4g")
+
+        assert compare_to_baseline(current, self.baseline) == []
+
+    def test_short_baseline_skipped(self):
+        """Pages with too few baseline runs are not compared yet."""
+        current = runs(CHECKOUT, [5000] * 5)
+
+        assert compare_to_baseline(current, self.baseline[:3]) == []
+
+    def test_mann_whitney_direction(self):
+        """Only the current sample being larger is significant."""
+        assert mann_whitney_p([10, 11, 12, 13], [1, 2, 3, 4, 5]) < 0.01
+        assert mann_whitney_p([1, 2, 3, 4], [10, 11, 12, 13, 14]) > 0.99
+        assert mann_whitney_p([5, 5], [5, 5, 5]) == 1.0
+
+
+class TestEvaluateRun:
+    """Tests for run.py's budgets step."""
+
+    def test_passing_runs_update_baseline(self, tmp_path, capsys):
+        """Passing runs are appended, keeping the latest max_runs per page."""
+        path = str(tmp_path / "baseline.jsonl")
+        update_baseline(path, runs(CHECKOUT, range(1000, 1010)), max_runs=8)
+        config = {
+            "budgets": {"*": {"lcp_ms": 2000}},
+            "baseline": {
+                "path": path,
+                "metrics": ["lcp_ms"],
+                "alpha": 0.01,
+                "min_change": 0.05,
+                "min_runs": 5,
+                "max_runs": 8,
+            },
+        }
+
+        assert evaluate_run(runs(CHECKOUT, [1001, 1003]), config)
+        assert [r["lcp_ms"] for r in read_baseline(path)][-2:] == [1001, 1003]
+        assert len(read_baseline(path)) == 8
+
+        assert not evaluate_run(runs(CHECKOUT, [1500] * 5), config)
+        assert "Baseline regressions: 1" in capsys.readouterr().out
+        assert len(read_baseline(path)) == 8
+        assert 1500 not in [r["lcp_ms"] for r in read_baseline(path)]
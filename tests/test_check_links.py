@@ -0,0 +1,115 @@
+"""Tests for the concurrent broken-link checker helpers."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import check_links, check_urls, normalize_link
+
+
+class TestNormalizeLink:
+    """Tests for normalize_link()."""
+
+    def test_lowercases_host_and_drops_default_port_and_fragment(self):
+        """Equivalent spellings of a URL normalize to the same string."""
+        assert (
+            normalize_link("HTTP://Example.COM:80/docs?q=1#intro")
+            == "http://example.com/docs?q=1"
+        )
+
+    def test_keeps_non_default_port_and_adds_root_path(self):
+        """Non-default ports are significant; an empty path becomes /."""
+        assert normalize_link("https://localhost:3000") == "https://localhost:3000/"
+
+    def test_rejects_non_http_schemes(self):
+        """mailto:, javascript: and tel: links are not checked."""
+        assert normalize_link("mailto:someone@example.com") is None
+        assert normalize_link("javascript:void(0)") is None
+        assert normalize_link("tel:+123") is None
+
+
+class TestCheckUrls:
+    """Tests for check_urls() against the local test server."""
+
+    def test_working_and_broken_links(self, test_server_url):
+        """Statuses below 400 are working, others are reported as broken."""
+        results = asyncio.run(
+            check_urls([f"{test_server_url}/", f"{test_server_url}/missing"])
+        )
+
+        assert [(r["status"], r["ok"]) for r in results] == [(200, True), (404, False)]
+
+    def test_falls_back_to_get_on_405(self, test_server_url):
+        """Servers rejecting HEAD are retried with GET."""
+        [result] = asyncio.run(check_urls([f"{test_server_url}/no-head"]))
+
+        assert result["status"] == 200
+        assert result["method"] == "GET"
+
+    def test_redirects_are_followed_and_reported(self, test_server_url):
+        """The final URL of a redirect chain is recorded."""
+        [result] = asyncio.run(check_urls([f"{test_server_url}/dashboard"]))
+
+        assert result["ok"]
+        assert result["redirected_to"].endswith("/login")
+
+    def test_connection_errors_are_structured(self):
+        """Unreachable hosts produce an error entry instead of raising."""
+        [result] = asyncio.run(check_urls(["http://127.0.0.1:1/"], timeout=2))
+
+        assert result["ok"] is False
+        assert result["status"] is None
+        assert result["error"]
+
+    def test_queued_checks_do_not_time_out(self, test_server_url):
+        """Time waiting for a free slot does not count towards the timeout."""
+        urls = [f"{test_server_url}/slow?n={n}" for n in range(12)]
+
+        results = asyncio.run(check_urls(urls, concurrency=2, timeout=2))
+
+        assert [r["ok"] for r in results] == [True] * 12
+        assert max(r["elapsed_ms"] for r in results) < 2000
+
+
+class TestCheckLinks:
+    """Tests for check_links() on a real page."""
+
+    def test_collects_dedupes_and_checks_links(self, page, test_server_url):
+        """Duplicate and non-http links are collected once or skipped."""
+        page.goto(test_server_url)
+        page.set_content(
+            f"""
+            <a href="{test_server_url}/login">Login</a>
+            <a href="{test_server_url}/login#form">Login again</a>
+            <a href="{test_server_url}/missing">Missing</a>
+            <a href="mailto:test@example.com">Mail</a>
+            """
+        )
+
+        report = check_links(page)
+
+        assert report["checked"] == 2
+        assert report["working"] == 1
+        assert report["broken"][0]["url"] == f"{test_server_url}/missing"
+
+    def test_runs_inside_sync_playwright(self, test_server_url):
+        """The sync API's running event loop does not block the checks."""
+
+        class LinkPage:
+            url = test_server_url
+
+            def evaluate(self, expression, selector):
+                return [f"{test_server_url}/login", f"{test_server_url}/missing"]
+
+        with sync_playwright():
+            report = check_links(LinkPage())
+
+        assert report["checked"] == 2
+        assert report["working"] == 1
@@ -0,0 +1,209 @@
+"""Tests for JS/CSS coverage aggregation over many pages."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.coverage import CoverageCollector, executed_ranges, merge_ranges
+
+APP_JS = "https://app.test/app.js"
+APP_CSS = "https://app.test/app.css"
+
+
+def function(*ranges):
+    return {
+        "ranges": [
+            {"startOffset": start, "endOffset": end, "count": count}
+            for start, end, count in ranges
+        ]
+    }
+
+
+# 100 bytes: f() [10, 50) never called; g() [60, 90) ran but skipped [70, 80)
+APP_FUNCTIONS = [
+    function((0, 100, 1)),
+    function((10, 50, 0)),
+    function((60, 90, 1), (70, 80, 0)),
+]
+
+
+def page_with(context, scripts=(), rule_usage=()):
+    """New page whose coverage session reports these scripts and rules."""
+    context.cdp_responses.update(
+        {
+            "Profiler.takePreciseCoverage": {"result": list(scripts)},
+            "CSS.takeCoverageDelta": {"coverage": list(rule_usage)},
+        }
+    )
+    return context.new_page()
+
+
+def stylesheet_added(page, sheet_id, url, length, inline=False):
+    page.context.cdp.emit(
+        "CSS.styleSheetAdded",
+        {
+            "header": {
+                "styleSheetId": sheet_id,
+                "sourceURL": url,
+                "length": length,
+                "isInline": inline,
+            }
+        },
+    )
+
+
+class TestRanges:
+    """Tests for range arithmetic."""
+
+    def test_innermost_block_count_decides(self):
+        """Uncalled functions and skipped blocks are unused."""
+        assert executed_ranges(APP_FUNCTIONS) == [(0, 10), (50, 70), (80, 100)]
+
+    def test_merge_ranges_unions_overlaps(self):
+        """Overlapping and adjacent ranges are merged."""
+        assert merge_ranges([(0, 10), (20, 30)], [(5, 20), (40, 50)]) == [
+            (0, 30),
+            (40, 50),
+        ]
+
+
+class TestCoverageCollector:
+    """Tests for collecting and merging coverage per URL."""
+
+    def test_js_used_and_unused_bytes(self, fake_context):
+        """Script coverage is reported per URL; non-http scripts are skipped."""
+        page = page_with(
+            fake_context,
+            scripts=[
+                {"url": APP_JS, "functions": APP_FUNCTIONS},
+                {"url": "", "functions": [function((0, 500, 1))]},
+            ],
+        )
+        collector = CoverageCollector(css=False)
+
+        with collector.track(page):
+            pass
+
+        report = collector.report()
+        assert report["js"] == {
+            "total_bytes": 100,
+            "used_bytes": 50,
+            "unused_bytes": 50,
+        }
+        [entry] = report["files"]
+        assert entry["unused_pct"] == 50.0
+        assert page.context.cdp.detached
+
+    def test_union_across_pages(self, fake_context):
+        """A byte used on any page counts as used."""
+        collector = CoverageCollector(css=False)
+        for functions in (
+            [function((0, 100, 1), (50, 100, 0))],
+            [function((0, 100, 1), (0, 50, 0))],
+        ):
+            page = page_with(
+                fake_context, scripts=[{"url": APP_JS, "functions": functions}]
+            )
+            collector.start(page)
+            collector.collect(page)
+
+        [entry] = collector.report()["files"]
+        assert entry["used_bytes"] == 100
+        assert entry["pages"] == 2
+        assert collector.files[APP_JS]["used"] == [(0, 100)]
+
+    def test_css_rule_usage(self, fake_context):
+        """Used rules of external stylesheets are counted; inline sheets skipped."""
+        page = page_with(
+            fake_context,
+            rule_usage=[
+                {"styleSheetId": "1", "startOffset": 0, "endOffset": 30, "used": True},
+                {
+                    "styleSheetId": "1",
+                    "startOffset": 30,
+                    "endOffset": 80,
+                    "used": False,
+                },
+                {"styleSheetId": "2", "startOffset": 0, "endOffset": 10, "used": True},
+            ],
+        )
+        collector = CoverageCollector(js=False)
+        collector.start(page)
+        stylesheet_added(page, "1", APP_CSS, 200)
+        stylesheet_added(page, "2", "https://app.test/", 10, inline=True)
+
+        collector.collect(page)
+
+        report = collector.report()
+        assert report["css"] == {
+            "total_bytes": 200,
+            "used_bytes": 30,
+            "unused_bytes": 170,
+        }
+        assert [f["url"] for f in report["files"]] == [APP_CSS]
+
+    def test_navigation_drops_old_stylesheets(self, fake_context):
+        """Stylesheets of a previous document are not collected again."""
+        page = page_with(fake_context)
+        collector = CoverageCollector(js=False)
+        collector.start(page)
+        stylesheet_added(page, "1", APP_CSS, 200)
+        page.context.cdp.emit("DOM.documentUpdated", {})
+
+        collector.collect(page)
+
+        assert collector.report()["files"] == []
+
+    def test_report_sorted_by_unused_bytes(self):
+        """The files wasting the most bytes come first."""
+        collector = CoverageCollector()
+        collector.files = {
+            "https://app.test/small.js": {
+                "type": "js",
+                "size": 100,
+                "used": [(0, 10)],
+                "pages": 1,
+            },
+            "https://app.test/vendor.js": {
+                "type": "js",
+                "size": 1000,
+                "used": [(0, 100)],
+                "pages": 1,
+            },
+        }
+
+        report = collector.report(top=1)
+
+        assert [f["url"] for f in report["files"]] == ["https://app.test/vendor.js"]
+        assert report["js"]["unused_bytes"] == 990
+
+    def test_closed_pages_released(self, fake_context):
+        """Closing a page drops its coverage session."""
+        page = page_with(fake_context)
+        collector = CoverageCollector()
+        collector.start(page)
+
+        page.close()
+
+        assert collector._sessions == {}
+
+
+class TestCoverageInBrowser:
+    """Tests for CoverageCollector in Chromium."""
+
+    def test_page_script_covered(self, page, test_server_url):
+        """The external script of a real page is reported with its used bytes."""
+        collector = CoverageCollector()
+
+        with collector.track(page):
+            page.goto(f"{test_server_url}/form-interactions")
+
+        report = collector.report()
+        [entry] = [f for f in report["files"] if f["url"].endswith(".js")]
+        assert entry["url"] == f"{test_server_url}/static/form-interactions.js"
+        assert 0 < entry["used_bytes"] < entry["total_bytes"]
+        assert report["js"]["total_bytes"] == entry["total_bytes"]
@@ -0,0 +1,140 @@
+"""Tests for CDP CPU profiling of the app under test."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.cpu_profile import profile_cpu, self_times
+
+APP_JS = "https://app.test/app.js"
+
+
+def node(id, name, url="", line=0, column=0):
+    return {
+        "id": id,
+        "callFrame": {
+            "functionName": name,
+            "url": url,
+            "lineNumber": line,
+            "columnNumber": column,
+        },
+    }
+
+
+# render() is reached through two call paths (nodes 3 and 5)
+PROFILE = {
+    "nodes": [
+        node(1, "(root)"),
+        node(2, "onClick", APP_JS, 9, 4),
+        node(3, "render", APP_JS, 99, 0),
+        node(4, "(idle)"),
+        node(5, "render", APP_JS, 99, 0),
+        node(6, "(garbage collector)"),
+    ],
+    "startTime": 1_000_000,
+    "endTime": 1_010_000,
+    "samples": [2, 3, 4, 5, 6, 3],
+    "timeDeltas": [0, 1000, 2000, 4000, 1500, 500],
+}
+
+
+BUSY_PAGE = """
+<script>
+  function spinForMs(ms) {
+    const end = performance.now() + ms;
+    let n = 0;
+    while (performance.now() < end) n++;
+    return n;
+  }
+</script>
+"""
+
+
+@pytest.fixture
+def profiled_page(fake_page):
+    """Fake page whose profiler session stops with PROFILE."""
+    fake_page.context.cdp_responses["Profiler.stop"] = {"profile": PROFILE}
+    return fake_page
+
+
+class TestSelfTimes:
+    """Tests for ranking functions by self time."""
+
+    def test_functions_merged_across_call_paths(self):
+        """Samples of the same function under different paths are summed."""
+        functions = self_times(PROFILE)
+
+        assert [f["function"] for f in functions] == [
+            "render",
+            "onClick",
+            "(garbage collector)",
+        ]
+        render = functions[0]
+        # 2 ms + 1.5 ms + 1 ms (the last sample runs until endTime)
+        assert render["self_ms"] == 4.5
+        assert (render["url"], render["line"], render["column"]) == (APP_JS, 100, 1)
+        assert render["self_pct"] == 75.0
+
+    def test_idle_is_skipped(self):
+        """Idle time is not the app's work."""
+        assert "(idle)" not in [f["function"] for f in self_times(PROFILE)]
+
+
+class TestProfileCpu:
+    """Tests for the profile_cpu() context manager."""
+
+    def test_saves_profile_and_prints_top(self, profiled_page, tmp_path, capsys):
+        """The profile is written and the top functions are printed."""
+        page = profiled_page
+        path = tmp_path / "click.cpuprofile"
+
+        with profile_cpu(page, str(path), sampling_interval_us=50, top=1) as result:
+            pass
+
+        session = page.context.cdp
+        assert session.sent == [
+            ("Profiler.enable", None),
+            ("Profiler.setSamplingInterval", {"interval": 50}),
+            ("Profiler.start", None),
+            ("Profiler.stop", None),
+        ]
+        assert session.detached
+        assert json.loads(path.read_text())["samples"] == PROFILE["samples"]
+        assert result["duration_ms"] == 10.0
+        output = capsys.readouterr().out
+        assert f"render  {APP_JS}:100:1" in output
+        assert "onClick" not in output
+
+    def test_profile_saved_when_block_fails(self, profiled_page, tmp_path):
+        """A failing flow still stops the profiler and keeps the profile."""
+        path = tmp_path / "failed.cpuprofile"
+
+        with pytest.raises(RuntimeError):
+            with profile_cpu(profiled_page, str(path)):
+                raise RuntimeError("click failed")
+
+        assert json.loads(path.read_text()) == PROFILE
+        assert profiled_page.context.cdp.detached
+
+
+class TestProfileCpuInBrowser:
+    """Tests for profile_cpu() in Chromium."""
+
+    def test_busy_function_ranked(self, page, tmp_path):
+        """A function spinning the main thread shows up with its self time."""
+        page.set_content(BUSY_PAGE)
+
+        with profile_cpu(page, str(tmp_path / "busy.cpuprofile")) as result:
+            page.evaluate("spinForMs(300)")
+
+        functions = {f["function"]: f for f in result["functions"]}
+        assert functions["spinForMs"]["self_ms"] > 100
+        assert result["duration_ms"] >= 300
+        assert json.loads((tmp_path / "busy.cpuprofile").read_text())["nodes"]
@@ -0,0 +1,264 @@
+"""Tests for the parallel same-origin crawler."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.crawler import BloomFilter, CrawlState, crawl
+
+ORIGIN = "http://app.test"
+SITE = {
+    f"{ORIGIN}/": ["/about", "/blog", "/about#team", "https://elsewhere.test/"],
+    f"{ORIGIN}/about": ["/", "/team"],
+    f"{ORIGIN}/blog": ["/blog/1", "/blog/2", "/logout"],
+    f"{ORIGIN}/team": [],
+    f"{ORIGIN}/blog/1": ["/blog/2"],
+    f"{ORIGIN}/blog/2": ["/blog/3"],
+}
+NOT_FOUND = [f"{ORIGIN}/blog/3", f"{ORIGIN}/logout"]
+
+
+@pytest.fixture
+def make_site(fake_browser):
+    """Factory for contexts serving SITE, each page loading instantly."""
+
+    def make_site(etags=None, bodies=None):
+        context = fake_browser.new_context()
+        context.statuses = {url: 404 for url in NOT_FOUND}
+        context.etags = dict(etags or {})
+        context.bodies = dict(bodies or {})
+        context.log = []
+
+        def setup(page):
+            def evaluate(script, arg):
+                if "location.href" in script:
+                    context.log.append(arg)
+                    return page.navigate(arg)
+                if "outerHTML" in script:
+                    return context.bodies.get(page.url, f"<html>  {page.url}\n</html>")
+                return [
+                    ORIGIN + link if link.startswith("/") else link
+                    for link in SITE.get(page.url, [])
+                ]
+
+            page.evaluate_result = evaluate
+
+        context.on("page", setup)
+        return context
+
+    return make_site
+
+
+class TestBloomFilter:
+    """Tests for the bounded visited set."""
+
+    def test_add_and_contains(self):
+        """Added URLs are found and only reported as new once."""
+        seen = BloomFilter(capacity=1000)
+
+        assert seen.add("http://app.test/") is True
+        assert seen.add("http://app.test/") is False
+        assert "http://app.test/" in seen
+        assert "http://app.test/other" not in seen
+        assert len(seen) == 1
+
+    def test_size_independent_of_items(self):
+        """Memory is fixed up front: ~1.8 MB for 1M URLs at 0.1% errors."""
+        seen = BloomFilter(capacity=1_000_000, error_rate=0.001)
+
+        assert len(seen.bits) < 2 * 1024**2
+        for i in range(10_000):
+            seen.add(f"http://app.test/page/{i}")
+        assert len(seen.bits) < 2 * 1024**2
+
+    def test_false_positive_rate(self):
+        """The false positive rate stays near the configured error rate."""
+        seen = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            seen.add(f"http://app.test/a/{i}")
+
+        false_positives = sum(f"http://app.test/b/{i}" in seen for i in range(5000))
+
+        assert false_positives < 5000 * 0.03
+
+
+class TestCrawl:
+    """Tests for crawl() with fake pages."""
+
+    def test_breadth_first_same_origin(self, make_site):
+        """Links are followed breadth-first, once, within the origin."""
+        context = make_site()
+
+        results = list(crawl(context, ORIGIN, concurrency=2, max_depth=5))
+
+        urls = [result["url"] for result in results]
+        assert urls[0] == f"{ORIGIN}/"
+        assert len(urls) == len(set(urls))
+        assert "https://elsewhere.test/" not in urls
+        depths = {result["url"]: result["depth"] for result in results}
+        assert depths[f"{ORIGIN}/blog/2"] == 2
+        assert depths[f"{ORIGIN}/blog/3"] == 3
+        assert [r["status"] for r in results if r["url"].endswith("/blog/3")] == [404]
+        assert len(context.pages) == 2
+
+    def test_depth_limit(self, make_site):
+        """Pages deeper than max_depth are not visited."""
+        results = list(crawl(make_site(), ORIGIN, max_depth=1))
+
+        assert {result["url"] for result in results} == {
+            f"{ORIGIN}/",
+            f"{ORIGIN}/about",
+            f"{ORIGIN}/blog",
+        }
+
+    def test_include_exclude_and_max_pages(self, make_site):
+        """URL patterns and the page limit bound the crawl."""
+        results = list(
+            crawl(make_site(), ORIGIN, include=r"/blog", exclude=r"/logout$")
+        )
+        assert [result["url"] for result in results] == [
+            f"{ORIGIN}/",
+            f"{ORIGIN}/blog",
+            f"{ORIGIN}/blog/1",
+            f"{ORIGIN}/blog/2",
+            f"{ORIGIN}/blog/3",
+        ]
+
+        assert len(list(crawl(make_site(), ORIGIN, max_pages=3))) == 3
+
+    def test_results_are_streamed(self, make_site):
+        """The first result is available before the crawl finishes."""
+        context = make_site()
+
+        first = next(crawl(context, ORIGIN))
+
+        assert first["url"] == f"{ORIGIN}/"
+        assert context.log == [f"{ORIGIN}/"]
+
+    def test_callback_result_stored(self, make_site):
+        """on_page receives the page and its return value is kept."""
+        results = crawl(
+            make_site(), ORIGIN, max_depth=0, on_page=lambda page, r: page.url
+        )
+
+        assert next(results)["data"] == f"{ORIGIN}/"
+
+    def test_rejects_non_http_start(self, make_site):
+        """Only http(s) start URLs can be crawled."""
+        with pytest.raises(ValueError, match="http"):
+            next(crawl(make_site(), "file:///tmp/index.html"))
+
+
+class TestIncrementalCrawl:
+    """Tests for re-crawling with a CrawlState."""
+
+    def test_first_run_records_everything(self, make_site, tmp_path):
+        """Every page is new on the first run and the callback runs for all."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        seen = []
+
+        results = list(
+            crawl(
+                make_site(),
+                ORIGIN,
+                state=state,
+                on_page=lambda p, r: seen.append(r["url"]),
+            )
+        )
+
+        assert all(result["changed"] for result in results)
+        assert len(seen) == len(results)
+        assert state.get(f"{ORIGIN}/about")["links"] == [
+            f"{ORIGIN}/",
+            f"{ORIGIN}/team",
+        ]
+        assert state.frontier() == []
+
+    def test_unchanged_pages_skip_callback(self, make_site, tmp_path):
+        """Pages with the same normalized content hash skip on_page."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        list(crawl(make_site(), ORIGIN, state=state))
+        bodies = {f"{ORIGIN}/blog": "<html>new post</html>"}
+        seen = []
+
+        results = list(
+            crawl(
+                make_site(bodies=bodies),
+                ORIGIN,
+                state=state,
+                on_page=lambda p, r: seen.append(r["url"]),
+            )
+        )
+
+        assert seen == [f"{ORIGIN}/blog"]
+        assert {r["skipped"] for r in results if not r["changed"]} == {"unchanged"}
+
+    def test_whitespace_changes_are_ignored(self, make_site, tmp_path):
+        """Whitespace differences do not count as content changes."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        url = f"{ORIGIN}/team"
+        list(crawl(make_site(bodies={url: "<p>Team</p>"}), url, state=state))
+
+        [result] = crawl(make_site(bodies={url: "<p>Team</p>\n\n "}), url, state=state)
+
+        assert result["changed"] is False
+
+    def test_not_modified_pages_reuse_stored_links(self, make_site, tmp_path):
+        """A 304 skips the callback but still follows the page's known links."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        etags = {f"{ORIGIN}/": '"v1"'}
+        list(crawl(make_site(etags=etags), ORIGIN, state=state))
+        context = make_site(etags=etags)
+
+        results = list(crawl(context, ORIGIN, state=state))
+
+        assert context.fetches[0]["if-none-match"] == '"v1"'
+        assert results[0]["status"] == 304
+        assert results[0]["skipped"] == "not-modified"
+        assert len(results) == 8
+
+    def test_interrupted_crawl_resumes(self, make_site, tmp_path):
+        """Stopping early leaves the frontier so the next run continues it."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        crawler = crawl(make_site(), ORIGIN, state=state, concurrency=1)
+        first = [next(crawler)["url"] for _ in range(3)]
+        crawler.close()
+        context = make_site()
+
+        rest = [result["url"] for result in crawl(context, ORIGIN, state=state)]
+
+        assert f"{ORIGIN}/" not in context.log
+        assert set(first).isdisjoint(rest)
+        assert len(first) + len(rest) == 8
+
+    def test_resume_with_other_origin_rejected(self, make_site, tmp_path):
+        """An unfinished crawl of one site is not resumed for another."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        crawler = crawl(make_site(), ORIGIN, state=state, concurrency=1)
+        next(crawler)
+        crawler.close()
+
+        with pytest.raises(ValueError, match="unfinished crawl of app.test"):
+            next(crawl(make_site(), "http://other.test/", state=state))
+
+    def test_resume_adds_new_start_page(self, make_site, tmp_path):
+        """A start page of the same site that was not queued is crawled too."""
+        state = CrawlState(str(tmp_path / "crawl.sqlite"))
+        crawler = crawl(make_site(), ORIGIN, state=state, concurrency=1, max_depth=1)
+        next(crawler)
+        crawler.close()
+
+        team = f"{ORIGIN}/team"
+        results = list(crawl(make_site(), team, state=state, max_depth=1))
+
+        assert {result["url"] for result in results} == {
+            f"{ORIGIN}/about",
+            f"{ORIGIN}/blog",
+            team,
+        }
@@ -14,6 +14,7 @@ sys.path.insert(
 from lib.helpers import (
     get_extra_headers_from_env,
     get_context_options_with_headers,
+    context_options,
     create_context,
 )
 from conftest import extract_json_from_page
@@ -174,6 +175,21 @@ class TestGetContextOptionsWithHeaders:
         assert result == {"extra_http_headers": {"X-Test": "test-value"}}
 
 
+class TestContextOptions:
+    """Tests for context_options(), create_context()'s option defaults."""
+
+    def test_defaults_and_env_headers(self, monkeypatch):
+        """Passed options override the defaults, env headers are merged in."""
+        monkeypatch.setenv("PW_HEADER_NAME", "X-Test")
+        monkeypatch.setenv("PW_HEADER_VALUE", "test-value")
+
+        result = context_options({"locale": "de-DE"})
+
+        assert result["viewport"] == {"width": 1280, "height": 720}
+        assert result["locale"] == "de-DE"
+        assert result["extra_http_headers"] == {"X-Test": "test-value"}
+
+
 class TestCreateContextAutoHeaders:
     """Tests for create_context() auto-headers merging."""
 
@@ -0,0 +1,322 @@
+"""Tests for dev server discovery from the kernel's listening sockets."""
+
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import dev_servers
+from lib.helpers import (
+    detect_dev_servers,
+    find_dev_servers,
+    list_listening_sockets,
+    wait_for_dev_server,
+)
+
+RUN_PY = Path(__file__).parent.parent / "skills" / "playwright-py-skill" / "run.py"
+
+HEADER = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+TCP = HEADER + (
+    "   0: 0100007F:0BB8 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 111 1 0 100 0 0 10 0\n"
+    "   1: 00000000:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 222 1 0 100 0 0 10 0\n"
+    "   2: 0100007F:0BB8 0100007F:D431 01 00000000:00000000 00:00000000 00000000  1000        0 333 1 0 20 4 30 10 -1\n"
+)
+TCP6 = HEADER + (
+    "   0: 00000000000000000000000001000000:1435 00000000000000000000000000000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 444 1 0 100 0 0 10 0\n"
+)
+
+
+@pytest.fixture(autouse=True)
+def dev_server_cache(monkeypatch, tmp_path):
+    path = tmp_path / "dev-servers.json"
+    monkeypatch.setenv("PW_DEV_SERVER_CACHE", str(path))
+    monkeypatch.delenv("PW_DEV_SERVER_CACHE_TTL", raising=False)
+    return path
+
+
+@pytest.fixture
+def proc_net(tmp_path):
+    (tmp_path / "tcp").write_text(TCP)
+    (tmp_path / "tcp6").write_text(TCP6)
+    return (str(tmp_path / "tcp"), str(tmp_path / "tcp6"))
+
+
+def port_of(url):
+    return urlsplit(url).port
+
+
+class TestListListeningSockets:
+    """Tests for parsing /proc/net/tcp and tcp6."""
+
+    def test_only_listening_sockets(self, proc_net):
+        """Established connections are ignored, addresses are decoded."""
+        assert list_listening_sockets(proc_net) == [
+            {"address": "127.0.0.1", "port": 3000, "inode": 111},
+            {"address": "0.0.0.0", "port": 8080, "inode": 222},
+            {"address": "::1", "port": 5173, "inode": 444},
+        ]
+
+    def test_unavailable_on_other_platforms(self, tmp_path):
+        """None signals that /proc/net/tcp could not be read."""
+        assert list_listening_sockets((str(tmp_path / "missing"),)) is None
+
+
+class TestFindDevServers:
+    """Tests for find_dev_servers() against the local test server."""
+
+    @pytest.mark.skipif(
+        not os.path.exists("/proc/net/tcp"), reason="needs /proc/net/tcp"
+    )
+    def test_finds_server_on_arbitrary_port(self, test_server_url):
+        """A server on a random port is found and its process is named."""
+        servers = asyncio.run(find_dev_servers())
+
+        [server] = [s for s in servers if s["port"] == port_of(test_server_url)]
+        assert server["status"] == 200
+        assert server["pid"] == os.getpid()
+        assert server["process"]
+
+    def test_falls_back_to_common_and_custom_ports(self, monkeypatch, test_server_url):
+        """Without /proc, common ports plus custom_ports are probed."""
+        monkeypatch.setattr(dev_servers, "list_listening_sockets", lambda: None)
+        port = port_of(test_server_url)
+
+        servers = asyncio.run(find_dev_servers(custom_ports=[port]))
+
+        assert port in [server["port"] for server in servers]
+
+    def test_detect_dev_servers_returns_urls(self, monkeypatch, test_server_url):
+        """detect_dev_servers() keeps returning plain localhost URLs."""
+        port = port_of(test_server_url)
+        monkeypatch.setattr(
+            dev_servers,
+            "list_listening_sockets",
+            lambda: [{"address": "127.0.0.1", "port": port, "inode": 0}],
+        )
+
+        assert asyncio.run(detect_dev_servers()) == [f"http://localhost:{port}"]
+
+
+def lan_address():
+    """Address of the interface used for outbound traffic, if not loopback."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("192.0.2.1", 9))
+            address = s.getsockname()[0]
+    except OSError:
+        return None
+    return None if address.startswith("127.") else address
+
+
+class SilentHandler(BaseHTTPRequestHandler):
+    """Answers 200 to every HEAD request."""
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestServerUrls:
+    """Tests for the URL each found server is reported at."""
+
+    def test_url_uses_bound_address(self, monkeypatch):
+        """Loopback and wildcard binds get localhost, others their address."""
+
+        async def fake_probe(candidates, timeout):
+            return {port: 200 for port in candidates}
+
+        monkeypatch.setattr(
+            dev_servers,
+            "list_listening_sockets",
+            lambda: [
+                {"address": "127.0.0.1", "port": 3000, "inode": 1},
+                {"address": "::", "port": 4000, "inode": 2},
+                {"address": "192.168.1.20", "port": 5000, "inode": 3},
+                {"address": "fd00::2", "port": 6000, "inode": 4},
+            ],
+        )
+        monkeypatch.setattr(dev_servers, "_probe_ports", fake_probe)
+
+        servers = asyncio.run(find_dev_servers(use_cache=False))
+
+        assert [server["url"] for server in servers] == [
+            "http://localhost:3000",
+            "http://localhost:4000",
+            "http://192.168.1.20:5000",
+            "http://[fd00::2]:6000",
+        ]
+
+    @pytest.mark.skipif(
+        not os.path.exists("/proc/net/tcp") or lan_address() is None,
+        reason="needs /proc/net/tcp and a non-loopback interface",
+    )
+    def test_server_bound_to_lan_address_reachable(self):
+        """A server listening on a LAN address only is reported at that address."""
+        address = lan_address()
+        server = HTTPServer((address, 0), SilentHandler)
+        port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            servers = asyncio.run(find_dev_servers(use_cache=False))
+            # Not reachable through localhost, the URL used for loopback binds
+            with pytest.raises(OSError):
+                socket.create_connection(("localhost", port), timeout=1).close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        [found] = [s for s in servers if s["port"] == port]
+        assert found["url"] == f"http://{address}:{port}"
+
+
+class TestDetectionCache:
+    """Tests for caching detection results between calls."""
+
+    @pytest.fixture
+    def probes(self, monkeypatch):
+        sockets = [{"address": "127.0.0.1", "port": 3000, "inode": 1}]
+        calls = []
+
+        async def fake_probe(candidates, timeout):
+            calls.append(sorted(candidates))
+            return {port: 200 for port in candidates}
+
+        monkeypatch.setattr(dev_servers, "list_listening_sockets", lambda: sockets)
+        monkeypatch.setattr(dev_servers, "_probe_ports", fake_probe)
+        return sockets, calls
+
+    def test_second_call_served_from_cache(self, probes):
+        """Unchanged sockets within the TTL are not probed again."""
+        _, calls = probes
+
+        first = asyncio.run(find_dev_servers())
+        second = asyncio.run(find_dev_servers())
+
+        assert first == second
+        assert len(calls) == 1
+
+    def test_socket_change_invalidates(self, probes):
+        """A restarted server (new socket inode) is probed again."""
+        sockets, calls = probes
+        asyncio.run(find_dev_servers())
+
+        sockets[0] = {**sockets[0], "inode": 2}
+        asyncio.run(find_dev_servers())
+
+        assert len(calls) == 2
+
+    def test_ttl_and_custom_ports(self, probes, monkeypatch):
+        """Different custom ports miss the cache; TTL 0 disables it."""
+        _, calls = probes
+        asyncio.run(find_dev_servers())
+        asyncio.run(find_dev_servers(custom_ports=[4000]))
+        monkeypatch.setenv("PW_DEV_SERVER_CACHE_TTL", "0")
+        asyncio.run(find_dev_servers())
+
+        assert calls == [[3000], [3000, 4000], [3000]]
+
+    def test_use_cache_false_forces_probe(self, probes):
+        """use_cache=False bypasses a valid cache entry."""
+        _, calls = probes
+        asyncio.run(find_dev_servers())
+        asyncio.run(find_dev_servers(use_cache=False))
+
+        assert len(calls) == 2
+
+
+class TestDetectServersCommand:
+    """Tests for `run.py --detect-servers`."""
+
+    def test_prints_json_only(self, test_server_url, dev_server_cache):
+        """The subcommand prints a JSON list without the banner."""
+        port = port_of(test_server_url)
+
+        output = subprocess.run(
+            [sys.executable, str(RUN_PY), f"--detect-servers={port}"],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PW_DEV_SERVER_CACHE": str(dev_server_cache)},
+        ).stdout
+
+        servers = json.loads(output)
+        assert port in [server["port"] for server in servers]
+        assert dev_server_cache.exists()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StartingHandler(BaseHTTPRequestHandler):
+    """Answers 503 for the first request, like a dev server still compiling."""
+
+    requests = 0
+
+    def do_HEAD(self):
+        StartingHandler.requests += 1
+        self.send_response(503 if StartingHandler.requests == 1 else 200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestWaitForDevServer:
+    """Tests for wait_for_dev_server()."""
+
+    def test_running_server_ready_at_once(self, test_server_url):
+        """A server which already answers is ready on the first attempt."""
+        result = wait_for_dev_server(test_server_url, timeout=5)
+
+        assert result["ready"] is True
+        assert result["status"] == 200
+        assert result["attempts"] == 1
+
+    def test_waits_for_late_start_and_5xx(self):
+        """Refused connections and 5xx answers are retried until ready."""
+        port = free_port()
+        StartingHandler.requests = 0
+
+        def start_later():
+            time.sleep(0.3)
+            server = HTTPServer(("127.0.0.1", port), StartingHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        threading.Thread(target=start_later, daemon=True).start()
+        result = wait_for_dev_server(port, timeout=10)
+
+        assert result["ready"] is True
+        assert result["url"] == f"http://localhost:{port}"
+        assert result["elapsed_ms"] >= 300
+        assert StartingHandler.requests >= 2
+
+    def test_timeout(self, capsys):
+        """Nothing listening gives ready=False once the timeout passes."""
+        started = time.monotonic()
+
+        result = wait_for_dev_server(free_port(), timeout=0.5)
+
+        assert result["ready"] is False
+        assert result["attempts"] > 1
+        assert time.monotonic() - started < 2
+        assert "not ready" in capsys.readouterr().err
@@ -0,0 +1,190 @@
+"""Tests for retain-on-failure tracing used by run.py --trace-on-failure."""
+
+import sys
+import zipfile
+from pathlib import Path
+
+import playwright.sync_api
+import pytest
+from playwright.sync_api import Browser, BrowserContext, sync_playwright
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import failure_trace
+
+
+@pytest.fixture
+def installed(tmp_path):
+    failure_trace.install(str(tmp_path), "run-test")
+    yield tmp_path / "run-test"
+    failure_trace.uninstall()
+
+
+class TestFailureTrace:
+    """Tests for trace start and failure capture."""
+
+    def test_tracing_starts_with_snapshots_only(self, installed, fake_context):
+        """Tracing is cheap: DOM snapshots without screencast frames."""
+        context = failure_trace.start_failure_tracing(fake_context)
+
+        assert context.tracing.started == {
+            "snapshots": True,
+            "screenshots": False,
+            "sources": False,
+        }
+
+    def test_capture_writes_trace_dom_and_screenshot(self, installed, fake_context):
+        """A failure saves all artifacts under the run ID directory."""
+        fake_context.new_page().html = "<h1>Checkout</h1>"
+        fake_context.new_page()
+        failure_trace.start_failure_tracing(fake_context)
+
+        saved = failure_trace.capture_failure(RuntimeError("checkout failed"))
+
+        assert sorted(Path(path).name for path in saved) == [
+            "context-0-page-0.html",
+            "context-0-page-0.png",
+            "context-0-page-1.html",
+            "context-0-page-1.png",
+            "context-0-trace.zip",
+            "error.txt",
+        ]
+        assert all(Path(path).parent == installed for path in saved)
+        assert "checkout failed" in (installed / "error.txt").read_text()
+        assert (installed / "context-0-page-0.html").read_text() == "<h1>Checkout</h1>"
+
+    def test_each_context_captured_once(self, installed, fake_context):
+        """Repeated capture hooks (sync_playwright(), run.py) write once."""
+        failure_trace.start_failure_tracing(fake_context)
+
+        assert failure_trace.capture_failure(RuntimeError())
+        assert failure_trace.capture_failure(RuntimeError()) == []
+
+    def test_nothing_written_without_failure(self, installed, fake_context):
+        """The happy path never touches the output directory."""
+        failure_trace.start_failure_tracing(fake_context)
+
+        assert not installed.exists()
+
+    def test_capture_disabled_when_not_installed(self):
+        """capture_failure() is a no-op unless run.py installed tracing."""
+        assert failure_trace.capture_failure(RuntimeError()) == []
+
+    def test_closed_context_trace_kept_for_later_failure(self, installed, fake_context):
+        """A context closed before the failure is reported still has its trace."""
+        context = failure_trace.start_failure_tracing(fake_context)
+        failure_trace._park_trace(context)
+        assert not installed.exists()
+
+        saved = failure_trace.capture_failure(RuntimeError())
+
+        assert sorted(Path(path).name for path in saved) == [
+            "context-0-trace.zip",
+            "error.txt",
+        ]
+        assert (installed / "context-0-trace.zip").read_bytes() == b"zip"
+
+    def test_close_in_handled_except_saves_nothing(self, installed, fake_context):
+        """An exception the script handled does not count as a failure."""
+        context = failure_trace.start_failure_tracing(fake_context)
+        try:
+            raise ValueError("retried")
+        except ValueError:
+            failure_trace._park_trace(context)
+
+        parked = failure_trace._state["parked"]
+        failure_trace.uninstall()
+
+        assert not installed.exists()
+        assert not any(Path(path).exists() for path in parked)
+
+    def test_uninstall_restores_playwright_methods(self):
+        """Patched Playwright methods are restored on uninstall."""
+        original_new_context = Browser.new_context
+        original_close = BrowserContext.close
+
+        failure_trace.install("/tmp", "run-test")
+        assert Browser.new_context is not original_new_context
+        failure_trace.uninstall()
+
+        assert Browser.new_context is original_new_context
+        assert BrowserContext.close is original_close
+        assert playwright.sync_api.sync_playwright is sync_playwright
+
+    def test_sync_playwright_failure_captured_before_driver_stops(
+        self, tmp_path, monkeypatch, fake_context
+    ):
+        """Open contexts are saved before sync_playwright() stops the driver."""
+        run_dir = tmp_path / "run-test"
+        traced_at_exit = []
+
+        class FakeManager:
+            def __enter__(self):
+                return "playwright"
+
+            def __exit__(self, *exc_info):
+                traced_at_exit.append((run_dir / "context-0-trace.zip").exists())
+
+            def start(self):
+                return "started"
+
+        monkeypatch.setattr(playwright.sync_api, "sync_playwright", FakeManager)
+        failure_trace.install(str(tmp_path), "run-test")
+        try:
+            failure_trace.start_failure_tracing(fake_context)
+            assert playwright.sync_api.sync_playwright().start() == "started"
+            with pytest.raises(RuntimeError, match="checkout failed"):
+                with playwright.sync_api.sync_playwright() as p:
+                    assert p == "playwright"
+                    raise RuntimeError("checkout failed")
+        finally:
+            failure_trace.uninstall()
+
+        assert traced_at_exit == [True]
+        assert playwright.sync_api.sync_playwright is FakeManager
+
+
+class TestFailureTraceInBrowser:
+    """Tests for failure tracing of real Chromium contexts."""
+
+    def test_failure_keeps_trace_of_context_closed_in_finally(
+        self, installed, test_server_url
+    ):
+        """The usual try/finally script still leaves a trace when it fails."""
+        with pytest.raises(RuntimeError, match="checkout failed"):
+            with playwright.sync_api.sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                try:
+                    page = browser.new_page()
+                    page.goto(test_server_url)
+                    raise RuntimeError("checkout failed")
+                finally:
+                    browser.close()
+
+        assert sorted(path.name for path in installed.iterdir()) == [
+            "context-0-trace.zip",
+            "error.txt",
+        ]
+        assert zipfile.is_zipfile(installed / "context-0-trace.zip")
+
+    def test_passing_run_with_handled_error_writes_nothing(
+        self, installed, test_server_url
+    ):
+        """Closing a context inside a handled except block keeps nothing."""
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            context = browser.new_context()
+            context.new_page().goto(test_server_url)
+            try:
+                raise ValueError("retried")
+            except ValueError:
+                context.close()
+            browser.close()
+        parked = list(failure_trace._state["parked"])
+        failure_trace.uninstall()
+
+        assert not installed.exists()
+        assert parked and not any(Path(path).exists() for path in parked)
@@ -0,0 +1,161 @@
+"""Tests for HAR record/replay mode driven by environment variables."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from playwright.sync_api import Error as PlaywrightError
+
+from lib import helpers
+from lib.helpers import create_context, get_har_options_from_env
+
+
+@pytest.fixture(autouse=True)
+def clean_har_env(monkeypatch):
+    for name in ("PW_HAR_MODE", "PW_HAR_PATH", "PW_HAR_NOT_FOUND"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(helpers, "_har_context_counter", iter(range(100)))
+
+
+class TestGetHarOptionsFromEnv:
+    """Tests for get_har_options_from_env()."""
+
+    def test_disabled_by_default(self):
+        """No PW_HAR_MODE means no HAR handling."""
+        assert get_har_options_from_env() is None
+
+    def test_replay_options(self, monkeypatch):
+        """Mode, path and miss behavior are read from the environment."""
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        monkeypatch.setenv("PW_HAR_PATH", "/tmp/staging.har")
+        monkeypatch.setenv("PW_HAR_NOT_FOUND", "fallback")
+
+        assert get_har_options_from_env() == {
+            "mode": "replay",
+            "path": "/tmp/staging.har",
+            "not_found": "fallback",
+        }
+
+    def test_invalid_mode_ignored(self, monkeypatch, capsys):
+        """An unknown mode is reported and ignored."""
+        monkeypatch.setenv("PW_HAR_MODE", "rewind")
+
+        assert get_har_options_from_env() is None
+        assert "PW_HAR_MODE must be one of" in capsys.readouterr().err
+
+    def test_invalid_not_found_defaults_to_abort(self, monkeypatch, capsys):
+        """An unknown miss behavior falls back to abort."""
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        monkeypatch.setenv("PW_HAR_NOT_FOUND", "maybe")
+
+        assert get_har_options_from_env()["not_found"] == "abort"
+        assert "PW_HAR_NOT_FOUND must be one of" in capsys.readouterr().err
+
+
+class TestCreateContextHarMode:
+    """Tests for HAR handling in create_context()."""
+
+    def test_record_mode_updates_har(self, fake_browser, monkeypatch, tmp_path):
+        """Record mode routes through the HAR with update=True."""
+        har = tmp_path / "run.har"
+        monkeypatch.setenv("PW_HAR_MODE", "record")
+        monkeypatch.setenv("PW_HAR_PATH", str(har))
+
+        context = create_context(fake_browser)
+
+        assert context.har_routes == [(str(har), {"update": True})]
+
+    def test_record_mode_closes_contexts_before_browser(
+        self, fake_browser, monkeypatch, tmp_path
+    ):
+        """browser.close() first closes contexts so HARs are written."""
+        monkeypatch.setenv("PW_HAR_MODE", "record")
+        monkeypatch.setenv("PW_HAR_PATH", str(tmp_path / "run.har"))
+        create_context(fake_browser)
+        create_context(fake_browser)
+
+        fake_browser.close()
+
+        assert fake_browser.events == [
+            "context.close",
+            "context.close",
+            "browser.close",
+        ]
+
+    def test_contexts_get_numbered_har_files(self, fake_browser, monkeypatch, tmp_path):
+        """Later contexts in a run use numbered HAR files."""
+        monkeypatch.setenv("PW_HAR_MODE", "record")
+        monkeypatch.setenv("PW_HAR_PATH", str(tmp_path / "run.har"))
+        paths = [create_context(fake_browser).har_routes[0][0] for _ in range(3)]
+
+        assert [Path(path).name for path in paths] == [
+            "run.har",
+            "run-1.har",
+            "run-2.har",
+        ]
+
+    def test_replay_mode_serves_from_har(self, fake_browser, monkeypatch, tmp_path):
+        """Replay mode uses route_from_har with the configured miss behavior."""
+        har = tmp_path / "run.har"
+        har.write_text("{}")
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        monkeypatch.setenv("PW_HAR_PATH", str(har))
+
+        context = create_context(fake_browser)
+
+        assert context.har_routes == [(str(har), {"not_found": "abort"})]
+
+    def test_replay_missing_har_raises(self, fake_browser, monkeypatch, tmp_path):
+        """Replaying a HAR which was never recorded fails loudly."""
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        monkeypatch.setenv("PW_HAR_PATH", str(tmp_path / "missing.har"))
+
+        with pytest.raises(FileNotFoundError, match="record it first"):
+            create_context(fake_browser)
+
+    def test_replay_missing_har_with_fallback_uses_network(
+        self, fake_browser, monkeypatch, tmp_path
+    ):
+        """With fallback, a missing HAR only warns."""
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        monkeypatch.setenv("PW_HAR_PATH", str(tmp_path / "missing.har"))
+        monkeypatch.setenv("PW_HAR_NOT_FOUND", "fallback")
+
+        context = create_context(fake_browser)
+
+        assert context.har_routes == []
+
+
+class TestHarInBrowser:
+    """Tests for recording and replaying a HAR in Chromium."""
+
+    def test_record_then_replay(self, page, test_server_url, monkeypatch, tmp_path):
+        """A recorded response is served from the HAR; other requests abort."""
+        har = tmp_path / "api.har"
+        url = f"{test_server_url}/api/users"
+        browser = page.context.browser
+        monkeypatch.setenv("PW_HAR_MODE", "record")
+        monkeypatch.setenv("PW_HAR_PATH", str(har))
+        recording = create_context(browser)
+        recording.new_page().goto(url)
+        recording.close()
+
+        assert url in har.read_text()
+
+        # A new run starts numbering HAR files from the first again
+        monkeypatch.setattr(helpers, "_har_context_counter", iter(range(100)))
+        monkeypatch.setenv("PW_HAR_MODE", "replay")
+        replay = create_context(browser)
+        tab = replay.new_page()
+        tab.goto(url)
+
+        assert "John Doe" in tab.content()
+        with pytest.raises(PlaywrightError):
+            tab.goto(f"{test_server_url}/headers")
+        replay.close()
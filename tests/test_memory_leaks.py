@@ -0,0 +1,158 @@
+"""Tests for repeated-flow memory leak detection."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.memory_leaks import detect_leak, linear_trend
+
+MB = 1024 * 1024
+
+
+LEAKY_FLOW = """
+() => {
+  for (let i = 0; i < 5; i++) {
+    const row = document.createElement("div");
+    row.addEventListener("click", () => row.remove());
+    document.body.appendChild(row);
+  }
+}
+"""
+
+
+def sampled_page(page, samples):
+    """
+    Page whose Performance.getMetrics answers one (heap_bytes, nodes,
+    listeners) sample per call and whose heap snapshots are two chunks.
+    """
+    samples = iter(samples)
+
+    def get_metrics(session, params):
+        heap, nodes, listeners = next(samples)
+        return {
+            "metrics": [
+                {"name": "JSHeapUsedSize", "value": heap},
+                {"name": "Nodes", "value": nodes},
+                {"name": "JSEventListeners", "value": listeners},
+            ]
+        }
+
+    def take_heap_snapshot(session, params):
+        for chunk in ('{"snapshot":', "{}}"):
+            session.emit("HeapProfiler.addHeapSnapshotChunk", {"chunk": chunk})
+        return {}
+
+    page.context.cdp_responses.update(
+        {
+            "Performance.getMetrics": get_metrics,
+            "HeapProfiler.takeHeapSnapshot": take_heap_snapshot,
+        }
+    )
+    page.flows = 0
+    return page
+
+
+def flow(page):
+    page.flows += 1
+
+
+class TestLinearTrend:
+    """Tests for the growth trend fit."""
+
+    def test_slope_and_fit(self):
+        """A straight line has its slope and a perfect fit."""
+        assert linear_trend([10, 12, 14, 16]) == (2.0, 1.0)
+
+    def test_flat_series(self):
+        """A constant series has no slope and no trend."""
+        assert linear_trend([5, 5, 5]) == (0.0, 0.0)
+
+
+class TestDetectLeak:
+    """Tests for detect_leak()."""
+
+    def test_growing_listeners_flagged(self, fake_page, capsys):
+        """Listeners added on every iteration are a leak; the heap is not."""
+        page = sampled_page(fake_page, [(10 * MB, 500, 20 + 3 * i) for i in range(6)])
+
+        result = detect_leak(page, flow, iterations=6)
+
+        assert page.flows == 6
+        assert result["leaking"]
+        assert result["trends"]["listeners"]["slope"] == 3.0
+        assert not result["trends"]["heap_bytes"]["leaking"]
+        assert page.context.cdp.detached
+        assert "listeners" in capsys.readouterr().out.split("LEAKING")[0]
+
+    def test_noise_not_flagged(self, fake_page):
+        """Heap that moves up and down after GC is not a leak."""
+        heaps = [10.0, 10.4, 9.9, 10.3, 9.8, 10.2, 10.0, 10.1]
+        page = sampled_page(fake_page, [(heap * MB, 500, 20) for heap in heaps])
+
+        result = detect_leak(page, flow, iterations=8)
+
+        assert not result["leaking"]
+
+    def test_warmup_excluded(self, fake_page):
+        """Growth from caches filled on the first iteration is ignored."""
+        page = sampled_page(fake_page, [(5 * MB, 200, 10)] + [(10 * MB, 500, 20)] * 4)
+
+        result = detect_leak(page, flow, iterations=5, warmup=1)
+
+        assert not result["leaking"]
+        assert result["trends"]["nodes"]["first"] == 500
+
+    def test_gc_forced_before_sampling(self, fake_page):
+        """Every sample is taken right after a forced garbage collection."""
+        page = sampled_page(fake_page, [(10 * MB, 500, 20)] * 4)
+
+        detect_leak(page, flow, iterations=4)
+
+        sent = page.context.cdp.methods
+        assert sent.count("HeapProfiler.collectGarbage") == 4
+        assert sent.index("HeapProfiler.collectGarbage") < sent.index(
+            "Performance.getMetrics"
+        )
+
+    def test_snapshots_first_and_last_only(self, fake_page, tmp_path):
+        """Heap snapshots are written for the first measured and last iteration."""
+        page = sampled_page(fake_page, [(10 * MB, 500, 20)] * 6)
+
+        result = detect_leak(page, flow, iterations=6, snapshot_dir=str(tmp_path))
+
+        assert [Path(p).name for p in result["snapshots"]] == [
+            "iteration-2.heapsnapshot",
+            "iteration-6.heapsnapshot",
+        ]
+        assert Path(result["snapshots"][0]).read_text() == '{"snapshot":{}}'
+        cdp = page.context.cdp
+        assert cdp.methods.count("HeapProfiler.takeHeapSnapshot") == 2
+        assert cdp.handlers["HeapProfiler.addHeapSnapshotChunk"] == []
+
+    def test_too_few_iterations(self, fake_page):
+        """A trend needs at least three measured iterations."""
+        with pytest.raises(ValueError, match="at least 3"):
+            detect_leak(fake_page, flow, iterations=3, warmup=1)
+
+        assert fake_page.context.cdp_sessions == []
+
+
+class TestDetectLeakInBrowser:
+    """Tests for detect_leak() in Chromium."""
+
+    def test_growing_rows_flagged(self, page):
+        """Rows with listeners added on every iteration leak nodes and listeners."""
+        page.set_content("<body></body>")
+
+        result = detect_leak(page, lambda p: p.evaluate(LEAKY_FLOW), iterations=6)
+
+        assert result["leaking"]
+        assert result["trends"]["nodes"]["leaking"]
+        assert result["trends"]["listeners"]["leaking"]
+        assert result["trends"]["nodes"]["slope"] >= 5
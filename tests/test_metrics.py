@@ -0,0 +1,216 @@
+"""Tests for web performance metrics collection and aggregation."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import metrics
+from lib.metrics import (
+    aggregate_metrics,
+    collect_metrics,
+    measure_url,
+    observe_metrics,
+    percentile,
+    write_metrics_jsonl,
+)
+
+IN_PAGE = {
+    "navigation_type": "navigate",
+    "ttfb_ms": 12.5,
+    "fcp_ms": 80.0,
+    "lcp_ms": 120.0,
+    "cls": 0.0,
+    "transfer_bytes": 0,
+    "js_heap_used_bytes": None,
+}
+
+
+CDP_METRICS = {
+    "metrics": [
+        {"name": "JSHeapUsedSize", "value": 2_000_000},
+        {"name": "Nodes", "value": 42},
+    ]
+}
+
+
+def finish_loading(session, params):
+    # Document, cache hit and cross-origin script of the page about to load
+    for size in (5000, 0, 1200):
+        session.emit(
+            "Network.loadingFinished", {"requestId": "1", "encodedDataLength": size}
+        )
+
+
+@pytest.fixture
+def make_context(make_browser):
+    """
+    Factory for Chromium (or Firefox) contexts whose pages report IN_PAGE,
+    with a later LCP for each new page.
+    """
+
+    def make_context(chromium=True):
+        context = make_browser("chromium" if chromium else "firefox").new_context()
+        context.cdp_responses.update(
+            {"Performance.getMetrics": CDP_METRICS, "Network.enable": finish_loading}
+        )
+
+        def setup(page):
+            page.evaluate_result = lambda expression, arg: {
+                **IN_PAGE,
+                "lcp_ms": 120.0 + len(context.pages),
+            }
+
+        context.on("page", setup)
+        return context
+
+    return make_context
+
+
+class TestCollectMetrics:
+    """Tests for collect_metrics()."""
+
+    def test_adds_cdp_metrics_on_chromium(self, make_context):
+        """CDP metrics are added and the JS heap size is taken from them."""
+        context = make_context()
+        record = collect_metrics(context.new_page())
+
+        assert record["lcp_ms"] == 121.0
+        assert record["cdp"]["Nodes"] == 42
+        assert record["js_heap_used_bytes"] == 2_000_000
+        assert context.cdp.methods == ["Performance.enable", "Performance.getMetrics"]
+        assert context.cdp.detached
+
+    def test_other_browsers_without_cdp(self, make_context):
+        """Firefox and WebKit pages get the in-page metrics only."""
+        record = collect_metrics(make_context(chromium=False).new_page())
+
+        assert "cdp" not in record
+        assert record["js_heap_used_bytes"] is None
+        assert record["fcp_ms"] == 80.0
+
+    def test_recording(self, make_context):
+        """Records are kept between start_recording() and stop_recording()."""
+        context = make_context()
+        metrics.start_recording()
+        collect_metrics(context.new_page(), cdp=False)
+        collect_metrics(context.new_page(), cdp=False)
+
+        recorded = metrics.stop_recording()
+        collect_metrics(context.new_page(), cdp=False)
+        assert [record["lcp_ms"] for record in recorded] == [121.0, 122.0]
+        assert metrics.stop_recording() == []
+
+    def test_observe_metrics_adds_init_script(self, make_context):
+        """Observers are installed as an init script."""
+        page = make_context().new_page()
+        observe_metrics(page)
+
+        assert page.init_scripts == [metrics.OBSERVER_SCRIPT]
+
+
+class TestAggregation:
+    """Tests for percentiles and aggregation."""
+
+    def test_percentile_interpolates(self):
+        """Percentiles interpolate linearly between ranks."""
+        values = [10, 20, 30, 40, 50]
+
+        assert percentile(values, 50) == 30
+        assert percentile(values, 90) == pytest.approx(46)
+        assert percentile([], 50) is None
+
+    def test_aggregate_numeric_fields(self):
+        """Numbers (including nested CDP metrics) are aggregated; others skipped."""
+        records = [
+            {"lcp_ms": 100, "cls": 0.1, "url": "x", "cdp": {"Nodes": 10}},
+            {"lcp_ms": 300, "cls": 0.0, "url": "x", "cdp": {"Nodes": 30}},
+            {"lcp_ms": None, "cls": 0.2, "url": "x", "cdp": {"Nodes": 20}},
+        ]
+
+        summary = aggregate_metrics(records)
+
+        assert summary["lcp_ms"]["n"] == 2
+        assert summary["lcp_ms"]["p50"] == 200
+        assert summary["cdp.Nodes"]["max"] == 30
+        assert set(summary["cls"]) == {"n", "min", "mean", "max", "p50", "p90", "p99"}
+        assert "url" not in summary
+
+    def test_measure_url_runs_fresh_pages(self, make_context, tmp_path):
+        """Every run uses a new page and is appended to the JSONL file."""
+        context = make_context()
+        path = tmp_path / "metrics.jsonl"
+
+        result = measure_url(context, "http://app.test/", runs=3, jsonl_path=str(path))
+
+        assert len(context.pages) == 4
+        assert all(page.closed and page.init_scripts for page in context.pages)
+        assert result["summary"]["lcp_ms"]["min"] == 122.0
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["url"] for line in lines] == ["http://app.test/"] * 3
+
+    def test_measure_url_skips_cold_warmup_load(self, make_context):
+        """The first, cold load is not recorded unless warmup=0."""
+        metrics.start_recording()
+        warm = measure_url(make_context(), "http://app.test/", runs=2)
+        cold = measure_url(make_context(), "http://app.test/", runs=2, warmup=0)
+
+        assert [r["lcp_ms"] for r in warm["runs"]] == [122.0, 123.0]
+        assert [r["lcp_ms"] for r in cold["runs"]] == [121.0, 122.0]
+        assert len(metrics.stop_recording()) == 4
+
+    def test_measure_url_counts_transfer_bytes_with_cdp(self, make_context):
+        """On Chromium every response counts; elsewhere Resource Timing is used."""
+        chromium = measure_url(make_context(), "http://app.test/", runs=1)
+        firefox = measure_url(make_context(chromium=False), "http://app.test/", runs=1)
+
+        assert chromium["runs"][0]["transfer_bytes"] == 6200
+        assert chromium["runs"][0]["transfer_bytes_source"] == "cdp"
+        assert firefox["runs"][0]["transfer_bytes"] == 0
+        assert firefox["runs"][0]["transfer_bytes_source"] == "resource-timing"
+
+    def test_write_jsonl_appends(self, tmp_path):
+        """Each record is one JSON line and files are appended to."""
+        path = tmp_path / "out" / "metrics.jsonl"
+        write_metrics_jsonl(str(path), [{"a": 1}])
+        write_metrics_jsonl(str(path), [{"a": 2}, {"a": 3}])
+
+        assert [json.loads(line)["a"] for line in path.read_text().splitlines()] == [
+            1,
+            2,
+            3,
+        ]
+
+
+class TestCollectMetricsInBrowser:
+    """Tests for collect_metrics() in Chromium."""
+
+    def test_local_page(self, page, test_server_url):
+        """Navigation and paint timings are collected from a real page."""
+        observe_metrics(page)
+        page.goto(test_server_url)
+
+        record = collect_metrics(page)
+
+        assert record["navigation_type"] == "navigate"
+        assert 0 < record["ttfb_ms"] <= record["load_ms"]
+        assert record["requests"] >= 1
+        assert record["cdp"]["JSHeapUsedSize"] > 0
+
+    def test_cross_origin_transfer_bytes(self, page, test_server_url):
+        """CDP counts a cross-origin script which Resource Timing reports as 0 B."""
+        url = f"{test_server_url}/cross-origin"
+        page.goto(url)
+        in_page = collect_metrics(page, cdp=False)
+
+        [record] = measure_url(page.context, url, runs=1, warmup=0)["runs"]
+
+        assert in_page["transfer_bytes"] < 10_000
+        assert record["transfer_bytes"] > 10_000
+        assert record["transfer_bytes_source"] == "cdp"
@@ -0,0 +1,124 @@
+"""Tests for persistent-profile management used by launch_persistent_context()."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import (
+    acquire_profile_dir,
+    launch_browser,
+    launch_persistent_context,
+    prune_profiles,
+)
+
+
+@pytest.fixture(autouse=True)
+def profile_root(monkeypatch, tmp_path):
+    monkeypatch.setenv("PW_PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def make_stale(profile_dir, days):
+    old = time.time() - days * 86400
+    os.utime(profile_dir / ".last-used", (old, old))
+
+
+class TestAcquireProfileDir:
+    """Tests for per-origin profile locking."""
+
+    def test_profile_per_origin(self, profile_root):
+        """Profiles are named after browser type and origin."""
+        profile_dir, lock = acquire_profile_dir("chromium", "http://localhost:3000")
+        lock.close()
+
+        assert profile_dir == profile_root / "chromium-http-localhost-3000"
+        assert (profile_dir / ".last-used").exists()
+
+    def test_concurrent_runs_get_separate_profiles(self):
+        """A locked profile is never handed out twice."""
+        first, first_lock = acquire_profile_dir("chromium", "http://localhost:3000")
+        second, second_lock = acquire_profile_dir("chromium", "http://localhost:3000")
+
+        assert first != second
+        assert second.name.endswith("-1")
+        first_lock.close()
+        second_lock.close()
+
+    def test_released_profile_is_reused(self):
+        """Closing the lock file makes the warm profile available again."""
+        first, lock = acquire_profile_dir("chromium", "localhost:5173")
+        lock.close()
+        again, lock = acquire_profile_dir("chromium", "localhost:5173")
+        lock.close()
+
+        assert again == first
+
+    def test_all_slots_busy(self):
+        """Running out of slots raises instead of sharing a profile."""
+        _, lock = acquire_profile_dir("chromium", "http://app.test", max_slots=1)
+
+        with pytest.raises(RuntimeError, match="in use"):
+            acquire_profile_dir("chromium", "http://app.test", max_slots=1)
+        lock.close()
+
+
+class TestPruneProfiles:
+    """Tests for prune_profiles()."""
+
+    def test_prunes_only_stale_unlocked_profiles(self):
+        """Recent and locked profiles survive pruning."""
+        stale, lock = acquire_profile_dir("chromium", "http://stale.test")
+        lock.close()
+        make_stale(stale, days=30)
+        busy, busy_lock = acquire_profile_dir("chromium", "http://busy.test")
+        make_stale(busy, days=30)
+        recent, lock = acquire_profile_dir("chromium", "http://recent.test")
+        lock.close()
+
+        pruned = prune_profiles(max_age_days=7)
+
+        assert pruned == [str(stale)]
+        assert busy.exists() and recent.exists()
+        busy_lock.close()
+
+    def test_missing_root(self, monkeypatch, tmp_path):
+        """Pruning without any profiles is a no-op."""
+        monkeypatch.setenv("PW_PROFILE_DIR", str(tmp_path / "missing"))
+
+        assert prune_profiles() == []
+
+
+class TestLaunchBrowser:
+    """Tests for launching browsers and persistent contexts."""
+
+    def test_invalid_browser_type(self):
+        """Unknown browser types are rejected before starting Playwright."""
+        with pytest.raises(ValueError, match="Invalid browser type"):
+            launch_browser("netscape")
+
+    def test_persistent_context_invalid_browser_type(self):
+        """Unknown browser types are rejected before a profile is locked."""
+        with pytest.raises(ValueError, match="Invalid browser type"):
+            launch_persistent_context("netscape", "http://localhost:3000")
+
+    def test_persistent_context_releases_profile_on_close(
+        self, profile_root, test_server_url
+    ):
+        """The context keeps its profile across runs and unlocks it on close."""
+        context = launch_persistent_context("chromium", test_server_url)
+        page = context.pages[0] if context.pages else context.new_page()
+        page.goto(test_server_url)
+        context.close()
+
+        again, lock = acquire_profile_dir("chromium", test_server_url)
+
+        assert (again / "Default").exists()
+        lock.close()
@@ -0,0 +1,102 @@
+"""Tests for pipelined navigation with pipelined_pages()."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import pipelined_pages
+
+BROKEN = "http://app.test/broken"
+
+
+URLS = [f"http://app.test/{i}" for i in range(5)]
+
+
+@pytest.fixture
+def loading_context(fake_context, make_request):
+    """Context whose pages start navigating on evaluate() and log it."""
+    fake_context.log = []
+
+    def setup(page):
+        def navigate(expression, url):
+            page.url = url
+            fake_context.log.append(url)
+            if url == BROKEN:
+                request = make_request(
+                    url, page.main_frame, "net::ERR_CONNECTION_REFUSED"
+                )
+                page.events.emit("requestfailed", request)
+
+        page.evaluate_result = navigate
+
+    fake_context.on("page", setup)
+    return fake_context
+
+
+class TestPipelinedPages:
+    """Tests for pipelined_pages()."""
+
+    def test_yields_in_order(self, loading_context):
+        """Pages are yielded in URL order with the page showing that URL."""
+        results = [
+            (url, page.url) for url, page in pipelined_pages(loading_context, URLS)
+        ]
+
+        assert results == [(url, url) for url in URLS]
+
+    def test_next_urls_load_while_caller_works(self, loading_context):
+        """When the first page is handed out, the next ones are already loading."""
+        pipeline = pipelined_pages(loading_context, URLS, in_flight=3)
+
+        next(pipeline)
+
+        assert loading_context.log == URLS[:3]
+
+    def test_tab_count_bounded_and_pages_closed(self, loading_context):
+        """Only in_flight pages are opened and all are closed at the end."""
+        list(pipelined_pages(loading_context, URLS, in_flight=2))
+
+        assert len(loading_context.pages) == 2
+        assert all(page.closed for page in loading_context.pages)
+        for event in ("response", "requestfailed", "load"):
+            assert all(
+                not page.events.listeners(event) for page in loading_context.pages
+            )
+
+    def test_failed_urls_skipped(self, loading_context, capsys):
+        """A failed navigation is reported and the pipeline continues."""
+        urls = [URLS[0], BROKEN, URLS[1]]
+
+        yielded = [url for url, _ in pipelined_pages(loading_context, urls)]
+
+        assert yielded == [URLS[0], URLS[1]]
+        assert "ERR_CONNECTION_REFUSED" in capsys.readouterr().err
+
+
+class TestPipelinedPagesInBrowser:
+    """Tests for pipelined_pages() in Chromium."""
+
+    def test_loads_pages_in_order_and_skips_failures(
+        self, page, test_server_url, capsys
+    ):
+        """Real pages arrive in URL order and an unreachable port is skipped."""
+        urls = [
+            f"{test_server_url}/slow?n=1",
+            "http://127.0.0.1:1/",
+            f"{test_server_url}/login",
+            f"{test_server_url}/",
+        ]
+
+        seen = [
+            (url, tab.url)
+            for url, tab in pipelined_pages(page.context, urls, in_flight=2)
+        ]
+
+        assert seen == [(url, url) for url in (urls[0], urls[2], urls[3])]
+        assert "127.0.0.1:1" in capsys.readouterr().err
@@ -0,0 +1,114 @@
+"""Tests for the sampling profiler behind run.py --profile."""
+
+import selectors
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import greenlet
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import profiler
+
+RUN_PY = Path(__file__).parent.parent / "skills" / "playwright-py-skill" / "run.py"
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def wait_for_driver(seconds):
+    """Mimic a sync API call: switch to a loop greenlet idling in select()."""
+    caller = greenlet.getcurrent()
+
+    def dispatcher():
+        with selectors.DefaultSelector() as selector:
+            selector.select(seconds)
+        caller.switch()
+
+    greenlet.greenlet(dispatcher).switch()
+
+
+def read_stacks(path):
+    stacks = {}
+    for line in Path(path).read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        stacks[stack] = int(count)
+    return stacks
+
+
+class TestProfiler:
+    """Tests for sampling and categorization."""
+
+    def test_python_and_driver_wait_separated(self, tmp_path):
+        """Busy Python code and waits in the event loop land in separate roots."""
+        path = tmp_path / "profile.folded"
+        profiler.start(str(path), interval_ms=2)
+        busy(0.15)
+        wait_for_driver(0.15)
+        summary = profiler.stop()
+
+        assert summary["python_ms"] > 50
+        assert summary["driver_wait_ms"] > 50
+        stacks = read_stacks(path)
+        assert any(
+            stack.startswith("python;") and "busy (" in stack for stack in stacks
+        )
+        assert any(
+            stack.startswith("driver-wait;")
+            and stack.endswith(")")
+            and "wait_for_driver (" in stack
+            for stack in stacks
+        )
+        assert summary["hot_python"][0]["frame"].startswith("busy (")
+
+    def test_stop_without_start(self):
+        """stop() is a no-op when the profiler is not running."""
+        assert not profiler.enabled()
+        assert profiler.stop() is None
+
+
+@pytest.fixture
+def remove_temp_scripts():
+    before = set(RUN_PY.parent.glob(".temp-execution-*.py"))
+    yield
+    for path in set(RUN_PY.parent.glob(".temp-execution-*.py")) - before:
+        path.unlink()
+
+
+class TestProfileCommand:
+    """Tests for `run.py --profile`."""
+
+    def test_writes_collapsed_stacks(self, tmp_path, remove_temp_scripts):
+        """The executed script's frames are reported as script lines."""
+        script = tmp_path / "slow.py"
+        script.write_text(
+            "from playwright.sync_api import sync_playwright\n"
+            "import time\n"
+            "\n"
+            "def main():\n"
+            "    deadline = time.perf_counter() + 0.2\n"
+            "    while time.perf_counter() < deadline:\n"
+            "        pass\n"
+        )
+        path = tmp_path / "run.folded"
+
+        result = subprocess.run(
+            [sys.executable, str(RUN_PY), f"--profile={path}", str(script)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert "🔥 Profile:" in result.stdout
+        assert any("main (script:" in stack for stack in read_stacks(path))
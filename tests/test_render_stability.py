@@ -0,0 +1,127 @@
+"""Tests for the render-stability wait used by take_screenshot()."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import get_render_report, take_screenshot, wait_for_render_stable
+
+
+ANIMATED_PAGE = """
+<div id="box" style="width: 200px; height: 200px; background: red"></div>
+<script>
+  let step = 0;
+  setInterval(() => {
+    document.getElementById("box").style.marginLeft = (step++ % 50) * 8 + "px";
+  }, 30);
+</script>
+"""
+
+
+@pytest.fixture
+def probe_page(fake_page):
+    """Firefox-like page: no CDP, probe frames come from page.screenshot()."""
+    fake_page.context.chromium = False
+    fake_page.evaluate_result = True  # fonts and images are ready
+    return fake_page
+
+
+class TestWaitForRenderStable:
+    """Tests for wait_for_render_stable()."""
+
+    def test_static_page_settles_immediately(self, probe_page):
+        """Identical frames settle after the minimum number of probes."""
+        report = wait_for_render_stable(probe_page, stable_frames=3)
+
+        assert report["stable"] is True
+        assert report["assets_ready"] is True
+        assert report["frames"] == 3
+        assert probe_page.waits == [100, 100]
+
+    def test_animation_settles_when_frames_stop_changing(self, probe_page):
+        """Frames that change reset the stability counter."""
+        probe_page.frames = [b"a", b"b", b"c", b"d", b"d"]
+
+        report = wait_for_render_stable(probe_page, stable_frames=2)
+
+        assert report["stable"] is True
+        assert report["frames"] == 5
+
+    def test_gives_up_after_timeout(self, probe_page):
+        """A page that never settles is reported as unstable."""
+        probe_page.frames = [str(i).encode() for i in range(1000)]
+
+        report = wait_for_render_stable(probe_page, timeout=0, stable_frames=2)
+
+        assert report["stable"] is False
+        assert report["frames"] == 1
+        assert probe_page.waits == []
+
+    def test_chromium_probes_with_cdp(self, fake_page):
+        """On Chromium, downscaled frames come from CDP instead of screenshots."""
+        fake_page.context.cdp_responses["Page.captureScreenshot"] = {"data": "frame"}
+
+        report = wait_for_render_stable(fake_page, stable_frames=2)
+
+        cdp = fake_page.context.cdp
+        assert report["stable"] is True
+        assert cdp.methods == ["Page.captureScreenshot"] * 2
+        assert cdp.sent[0][1]["clip"]["scale"] == 0.25
+        assert cdp.detached
+        assert fake_page.probe_count == 0
+
+
+class TestTakeScreenshotStability:
+    """Tests for the wait_for_stable option of take_screenshot()."""
+
+    def test_wait_for_stable_reports_and_captures(self, probe_page, tmp_path, capsys):
+        """The stability report is printed and options are not leaked."""
+        filename = take_screenshot(
+            probe_page, str(tmp_path / "shot"), wait_for_stable=True, full_page=False
+        )
+
+        assert filename.endswith(".png")
+        assert probe_page.screenshots == [{"path": filename, "full_page": False}]
+        assert probe_page.probe_count == 3
+        assert "Render stable after" in capsys.readouterr().out
+        report = get_render_report(probe_page)
+        assert report["screenshot"] == filename
+        assert (report["stable"], report["frames"]) == (True, 3)
+
+    def test_without_stability_wait_no_probes(self, probe_page, tmp_path):
+        """The default path captures immediately without probe frames."""
+        take_screenshot(probe_page, str(tmp_path / "shot"))
+
+        assert probe_page.probe_count == 0
+        assert get_render_report(probe_page) is None
+        assert probe_page.screenshots[0]["full_page"] is True
+
+
+class TestRenderStabilityInBrowser:
+    """Tests for wait_for_render_stable() in Chromium."""
+
+    def test_static_page_is_stable(self, page, test_server_url):
+        """A loaded page without animations settles within the timeout."""
+        page.goto(test_server_url)
+
+        report = wait_for_render_stable(page)
+
+        assert report["stable"] is True
+        assert report["assets_ready"] is True
+        assert report["frames"] >= 3
+
+    def test_running_animation_is_not_stable(self, page):
+        """A box moving every 30 ms never gives two matching frames."""
+        page.set_content(ANIMATED_PAGE)
+
+        report = wait_for_render_stable(page, timeout=800)
+
+        assert report["stable"] is False
+        assert report["frames"] > 3
+        assert report["elapsed_ms"] >= 700
@@ -0,0 +1,112 @@
+"""Tests for in-browser resource blocking profiles in create_context()."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import (
+    BLOCKING_PROFILES,
+    create_context,
+    get_blocking_stats,
+)
+
+
+class TestChromiumBlocking:
+    """Tests for CDP Network.setBlockedURLs based blocking."""
+
+    def test_profiles_sent_to_every_new_page(self, fake_browser):
+        """Each page gets the expanded patterns through its own CDP session."""
+        context = create_context(fake_browser, block_resources=["fonts", "*.pdf"])
+        context.new_page()
+        context.new_page()
+
+        assert "block_resources" not in fake_browser.context_options
+        assert context.routes == []
+        assert len(context.cdp_sessions) == 2
+        for session in context.cdp_sessions:
+            blocked = dict(session.sent)["Network.setBlockedURLs"]["urls"]
+            assert blocked == BLOCKING_PROFILES["fonts"] + ["*.pdf"]
+
+    def test_blocked_requests_counted_per_profile(self, fake_browser):
+        """loadingFailed events with blockedReason=inspector are counted."""
+        context = create_context(fake_browser, block_resources=["images", "trackers"])
+        context.new_page()
+        cdp = context.cdp
+
+        requests = {
+            "1": "https://app.test/logo.png?v=2",
+            "2": "https://www.google-analytics.com/analytics.js",
+            "3": "https://app.test/app.js",
+        }
+        for request_id, url in requests.items():
+            cdp.emit(
+                "Network.requestWillBeSent",
+                {"requestId": request_id, "request": {"url": url}},
+            )
+        cdp.emit(
+            "Network.loadingFailed", {"requestId": "1", "blockedReason": "inspector"}
+        )
+        cdp.emit(
+            "Network.loadingFailed", {"requestId": "2", "blockedReason": "inspector"}
+        )
+        cdp.emit(
+            "Network.loadingFinished", {"requestId": "3", "encodedDataLength": 1234}
+        )
+
+        stats = get_blocking_stats(context)
+        assert stats["mode"] == "cdp"
+        assert stats["blocked_requests"] == 2
+        assert stats["by_profile"] == {"images": 1, "trackers": 1}
+        assert stats["transferred_bytes"] == 1234
+
+    def test_no_blocking_by_default(self, fake_browser):
+        """Without block_resources nothing is attached."""
+        context = create_context(fake_browser)
+        context.new_page()
+
+        assert context.cdp_sessions == []
+        assert get_blocking_stats(context) is None
+
+
+class TestRouteFallback:
+    """Tests for the context.route() fallback on non-Chromium browsers."""
+
+    def test_single_route_aborts_matching_requests(self, fake_browser, make_route):
+        """One combined regex route is registered and counts aborts."""
+        fake_browser.browser_type.name = "firefox"
+        context = create_context(fake_browser, block_resources=["media"])
+
+        assert len(context.routes) == 1
+        pattern, handler = context.routes[0]
+        assert pattern.match("https://cdn.test/intro.mp4")
+        assert not pattern.match("https://cdn.test/intro.html")
+
+        route = make_route("https://cdn.test/intro.mp4")
+        handler(route)
+
+        assert route.aborted == "blockedbyclient"
+        assert get_blocking_stats(context)["by_profile"] == {"media": 1}
+        assert context.cdp_sessions == []
+
+
+class TestBlockingInBrowser:
+    """Tests for resource blocking in Chromium."""
+
+    def test_blocked_script_never_loads(self, page, test_server_url):
+        """A request matching a custom glob fails in the browser and is counted."""
+        context = create_context(page.context.browser, block_resources=["*/asset.js"])
+        tab = context.new_page()
+        failed = []
+        tab.on("requestfailed", lambda request: failed.append(request.url))
+
+        tab.goto(f"{test_server_url}/cross-origin")
+
+        assert [url.rsplit("/", 1)[1] for url in failed] == ["asset.js"]
+        stats = get_blocking_stats(context)
+        assert stats["mode"] == "cdp"
+        assert stats["blocked_requests"] == 1
+        context.close()
@@ -0,0 +1,218 @@
+"""Tests for the shared content-addressed response cache."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.response_cache import (
+    STATIC_ASSET_PATTERN,
+    ResponseCache,
+    freshness_lifetime,
+)
+
+BUNDLE_URL = "https://app.test/assets/app.3f2a.js"
+CACHEABLE = {"cache-control": "public, max-age=3600", "content-type": "text/javascript"}
+
+
+class TestFreshnessLifetime:
+    """Tests for HTTP freshness rules."""
+
+    def test_max_age_minus_age(self):
+        """The Age header is subtracted from max-age."""
+        assert freshness_lifetime({"cache-control": "max-age=60", "age": "20"}, 0) == 40
+
+    def test_no_store_and_private_not_cacheable(self):
+        """no-store and private responses are never stored."""
+        assert freshness_lifetime({"cache-control": "no-store"}, 0) is None
+        assert freshness_lifetime({"cache-control": "private, max-age=60"}, 0) is None
+
+    def test_vary_star_not_cacheable(self):
+        """Vary: * responses cannot be matched and are not stored."""
+        assert (
+            freshness_lifetime({"cache-control": "max-age=60", "vary": "*"}, 0) is None
+        )
+
+    def test_no_cache_stored_but_always_stale(self):
+        """no-cache responses are kept for revalidation, whatever their max-age."""
+        headers = {"cache-control": "no-cache, max-age=3600", "etag": '"abc"'}
+
+        assert freshness_lifetime(headers, 0) == 0
+
+    def test_malformed_age_ignored(self):
+        """An unparseable Age header counts as 0 instead of raising."""
+        headers = {"cache-control": "max-age=60", "age": "soon"}
+
+        assert freshness_lifetime(headers, 0) == 60
+
+    def test_no_explicit_freshness_not_cached(self):
+        """Responses without explicit freshness are not stored."""
+        assert freshness_lifetime({"etag": '"abc"'}, 0) is None
+
+
+class TestResponseCache:
+    """Tests for storage, Vary handling and eviction."""
+
+    def test_store_and_lookup(self, tmp_path):
+        """Stored entries are served until they expire."""
+        cache = ResponseCache(str(tmp_path))
+        assert cache.store(BUNDLE_URL, {}, 200, CACHEABLE, b"bundle", now=0)
+
+        entry = cache.lookup(BUNDLE_URL, {}, now=10)
+
+        assert entry["body"] == b"bundle"
+        assert entry["fresh"] is True
+        assert cache.lookup(BUNDLE_URL, {}, now=4000)["fresh"] is False
+
+    def test_vary_headers_select_variant(self, tmp_path):
+        """Vary headers are part of the cache key."""
+        cache = ResponseCache(str(tmp_path))
+        headers = {**CACHEABLE, "Vary": "Accept-Encoding"}
+        cache.store(BUNDLE_URL, {"accept-encoding": "br"}, 200, headers, b"br", now=0)
+
+        assert (
+            cache.lookup(BUNDLE_URL, {"accept-encoding": "br"}, now=1)["body"] == b"br"
+        )
+        assert cache.lookup(BUNDLE_URL, {"accept-encoding": "gzip"}, now=1) is None
+
+    def test_identical_bodies_stored_once(self, tmp_path):
+        """Bodies are content-addressed and deduplicated."""
+        cache = ResponseCache(str(tmp_path))
+        cache.store(BUNDLE_URL, {}, 200, CACHEABLE, b"same", now=0)
+        cache.store(BUNDLE_URL + "?v=2", {}, 200, CACHEABLE, b"same", now=0)
+
+        blobs = [p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]
+        assert len(blobs) == 1
+        assert cache.report()["entries"] == 2
+        assert cache.size() == 4
+
+    def test_shared_between_instances(self, tmp_path):
+        """A second process (instance) sees entries of the first."""
+        ResponseCache(str(tmp_path)).store(BUNDLE_URL, {}, 200, CACHEABLE, b"x", now=0)
+
+        assert (
+            ResponseCache(str(tmp_path)).lookup(BUNDLE_URL, {}, now=1)["body"] == b"x"
+        )
+
+    def test_lru_eviction(self, tmp_path):
+        """Least recently used entries are evicted above max_bytes."""
+        cache = ResponseCache(str(tmp_path), max_bytes=10)
+        cache.store("https://app.test/a.js", {}, 200, CACHEABLE, b"aaaa", now=0)
+        cache.store("https://app.test/b.js", {}, 200, CACHEABLE, b"bbbb", now=1)
+        cache.lookup("https://app.test/a.js", {}, now=2)  # a is now most recent
+        cache.store("https://app.test/c.js", {}, 200, CACHEABLE, b"cccc", now=3)
+
+        assert cache.lookup("https://app.test/b.js", {}, now=4) is None
+        assert cache.lookup("https://app.test/a.js", {}, now=4) is not None
+        assert cache.size() <= 10
+        assert cache.stats["evicted"] == 1
+
+    def test_encoding_headers_not_replayed(self, tmp_path):
+        """Encoding headers of the decoded body are dropped."""
+        cache = ResponseCache(str(tmp_path))
+        headers = {**CACHEABLE, "Content-Encoding": "gzip", "Content-Length": "3"}
+        cache.store(BUNDLE_URL, {}, 200, headers, b"decoded", now=0)
+
+        stored = cache.lookup(BUNDLE_URL, {}, now=1)["headers"]
+
+        assert "content-encoding" not in stored
+        assert "content-length" not in stored
+
+    def test_shared_between_threads(self, tmp_path):
+        """Browsers on their own threads can use one cache instance."""
+        cache = ResponseCache(str(tmp_path))
+
+        def use_cache(thread):
+            for n in range(20):
+                url = f"https://app.test/{thread}-{n}.js"
+                cache.store(url, {}, 200, CACHEABLE, url.encode(), now=0)
+                assert cache.lookup(url, {}, now=1)["body"] == url.encode()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for future in [executor.submit(use_cache, t) for t in range(4)]:
+                future.result()
+
+        assert cache.report()["entries"] == 80
+        assert cache.stats["stored"] == 80
+
+
+class TestHandleRoute:
+    """Tests for the route handler statistics and revalidation."""
+
+    def test_miss_then_hit(self, make_route, make_response, tmp_path):
+        """A miss stores the response and the next request hits."""
+        cache = ResponseCache(str(tmp_path))
+        miss = make_route(BUNDLE_URL, make_response(200, CACHEABLE, b"js"))
+        cache.handle_route(miss)
+        hit = make_route(BUNDLE_URL)
+        cache.handle_route(hit)
+
+        assert miss.fulfilled["body"] == b"js"
+        assert hit.fetched_headers is None
+        assert hit.fulfilled["body"] == b"js"
+        report = cache.report()
+        assert (report["hits"], report["misses"]) == (1, 1)
+        assert report["hit_rate"] == 0.5
+
+    def test_stale_entry_revalidated_with_etag(
+        self, make_route, make_response, tmp_path
+    ):
+        """Stale entries are revalidated with If-None-Match."""
+        cache = ResponseCache(str(tmp_path))
+        headers = {"cache-control": "max-age=0", "etag": '"v1"'}
+        cache.store(BUNDLE_URL, {}, 200, headers, b"js", now=0)
+
+        route = make_route(BUNDLE_URL, make_response(304, headers))
+        cache.handle_route(route)
+
+        assert route.fetched_headers["if-none-match"] == '"v1"'
+        assert route.fulfilled["body"] == b"js"
+        assert cache.stats["revalidated"] == 1
+
+    def test_no_cache_revalidated_on_every_use(
+        self, make_route, make_response, tmp_path
+    ):
+        """A no-cache response is stored but never served without a 304."""
+        cache = ResponseCache(str(tmp_path))
+        headers = {"cache-control": "no-cache, max-age=3600", "etag": '"v1"'}
+        miss = make_route(BUNDLE_URL, make_response(200, headers, b"js"))
+        cache.handle_route(miss)
+
+        route = make_route(BUNDLE_URL, make_response(304, headers))
+        cache.handle_route(route)
+
+        assert cache.stats["stored"] == 1
+        assert route.fetched_headers["if-none-match"] == '"v1"'
+        assert route.fulfilled["body"] == b"js"
+        assert (cache.stats["hits"], cache.stats["revalidated"]) == (0, 1)
+
+    def test_malformed_age_still_fulfilled(self, make_route, make_response, tmp_path):
+        """A bad Age header does not escape the handler and stall the request."""
+        cache = ResponseCache(str(tmp_path))
+        headers = {**CACHEABLE, "age": "n/a"}
+        route = make_route(BUNDLE_URL, make_response(200, headers, b"js"))
+
+        cache.handle_route(route)
+
+        assert route.fulfilled["body"] == b"js"
+        assert cache.stats["stored"] == 1
+
+    def test_non_get_falls_back(self, make_route, make_request, tmp_path):
+        """Non-GET requests bypass the cache."""
+        cache = ResponseCache(str(tmp_path))
+        route = make_route(make_request(BUNDLE_URL, method="POST"))
+
+        cache.handle_route(route)
+
+        assert route.fell_back
+
+    def test_static_asset_pattern(self):
+        """Only static asset URLs are routed through the cache."""
+        assert STATIC_ASSET_PATTERN.match("https://app.test/main.css?v=1")
+        assert STATIC_ASSET_PATTERN.match("http://localhost:5173/fonts/a.woff2")
+        assert not STATIC_ASSET_PATTERN.match("https://app.test/api/users")
+        assert not STATIC_ASSET_PATTERN.match("https://app.test/page?file=x.js")
@@ -0,0 +1,171 @@
+"""Tests for protocol call and sleep accounting behind run.py --rpc-stats."""
+
+import asyncio
+import contextvars
+import sys
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from playwright._impl._connection import Connection
+
+from lib import rpc_stats
+
+
+class FakeCallback:
+    def __init__(self):
+        self.future = Future()
+
+
+class FakeChannelOwner:
+    def __init__(self, type_):
+        self._type = type_
+        self._guid = f"{type_.lower()}@1"
+
+
+class FakeConnection:
+    def __init__(self):
+        self._api_zone = contextvars.ContextVar("zone", default=None)
+        self.sent = []
+
+
+def fake_send(self, object, method, params, no_reply=False):
+    self.sent.append(method)
+    return FakeCallback()
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    monkeypatch.setattr(Connection, "_send_message_to_server", fake_send)
+    rpc_stats.install()
+    yield rpc_stats
+    rpc_stats.uninstall()
+
+
+def send(connection, type_, method, file="/work/app.py", line=12):
+    connection._api_zone.set(
+        {"apiName": "Locator.get_attribute", "frames": [{"file": file, "line": line}]}
+    )
+    return Connection._send_message_to_server(
+        connection, FakeChannelOwner(type_), method, {}
+    )
+
+
+class TestProtocolCalls:
+    """Tests for counting round-trips."""
+
+    def test_counted_by_method_and_site_when_answered(self, stats):
+        """Calls are recorded with their duration once the reply arrives."""
+        connection = FakeConnection()
+        callbacks = [send(connection, "Frame", "getAttribute") for _ in range(3)]
+
+        assert connection.sent == ["getAttribute"] * 3
+        assert stats.summary()["calls"] == 0
+        for callback in callbacks:
+            callback.future.set_result(None)
+
+        summary = stats.summary()
+        assert summary["by_method"]["Frame.getAttribute"]["calls"] == 3
+        assert summary["by_site"] == {"app.py:12 (Locator.get_attribute)": 3}
+
+    def test_wait_for_timeout_not_counted_as_driver_time(self, stats):
+        """waitForTimeout is counted but its duration belongs to the sleeps."""
+        send(FakeConnection(), "Frame", "waitForTimeout")
+
+        summary = stats.summary()
+        assert summary["by_method"]["Frame.waitForTimeout"] == {"calls": 1, "ms": 0}
+
+    def test_connection_without_api_zone(self, stats):
+        """Without the call-site context variable calls are still counted."""
+        connection = FakeConnection()
+        del connection._api_zone
+
+        Connection._send_message_to_server(
+            connection, FakeChannelOwner("Page"), "goto", {}, True
+        )
+
+        assert stats.summary()["by_site"] == {"<internal>": 1}
+
+    def test_temp_script_shown_as_script(self):
+        """Locations in run.py's temp file are reported as script lines."""
+        location = rpc_stats._location("/skill/.temp-execution-1.5.py", 7, "main")
+
+        assert location == "script:7 (main)"
+
+
+class TestSleeps:
+    """Tests for timing explicit sleeps."""
+
+    def test_time_sleep_attributed_to_caller(self, stats):
+        """time.sleep() is timed per calling line and function."""
+        time.sleep(0.01)
+
+        ((site, entry),) = stats.summary()["sleeps_by_site"].items()
+        assert "test_rpc_stats.py:" in site
+        assert site.endswith("(test_time_sleep_attributed_to_caller)")
+        assert entry["calls"] == 1
+        assert entry["ms"] >= 10
+
+    def test_asyncio_sleep_zero_ignored(self, stats):
+        """asyncio.sleep(0) yields to the loop and is not a sleep."""
+
+        async def flow():
+            await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+
+        asyncio.run(flow())
+
+        summary = stats.summary()
+        assert summary["sleeps"] == 1
+        assert "(flow)" in next(iter(summary["sleeps_by_site"]))
+
+    def test_uninstall_restores_originals(self, stats):
+        """Patched functions are restored and stats are kept."""
+        time.sleep(0)
+        stats.uninstall()
+
+        assert Connection._send_message_to_server is fake_send
+        assert not hasattr(time.sleep, "__wrapped__")
+        assert stats.summary()["sleeps"] == 1
+
+
+class TestPlaywrightUpgrade:
+    """Tests for Playwright versions without the private connection hooks."""
+
+    def test_missing_hook_times_sleeps_only(self, monkeypatch, capsys):
+        """Protocol calls are skipped with a warning; sleeps are still timed."""
+        monkeypatch.delattr(Connection, "_send_message_to_server")
+        rpc_stats.install()
+        try:
+            time.sleep(0.01)
+        finally:
+            rpc_stats.uninstall()
+
+        summary = rpc_stats.summary()
+        assert "timing sleeps only" in capsys.readouterr().err
+        assert not hasattr(Connection, "_send_message_to_server")
+        assert (summary["calls"], summary["sleeps"]) == (0, 1)
+
+
+class TestReport:
+    """Tests for the top-N report."""
+
+    def test_top_n(self, stats):
+        """Only the top N methods and sites are listed."""
+        connection = FakeConnection()
+        for i, method in enumerate(["click", "click", "fill", "textContent"]):
+            send(connection, "Frame", method, line=i).future.set_result(None)
+
+        report = stats.report(top=1)
+
+        assert "4 Playwright protocol calls" in report
+        assert "Frame.click" in report
+        assert "Frame.fill" not in report
+        assert report.count("app.py:") == 1
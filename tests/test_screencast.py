@@ -0,0 +1,161 @@
+"""Tests for the CDP screencast ring buffer recorder."""
+
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import screencast
+from lib.screencast import ScreencastRecorder, save_active_screencasts
+
+
+ANIMATED_PAGE = """
+<div id="box" style="width: 200px; height: 200px; background: red"></div>
+<script>
+  let step = 0;
+  setInterval(() => {
+    document.getElementById("box").style.marginLeft = (step++ % 50) * 8 + "px";
+  }, 30);
+</script>
+"""
+
+
+def emit_frame(cdp, timestamp, data=b"jpeg"):
+    cdp.emit(
+        "Page.screencastFrame",
+        {
+            "data": base64.b64encode(data).decode(),
+            "sessionId": int(timestamp * 1000),
+            "metadata": {"timestamp": timestamp},
+        },
+    )
+
+
+def started_recorder(context, **options):
+    recorder = ScreencastRecorder(context.new_page(), **options).start()
+    return recorder, context.cdp
+
+
+class TestScreencastRecorder:
+    """Tests for ScreencastRecorder buffering."""
+
+    def test_start_subscribes_and_acks_frames(self, fake_context):
+        """Every frame is acknowledged so Chromium keeps sending them."""
+        recorder, cdp = started_recorder(fake_context)
+        emit_frame(cdp, 1.0)
+
+        assert cdp.methods == ["Page.startScreencast", "Page.screencastFrameAck"]
+        recorder.stop()
+        assert cdp.detached
+
+    def test_buffer_keeps_only_recent_seconds(self, fake_context):
+        """Frames older than the window are dropped."""
+        recorder, cdp = started_recorder(fake_context, seconds=2, max_fps=10)
+        for i in range(50):
+            emit_frame(cdp, i * 0.1)
+        recorder.stop()
+
+        timestamps = [timestamp for timestamp, _ in recorder.frames]
+        assert len(recorder) <= 20
+        assert timestamps[-1] - timestamps[0] <= 2
+
+    def test_frames_above_max_fps_are_skipped(self, fake_context):
+        """Frames arriving faster than max_fps are acked but not buffered."""
+        recorder, cdp = started_recorder(fake_context, seconds=10, max_fps=4)
+        for i in range(10):
+            emit_frame(cdp, i * 0.1)
+        recorder.stop()
+
+        assert len(recorder) == 4
+        assert cdp.methods.count("Page.screencastFrameAck") == 10
+
+    def test_frames_after_stop_are_ignored(self, fake_context):
+        """A frame still in flight when stop() detaches is neither acked nor kept."""
+        recorder, cdp = started_recorder(fake_context)
+        recorder.stop()
+        cdp.sent.clear()
+        emit_frame(cdp, 1.0)
+
+        assert cdp.sent == []
+        assert len(recorder) == 0
+
+    def test_save_without_ffmpeg_writes_frames(
+        self, fake_context, tmp_path, monkeypatch
+    ):
+        """Without ffmpeg the buffer is written as numbered JPEG files."""
+        monkeypatch.setattr(screencast.shutil, "which", lambda name: None)
+        recorder, cdp = started_recorder(fake_context)
+        emit_frame(cdp, 1.0, b"first")
+        emit_frame(cdp, 2.0, b"second")
+        recorder.stop()
+
+        saved = Path(recorder.save(str(tmp_path / "failure")))
+
+        assert sorted(p.read_bytes() for p in saved.iterdir()) == [
+            b"first",
+            b"second",
+        ]
+
+    def test_save_empty_buffer_returns_none(self, fake_page, tmp_path):
+        """Nothing is written when no frames were captured."""
+        recorder = ScreencastRecorder(fake_page)
+
+        assert recorder.save(str(tmp_path / "empty")) is None
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestSaveActiveScreencasts:
+    """Tests for flushing running recorders on failure."""
+
+    def test_flushes_running_recorders_only(self, fake_context, tmp_path, monkeypatch):
+        """Running recorders are stopped and saved, stopped ones are skipped."""
+        monkeypatch.setattr(screencast.shutil, "which", lambda name: None)
+        running, running_cdp = started_recorder(fake_context, name="running")
+        stopped, stopped_cdp = started_recorder(fake_context, name="stopped")
+        emit_frame(running_cdp, 1.0)
+        emit_frame(stopped_cdp, 1.0)
+        stopped.stop()
+
+        saved = save_active_screencasts(str(tmp_path))
+
+        assert len(saved) == 1
+        assert Path(saved[0]).name.startswith("running-")
+        assert running_cdp.detached
+
+    def test_context_manager_saves_on_exception(self, fake_page, tmp_path, monkeypatch):
+        """An exception inside the with block saves the buffer."""
+        monkeypatch.setattr(screencast.shutil, "which", lambda name: None)
+        monkeypatch.setenv("PW_SCREENCAST_DIR", str(tmp_path))
+
+        with pytest.raises(RuntimeError):
+            with ScreencastRecorder(fake_page, name="flow"):
+                emit_frame(fake_page.context.cdp, 1.0)
+                raise RuntimeError("boom")
+
+        [saved] = tmp_path.iterdir()
+        assert saved.name.startswith("flow-")
+        assert [p.read_bytes() for p in saved.iterdir()] == [b"jpeg"]
+
+
+class TestScreencastInBrowser:
+    """Tests for ScreencastRecorder in Chromium."""
+
+    def test_records_jpeg_frames_of_animation(self, page, tmp_path, monkeypatch):
+        """A repainting page produces JPEG frames, capped by seconds and max_fps."""
+        monkeypatch.setattr(screencast.shutil, "which", lambda name: None)
+        page.set_content(ANIMATED_PAGE)
+
+        with ScreencastRecorder(page, seconds=1, max_fps=5) as recorder:
+            page.wait_for_timeout(1500)
+
+        assert 2 <= len(recorder) <= 5
+        saved = Path(recorder.save(str(tmp_path / "animation")))
+        frames = sorted(saved.iterdir())
+        assert len(frames) == len(recorder)
+        assert frames[0].read_bytes().startswith(b"\xff\xd8")
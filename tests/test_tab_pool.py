@@ -0,0 +1,109 @@
+"""Tests for reusing pages of one context with TabPool."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import TabPool
+
+
+class TestTabPool:
+    """Tests for TabPool."""
+
+    def test_pages_are_reused(self, fake_context):
+        """A released page is handed out again instead of opening a new one."""
+        pool = TabPool(fake_context, size=2)
+
+        with pool.page() as first:
+            pass
+        with pool.page() as second:
+            pass
+
+        assert first is second
+        assert len(fake_context.pages) == 1
+        assert (pool.created, pool.reused) == (1, 1)
+
+    def test_size_is_bounded(self, fake_context):
+        """Checking out more than size pages raises."""
+        pool = TabPool(fake_context, size=2)
+        pool.acquire()
+        pool.acquire()
+
+        with pytest.raises(RuntimeError, match="All 2 tabs"):
+            pool.acquire()
+
+    def test_release_resets_page(self, fake_context):
+        """Listeners, routes and the URL of a task do not leak to the next."""
+        pool = TabPool(
+            fake_context, viewport={"width": 800, "height": 600}, timeout=5000
+        )
+
+        with pool.page() as page:
+            page.on("console", print)
+            page.on("close", print)
+            page.once("load", print)
+            page.once("dialog", print)
+            page.events.emit("dialog", "a once() listener which already ran")
+            page.route("**/*", print)
+            page.goto("http://app.test/admin")
+            page.set_viewport_size({"width": 320, "height": 480})
+            page.set_default_timeout(1)
+
+        assert page.url == "about:blank"
+        assert page.routes == []
+        assert page.events.listeners("console") == []
+        assert page.events.listeners("load") == []
+        assert len(page.events.listeners("close")) == 1
+        assert page.viewport_size == {"width": 800, "height": 600}
+        assert page.timeout == 5000
+
+    def test_closed_pages_are_dropped(self, fake_context):
+        """A page closed by the task is replaced by a new one."""
+        pool = TabPool(fake_context)
+
+        with pool.page() as page:
+            page.close()
+        with pool.page() as page:
+            assert not page.closed
+
+        assert len(fake_context.pages) == 2
+
+    def test_close_closes_all_pages(self, fake_context):
+        """Leaving the pool's with block closes idle and busy pages."""
+        with TabPool(fake_context) as pool:
+            pool.acquire()
+            with pool.page():
+                pass
+
+        assert all(page.closed for page in fake_context.pages)
+
+
+class TestTabPoolInBrowser:
+    """Tests for TabPool in Chromium."""
+
+    def test_real_page_listeners_removed(self, page, test_server_url):
+        """Listeners and routes of a task are gone once a real page is reused."""
+        messages = []
+        pool = TabPool(page.context, size=1)
+
+        with pool.page() as tab:
+            tab.on("console", lambda message: messages.append(message.text))
+            tab.route("**/api/users", lambda route: route.abort())
+            tab.goto(test_server_url)
+            tab.evaluate("console.log('first task')")
+        with pool.page() as reused:
+            reused.goto(test_server_url)
+            reused.evaluate("console.log('second task')")
+            status = reused.evaluate("fetch('/api/users').then((r) => r.status)")
+
+        assert reused is tab
+        assert reused.url == f"{test_server_url}/"
+        assert messages == ["first task"]
+        assert status == 200
+        pool.close()
@@ -0,0 +1,107 @@
+"""Tests for CPU and network throttling profiles in create_context()."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.helpers import create_context, get_throttling
+from lib.metrics import collect_metrics
+
+
+class TestThrottlingProfiles:
+    """Tests for applying named profiles through CDP."""
+
+    def test_network_and_cpu_profiles_on_every_page(self, fake_browser):
+        """Each page gets network conditions and the CPU rate."""
+        context = create_context(fake_browser, throttling=["slow-4g", "4x-cpu"])
+        context.new_page()
+        context.new_page()
+
+        assert "throttling" not in fake_browser.context_options
+        assert len(context.cdp_sessions) == 2
+        for session in context.cdp_sessions:
+            sent = dict(session.sent)
+            assert sent["Network.emulateNetworkConditions"] == {
+                "offline": False,
+                "latency": 562.5,
+                "downloadThroughput": 180000,
+                "uploadThroughput": 84375,
+            }
+            assert sent["Emulation.setCPUThrottlingRate"] == {"rate": 4}
+
+    def test_cpu_only_profile_leaves_network_alone(self, fake_browser):
+        """A CPU factor alone does not touch network conditions."""
+        context = create_context(fake_browser, throttling="3x-cpu")
+        context.new_page()
+
+        assert context.cdp_sessions[0].sent == [
+            ("Emulation.setCPUThrottlingRate", {"rate": 3.0})
+        ]
+        assert get_throttling(context) == {"cpu_rate": 3.0, "name": "3x-cpu"}
+
+    def test_environment_variable(self, fake_browser, monkeypatch):
+        """PW_THROTTLING applies comma-separated profiles."""
+        monkeypatch.setenv("PW_THROTTLING", "mobile,6x-cpu")
+        context = create_context(fake_browser)
+
+        settings = get_throttling(context)
+        assert settings["name"] == "mobile,6x-cpu"
+        assert settings["cpu_rate"] == 6
+        assert settings["latency_ms"] == 562.5
+
+    def test_unknown_profile(self, fake_browser):
+        """Typos are rejected before a context is created."""
+        with pytest.raises(ValueError, match="Unknown throttling profile 'slow-5g'"):
+            create_context(fake_browser, throttling="slow-5g")
+        assert fake_browser.context_options is None
+
+    def test_non_chromium_rejected(self, make_browser):
+        """Throttling needs CDP, so Firefox and WebKit are rejected."""
+        browser = make_browser("webkit")
+
+        with pytest.raises(ValueError, match="needs Chromium"):
+            create_context(browser, throttling="slow-3g")
+        assert browser.context_options is None
+
+    def test_unthrottled_by_default(self, fake_browser):
+        """Without a profile no CDP session is opened."""
+        context = create_context(fake_browser)
+        context.new_page()
+
+        assert context.cdp_sessions == []
+        assert get_throttling(context) is None
+
+    def test_profile_recorded_in_metrics(self, fake_browser):
+        """collect_metrics() records the profile of the page's context."""
+        context = create_context(fake_browser, throttling="slow-4g")
+        page = context.new_page()
+        page.evaluate_result = {"lcp_ms": 900.0}
+
+        record = collect_metrics(page, cdp=False)
+
+        assert record["throttling"] == "slow-4g"
+
+
+class TestThrottlingInBrowser:
+    """Tests for throttling profiles in Chromium."""
+
+    def test_slow_3g_latency_delays_first_byte(self, page, test_server_url):
+        """The 2 s round trip of slow-3g shows up in the time to first byte."""
+        page.goto(test_server_url)
+        unthrottled = collect_metrics(page, cdp=False)
+        context = create_context(page.context.browser, throttling="slow-3g")
+        try:
+            throttled_page = context.new_page()
+            throttled_page.goto(test_server_url)
+            throttled = collect_metrics(throttled_page, cdp=False)
+        finally:
+            context.close()
+
+        assert throttled["throttling"] == "slow-3g"
+        assert throttled["ttfb_ms"] >= unthrottled["ttfb_ms"] + 1500
@@ -0,0 +1,153 @@
+"""Tests for opt-in timing spans in Chrome trace-event format."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib import helpers, tracing
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "spans.json"
+    tracing.start(str(path))
+    yield path
+    tracing.stop()
+
+
+def read_events(path):
+    return {
+        event["name"]: event for event in json.loads(path.read_text())["traceEvents"]
+    }
+
+
+class TestTracingDisabled:
+    """Tests for the disabled (default) state."""
+
+    def test_helpers_untouched(self):
+        """Without start(), helpers are the original functions."""
+        assert not tracing.enabled()
+        assert helpers.normalize_link.__module__ == "lib.helpers"
+        assert not hasattr(helpers.normalize_link, "__wrapped__")
+
+    def test_span_is_shared_noop(self):
+        """span() returns the same null context, recording nothing."""
+        assert tracing.span("a") is tracing.span("b")
+
+
+class TestTracingEnabled:
+    """Tests for spans recorded while tracing is on."""
+
+    def test_helper_calls_become_spans(self, trace_file):
+        """Public helpers are wrapped and record arguments and results."""
+        helpers.normalize_link("HTTP://App.test:80/x")
+        tracing.stop()
+
+        event = read_events(trace_file)["normalize_link"]
+        assert event["ph"] == "X"
+        assert event["cat"] == "helper"
+        assert event["dur"] >= 0
+        assert event["args"] == {
+            "url": "HTTP://App.test:80/x",
+            "result": "http://app.test/x",
+        }
+
+    def test_object_arguments_summarized(self, trace_file):
+        """Non-plain arguments are recorded by type name only."""
+
+        class FakeLocator:
+            def all_text_contents(self):
+                return ["a", "b"]
+
+        class FakePage:
+            def wait_for_selector(self, selector, timeout=None):
+                pass
+
+            def locator(self, selector):
+                return FakeLocator()
+
+        helpers.extract_texts(FakePage(), "li")
+        tracing.stop()
+
+        args = read_events(trace_file)["extract_texts"]["args"]
+        assert args == {"page": "FakePage", "selector": "li", "result": "list[2]"}
+
+    def test_async_helpers_and_errors(self, trace_file):
+        """Async helpers are timed until awaited; errors are recorded."""
+
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(
+                helpers.retry_with_backoff(failing, max_retries=1, initial_delay=0)
+            )
+        tracing.stop()
+
+        event = read_events(trace_file)["retry_with_backoff"]
+        assert event["args"]["error"] == "ValueError"
+        assert event["args"]["max_retries"] == 1
+
+    def test_generator_closed_early(self, trace_file):
+        """Breaking out of a traced generator cleans it up and ends its span."""
+        cleaned_up = []
+
+        def pages(limit):
+            try:
+                yield from range(limit)
+            finally:
+                cleaned_up.append(True)
+
+        for page in tracing.traced(pages)(limit=5):
+            break
+        assert cleaned_up == [True]
+        tracing.stop()
+
+        assert read_events(trace_file)["pages"]["args"] == {"limit": 5}
+
+    def test_generator_forwards_throw_and_send(self, trace_file):
+        """throw() and send() reach the traced generator."""
+
+        def echo():
+            received = None
+            while True:
+                try:
+                    received = yield received
+                except ValueError:
+                    received = "recovered"
+
+        generator = tracing.traced(echo)()
+        next(generator)
+        assert generator.send("ping") == "ping"
+        assert generator.throw(ValueError()) == "recovered"
+        generator.close()
+
+    def test_nested_run_phases(self, trace_file):
+        """Explicit spans nest around helper spans by time."""
+        with tracing.span("main", rows=3) as attrs:
+            helpers.normalize_link("http://app.test/")
+            attrs["done"] = True
+        tracing.stop()
+
+        events = read_events(trace_file)
+        outer, inner = events["main"], events["normalize_link"]
+        assert outer["args"] == {"rows": 3, "done": True}
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+
+    def test_stop_restores_helpers(self, trace_file):
+        """stop() writes the file and unwraps every helper."""
+        assert hasattr(helpers.normalize_link, "__wrapped__")
+
+        assert tracing.stop() == str(trace_file)
+
+        assert not hasattr(helpers.normalize_link, "__wrapped__")
+        assert trace_file.exists()
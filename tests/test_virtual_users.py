@@ -0,0 +1,148 @@
+"""Tests for the virtual-user load generator."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(
+    0,
+    str(Path(__file__).parent.parent / "skills" / "playwright-py-skill"),
+)
+
+from lib.virtual_users import latency_summary, run_load, step, think
+
+
+class TestLatencySummary:
+    """Tests for per-step latency summaries."""
+
+    def test_percentiles_and_histogram(self):
+        """Latencies fall into the bucket of their upper bound."""
+        summary = latency_summary([40, 50, 120, 300, 20000], errors=2)
+
+        assert summary["count"] == 5
+        assert summary["errors"] == 2
+        assert summary["p50_ms"] == 120
+        assert summary["max_ms"] == 20000
+        counts = {b["le_ms"]: b["count"] for b in summary["histogram"]}
+        assert counts[50] == 2
+        assert counts[250] == 1
+        assert counts[500] == 1
+        assert counts[float("inf")] == 1
+
+    def test_no_latencies(self):
+        """A step that always failed has errors but no percentiles."""
+        summary = latency_summary([], errors=3)
+
+        assert "p50_ms" not in summary
+        assert sum(b["count"] for b in summary["histogram"]) == 0
+
+
+class TestFlowHelpers:
+    """Tests for step() and think() outside a load run."""
+
+    def test_step_needs_load_run(self):
+        """step() only works in a flow run by run_load()."""
+        with pytest.raises(RuntimeError, match="run_load"):
+            with step("home"):
+                pass
+
+    def test_think_needs_load_run(self):
+        """think() only works in a flow run by run_load()."""
+        with pytest.raises(RuntimeError, match="run_load"):
+            asyncio.run(think(1))
+
+
+class TestRunLoadArguments:
+    """Tests for arguments rejected before any browser starts."""
+
+    async def flow(self, page):
+        pass
+
+    def test_duration_or_iterations_required(self):
+        """A load run needs something to stop it."""
+        with pytest.raises(ValueError, match="duration"):
+            run_load(self.flow, duration=None)
+
+    def test_at_least_one_user(self):
+        """Zero users would wait forever for browsers that never start."""
+        with pytest.raises(ValueError, match="at least one user"):
+            run_load(self.flow, users=0)
+
+    def test_flow_must_be_async(self):
+        """Flows drive async_api pages, so a sync function is rejected."""
+        with pytest.raises(TypeError, match="async function"):
+            run_load(lambda page: None)
+
+    def test_sync_only_context_options_rejected(self):
+        """create_context() extras built on the sync API are refused."""
+        with pytest.raises(ValueError, match="response_cache"):
+            run_load(self.flow, context_options={"response_cache": True})
+
+
+class TestRunLoad:
+    """Load runs against the local test server."""
+
+    def test_users_run_concurrently(self, test_server_url, capsys):
+        """Users in the same browser wait in parallel, each in its own context."""
+
+        async def flow(page):
+            with step("home"):
+                await page.goto(test_server_url)
+            with step("wait"):
+                await page.wait_for_timeout(1000)
+
+        report = run_load(
+            flow, users=6, browsers=2, iterations=2, think_time=0, duration=None
+        )
+
+        assert report["iterations"] == 12
+        assert report["failed"] == 0
+        assert report["steps"]["home"]["count"] == 12
+        assert list(report["steps"])[-1] == "iteration"
+        # 6 users x 2 iterations of a 1 s wait, done in parallel
+        assert report["elapsed_s"] < 8
+        assert "📊 home" in capsys.readouterr().out
+
+    def test_login_flow_with_failures(self, test_server_url):
+        """Failed iterations are counted and the users carry on."""
+
+        async def flow(page):
+            with step("login"):
+                await page.goto(f"{test_server_url}/login")
+                await page.fill("input[name=email]", "test@example.com")
+                await page.fill("input[name=password]", "password")
+                await page.click("button[type=submit]")
+                await page.wait_for_selector("h1:has-text('Dashboard')")
+            await think(0.1)
+            with step("missing"):
+                await page.click("#no-such-button", timeout=100)
+
+        report = run_load(
+            flow, users=2, browsers=1, iterations=2, think_time=0.1, duration=None
+        )
+
+        assert report["steps"]["login"]["count"] == 4
+        assert report["steps"]["missing"]["errors"] == 4
+        assert report["failed"] == 4
+        [error] = report["errors"]
+        assert error.startswith("TimeoutError")
+
+    def test_duration_stops_users(self, test_server_url):
+        """Users stop starting iterations once the duration is over."""
+
+        async def flow(page):
+            await page.goto(test_server_url)
+
+        report = run_load(
+            flow,
+            users=2,
+            browsers=1,
+            duration=2,
+            ramp_up=1,
+            think_time=(0.2, 0.4),
+        )
+
+        assert report["iterations"] > 2
+        assert report["elapsed_s"] < 5